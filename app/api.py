@@ -1,14 +1,10 @@
 from __future__ import annotations
 from datetime import datetime
-from uuid import uuid4
-from math import ceil
-import os
 from typing import Any
 
-from flask import Blueprint, jsonify, request, url_for, current_app
+from flask import Blueprint, jsonify, request, current_app
 from sqlalchemy import func, or_, select
-from sqlalchemy.orm import selectinload
-from werkzeug.utils import secure_filename
+from sqlalchemy.orm import lazyload, load_only, selectinload
 
 from models import (
     db,
@@ -20,6 +16,21 @@ from models import (
     Announcement,
     member_clubs,
 )
+from stats import get_stats
+from refdata import club_options, college_options
+from search import get_backend as search_backend
+from sortkeys import refresh_primary_club
+from memberships import set_member_clubs
+from importer import FORMATS as IMPORT_FORMATS, import_members, iter_records
+from export import EXPORTS, FORMATS as EXPORT_FORMATS, export_response
+from etags import conditional
+from mailer import delivery_counts
+from publishing import STATE_FILTERS, active_announcements
+from dbpool import pool_status
+from storage import allowed_image, save_image
+from serializers import column_options, field_names, serialize, wanted
+from loaders import InvalidExpand, expand, parse_expand
+from pagination import InvalidCursor, COUNT_MODES, sort_clauses, page_args, offset_page, keyset_page
 from utils import (
     normalize_keys,
     get_scalar,
@@ -39,7 +50,24 @@ api = Blueprint("api", __name__, url_prefix="/api")
 # Constants
 # =====================================================================
 EVENT_STATUS_VALUES = {"upcoming", "completed", "cancelled"}
-ALLOWED_IMAGE_EXT = {"png", "jpg", "jpeg", "gif", "webp"}
+
+# ?expand= per list endpoint: name -> (loaders batch, foreign-key attribute)
+EVENT_EXPANDS = {
+    "club": ("clubs", "organising_club_id"),
+    "members_count": ("club_members_count", "organising_club_id"),
+}
+ANNOUNCEMENT_EXPANDS = {
+    "club": ("clubs", "club_id"),
+    "members_count": ("club_members_count", "club_id"),
+}
+COORDINATOR_EXPANDS = {
+    "club": ("clubs", "club_id"),
+    "college": ("colleges", "college_id"),
+    "members_count": ("club_members_count", "club_id"),
+}
+MEMBER_EXPANDS = {
+    "college": ("colleges", "college_id"),
+}
 
 # =====================================================================
 # Response helpers (kept compatible with your old UI)
@@ -55,6 +83,16 @@ def err(message: str, status: int = 400, code: str = "bad_request"):
     return jsonify({"status": False, "error": {"code": code, "message": message}}), status
 
 
+@api.errorhandler(InvalidCursor)
+def _invalid_cursor(e):
+    return err(str(e), 400, "invalid_cursor")
+
+
+@api.errorhandler(InvalidExpand)
+def _invalid_expand(e):
+    return err(str(e), 400, "invalid_expand")
+
+
 # =====================================================================
 # Query helpers (your old _qstr/_qint are preserved and used)
 # =====================================================================
@@ -67,15 +105,27 @@ def _qint(name: str, default: int | None = None) -> int | None:
     return request.args.get(name, default, type=int)
 
 
-# =====================================================================
-# Generic helpers
-# =====================================================================
+def _qexpand(spec: dict) -> set:
+    """?expand= names, validated against the endpoint's expansion `spec`."""
+    return parse_expand(_qstr("expand"), spec)
 
-def image_url(relpath: str | None):
-    if not relpath:
+
+def _expand_columns(spec: dict, names) -> list:
+    """Foreign-key attributes the requested expansions read (kept under ?fields=)."""
+    return [spec[n][1] for n in names]
+
+
+def _qfields() -> set | None:
+    """?fields=a,b,c (sparse fieldset) -> {"a", "b", "c"}; None means every field."""
+    raw = _qstr("fields")
+    if not raw:
         return None
-    return url_for("static", filename=relpath, _external=True)
+    return {f.strip() for f in raw.split(",") if f.strip()}
+
 
+# =====================================================================
+# Generic helpers
+# =====================================================================
 
 def _parse_bool(val):
     if val is None:
@@ -110,39 +160,56 @@ def _payload():
     return normalize_keys(raw)
 
 
-def _paginate(query, page_default=1, per_default=20, per_max=100):
-    page = max(1, request.args.get("page", page_default, type=int) or page_default)
-    per_page = min(per_max, request.args.get("per_page", per_default, type=int) or per_default)
-    total = query.count()
-    rows = query.limit(per_page).offset((page - 1) * per_page).all()
-    meta = {
-        "page": page,
-        "per_page": per_page,
-        "total": total,
-        "pages": ceil(total / per_page) if per_page else 1,
+# args that change which page is shown but not which rows match
+_PAGING_ARGS = {"page", "per_page", "cursor", "count", "sort", "order", "include", "fields", "expand"}
+
+
+def _filter_key():
+    """Normalized filter set of the current request (endpoint + sorted filter args)."""
+    args = tuple(sorted(
+        (k, tuple(sorted(v.strip() for v in vals)))
+        for k, vals in request.args.lists()
+        if k not in _PAGING_ARGS
+    ))
+    return request.endpoint, args
+
+
+def _paginate(query, keys=None, per_default=20, per_max=100):
+    """
+    Offset mode (default): ?page=&per_page= with a total.
+    Cursor mode (opt-in): pass ?cursor= (empty for the first page), then follow meta.next_cursor.
+    ?count=exact|none|estimated|cached picks how the total is computed (see pagination.COUNT_MODES);
+    meta.count reports the strategy actually used.
+    `keys` is the endpoint's sort-key list; the query must already be ordered by it.
+    """
+    page, per_page = page_args(request.args, per_default, per_max)
+    cursor_mode = bool(keys) and "cursor" in request.args
+    count = _qstr("count", "none" if cursor_mode else "exact").lower()
+    if count not in COUNT_MODES:
+        count = "exact"
+    opts = {
+        "count": count,
+        "cache_key": _filter_key(),
+        "cache_ttl": current_app.config.get("COUNT_CACHE_TTL", 30),
     }
-    return rows, meta
+    if cursor_mode:
+        return keyset_page(query, keys, _qstr("cursor") or None, per_page, **opts)
+    return offset_page(query, page, per_page, **opts)
 
 
-def _save_upload(file, subdir_key: str):
+def _save_upload(file):
     if not file or not getattr(file, "filename", ""):
         return None
-    ext = file.filename.rsplit(".", 1)[-1].lower() if "." in file.filename else ""
-    if ext not in ALLOWED_IMAGE_EXT:
+    if not allowed_image(file.filename):
         return None
-    base = secure_filename(file.filename.rsplit(".", 1)[0])[:60] or "upload"
-    unique = f"{base}-{uuid4().hex[:10]}.{ext}"
-    save_dir = current_app.config[subdir_key]
-    os.makedirs(save_dir, exist_ok=True)
-    save_path = os.path.join(save_dir, unique)
-    file.save(save_path)
-    return os.path.relpath(save_path, start=current_app.static_folder).replace("\\", "/")
+    return save_image(file)
 
 
 # =====================================================================
 # Dashboard (soft-delete aware)
 # =====================================================================
 @api.get("/dashboard")
+@conditional("clubs", "colleges", "coordinators", "members", "events", time_bucket=60)
 def api_dashboard():
     now_local = datetime.now()
 
@@ -155,13 +222,8 @@ def api_dashboard():
     )
     recent_clubs = [{"name": c.club_name, "time_ago": time_ago(c.created_time)} for c in clubs]
 
-    # Card counts (active + not deleted)
-    active_clubs = db.session.query(func.count(Club.club_id)).filter(Club.status == "active", Club.is_deleted.is_(False)).scalar() or 0
-    active_colleges = db.session.query(func.count(College.college_id)).filter(College.status == "active", College.is_deleted.is_(False)).scalar() or 0
-    active_coordinators = db.session.query(func.count(Coordinator.coordinator_id)).filter(Coordinator.status == "active", Coordinator.is_deleted.is_(False)).scalar() or 0
-    active_members = db.session.query(func.count(Member.member_id)).filter((Member.status == "active") | (Member.status.is_(None)), Member.is_deleted.is_(False)).scalar() or 0
-    total_members = db.session.query(func.count(Member.member_id)).filter(Member.is_deleted.is_(False)).scalar() or 0
-    upcoming_events_count = db.session.query(func.count(Event.event_id)).filter(Event.status == "upcoming", Event.is_deleted.is_(False)).scalar() or 0
+    # Card counts (active + not deleted) — one read of the stats row
+    stats = get_stats()
 
     # Upcoming (nearest 2)
     upcoming_events_rows = (
@@ -175,7 +237,7 @@ def api_dashboard():
             "name": ev.event_name,
             "time_until": time_ago(ev.start_at),
             "description": ev.description or "",
-            "start_at": ev.start_at.isoformat() if ev.start_at else None,
+            "start_at": ev.start_at,
         }
         for ev in upcoming_events_rows
     ]
@@ -192,12 +254,12 @@ def api_dashboard():
     return ok(
         {
             "cards": {
-                "active_clubs": active_clubs,
-                "active_colleges": active_colleges,
-                "active_coordinators": active_coordinators,
-                "active_members": active_members,
-                "total_members": total_members,
-                "upcoming_events": upcoming_events_count,
+                "active_clubs": stats.active_clubs,
+                "active_colleges": stats.active_colleges,
+                "active_coordinators": stats.active_coordinators,
+                "active_members": stats.active_members,
+                "total_members": stats.total_members,
+                "upcoming_events": stats.upcoming_events,
             },
             "recent_clubs": recent_clubs,
             "upcoming_events": upcoming_events,
@@ -210,11 +272,13 @@ def api_dashboard():
 # Clubs (GET/POST/PUT/DELETE/RESTORE)
 # =====================================================================
 @api.get("/clubs")
+@conditional("clubs", "members", "member_clubs")
 def api_list_clubs():
     q = _qstr("q")
     status = _qstr("status", "all")  # active|inactive|all
     category = _qstr("category")
     sort = _qstr("sort", "newest")
+    only = _qfields()
 
     # members_count subquery (not counting deleted members)
     member_count_sq = (
@@ -238,27 +302,19 @@ def api_list_clubs():
         query = query.filter(Club.club_category == category)
 
     if sort == "name":
-        query = query.order_by(Club.club_name.asc())
+        keys = [(Club.club_name, "asc"), (Club.club_id, "asc")]
     elif sort == "oldest":
-        query = query.order_by(Club.created_time.asc(), Club.club_id.asc())
+        keys = [(Club.created_time, "asc"), (Club.club_id, "asc")]
     else:
-        query = query.order_by(Club.created_time.desc(), Club.club_id.desc())
+        keys = [(Club.created_time, "desc"), (Club.club_id, "desc")]
+    query = query.order_by(*sort_clauses(keys)).options(
+        *column_options(Club, "list", only, keys),
+        lazyload(Club.members),
+    )
 
-    rows, meta = _paginate(query)
+    rows, meta = _paginate(query, keys)
 
-    data = [
-        {
-            "club_id": c.club_id,
-            "club_name": c.club_name,
-            "club_category": c.club_category,
-            "club_logo": image_url(c.club_logo),
-            "description": c.description,
-            "status": c.status,
-            "created_time": c.created_time.isoformat() if c.created_time else None,
-            "members": mc,
-        }
-        for c, mc in rows
-    ]
+    data = [serialize(c, "list", only, members=mc) for c, mc in rows]
 
     return ok(data, **meta)
 
@@ -294,7 +350,7 @@ def api_create_club():
     # ---- Optional: logo upload ----
     file = request.files.get("club_logo")
     if file and file.filename:
-        rel = _save_upload(file, "CLUB_UPLOAD_FOLDER")
+        rel = _save_upload(file)
         if not rel:
             return err("Invalid club_logo format.", 415, "unsupported_media")
         club.club_logo = rel
@@ -360,7 +416,7 @@ def api_update_club(club_id):
     # ---- Handle logo upload ----
     file = request.files.get("club_logo")
     if file and file.filename:
-        rel = _save_upload(file, "CLUB_UPLOAD_FOLDER")
+        rel = _save_upload(file)
         if not rel:
             return err("Invalid club_logo format.", 415, "unsupported_media")
         club.club_logo = rel
@@ -374,17 +430,7 @@ def api_update_club(club_id):
         return err("Failed to update club.", 500, "db_error")
 
     # ---- Return full updated club data ----
-    return ok({
-        "club_id": club.club_id,
-        "club_name": club.club_name,
-        "club_category": club.club_category,
-        "description": club.description,
-        "status": club.status,
-        "club_logo": image_url(club.club_logo),
-        "created_time": club.created_time.isoformat() if club.created_time else None,
-        "updated_time": getattr(club, "updated_time", None).isoformat()
-            if getattr(club, "updated_time", None) else None
-    })
+    return ok(serialize(club))
 
 
 @api.delete("/clubs/<int:club_id>")
@@ -408,10 +454,11 @@ def api_delete_club(club_id):
 # =====================================================================
 # Events (GET/POST/PUT/DELETE/RESTORE)
 # =====================================================================
-@api.get("/events")
-def api_list_events():
-    now_local = datetime.now()
-
+def _events_query():
+    """
+    Event query filtered by ?q=&status=&club_id=&date_from=&date_to= and ordered by
+    ?sort=&order=; returns (query, keys, search, hits). keys is None for relevance order.
+    """
     q = _qstr("q")
     status = _qstr("status")
     club_id = _qint("organising_club_id") or _qint("club_id")
@@ -422,8 +469,14 @@ def api_list_events():
 
     query = Event.query.filter(Event.is_deleted.is_(False))
 
+    search, hits = None, None
     if q:
-        query = query.filter(or_(Event.event_name.ilike(f"%{q}%"), Event.description.ilike(f"%{q}%")))
+        search = search_backend()
+        hits = search.hits("events", q)
+        if hits is not None:
+            query = query.join(hits, hits.c.id == Event.event_id)
+        else:
+            query = query.filter(or_(Event.event_name.ilike(f"%{q}%"), Event.description.ilike(f"%{q}%")))
     if status in EVENT_STATUS_VALUES:
         query = query.filter(Event.status == status)
     if club_id:
@@ -444,42 +497,60 @@ def api_list_events():
     if dt_to:
         query = query.filter(Event.start_at <= dt_to)
 
-    sort_col = Event.created_time if sort == "created_time" else Event.start_at
-    query = query.order_by(sort_col.asc() if order == "asc" else sort_col.desc())
+    if sort == "relevance" and hits is not None:
+        # score is not a model column, so relevance pages are offset-only
+        keys = None
+        query = query.order_by(hits.c.score.desc(), Event.event_id.desc())
+    else:
+        sort_col = Event.created_time if sort == "created_time" else Event.start_at
+        direction = "asc" if order == "asc" else "desc"
+        keys = [(sort_col, direction), (Event.event_id, direction)]
+        query = query.order_by(*sort_clauses(keys))
+    return query, keys, search, hits
 
-    all_rows, meta = _paginate(query)
+
+@api.get("/events")
+@conditional("events", time_bucket=60, expands=EVENT_EXPANDS)
+def api_list_events():
+    now_local = datetime.now()
+    q = _qstr("q")
+    only = _qfields()
+    expands = _qexpand(EVENT_EXPANDS)
+    fk_columns = _expand_columns(EVENT_EXPANDS, expands)
+    query, keys, search, hits = _events_query()
+    query = query.options(*column_options(Event, "list", only, keys, fk_columns))
+
+    all_rows, meta = _paginate(query, keys)
+    snippets = {}
+    if hits is not None and wanted(only, "snippet"):
+        snippets = search.snippets("events", q, [ev.event_id for ev in all_rows])
 
     upcoming_events_rows = (
         Event.query.filter(Event.is_deleted.is_(False), Event.status != "cancelled", Event.start_at >= now_local)
+        .options(*column_options(Event, "list", only, extra=fk_columns))
         .order_by(Event.start_at.asc())
         .limit(3)
         .all()
     )
     upcoming_count = (
-        db.session.query(Event).filter(Event.is_deleted.is_(False), Event.status != "cancelled", Event.start_at >= now_local).count()
+        db.session.query(func.count(Event.event_id)).filter(Event.is_deleted.is_(False), Event.status != "cancelled", Event.start_at >= now_local).scalar()
     )
-    completed_count = db.session.query(Event).filter(Event.is_deleted.is_(False), Event.status == "completed").count()
-
-    def ser(ev: Event):
-        return {
-            "event_id": ev.event_id,
-            "event_name": ev.event_name,
-            "organising_club_id": ev.organising_club_id,
-            "event_coordinator": ev.event_coordinator,
-            "venue": ev.venue,
-            "start_at": ev.start_at.isoformat() if ev.start_at else None,
-            "end_at": ev.end_at.isoformat() if ev.end_at else None,
-            "event_image": image_url(ev.event_image) if ev.event_image else None,
-            "max_participants": ev.max_participants,
-            "status": ev.status,
-            "description": ev.description or "",
-            "created_time": ev.created_time.isoformat() if ev.created_time else None,
-        }
+    completed_count = get_stats().completed_events
+
+    def ser(ev: Event, with_snippet: bool = False):
+        if with_snippet:
+            return serialize(ev, "list", only, snippet=snippets.get(ev.event_id))
+        return serialize(ev, "list", only)
+
+    upcoming = [(ser(ev), ev) for ev in upcoming_events_rows]
+    all_events = [(ser(ev, with_snippet=bool(q)), ev) for ev in all_rows]
+    # both lists share one batch per expansion
+    expand(upcoming + all_events, EVENT_EXPANDS, expands)
 
     return ok(
         {
-            "upcoming_events": [ser(ev) for ev in upcoming_events_rows],
-            "all_events": [ser(ev) for ev in all_rows],
+            "upcoming_events": [item for item, _ in upcoming],
+            "all_events": [item for item, _ in all_events],
             "counts": {"upcoming": upcoming_count, "completed": completed_count},
         },
         **meta,
@@ -549,7 +620,7 @@ def api_create_event():
     # ---- optional image upload ----
     file = request.files.get("event_image")
     if file and file.filename:
-        rel = _save_upload(file, "EVENT_UPLOAD_FOLDER")
+        rel = _save_upload(file)
         if not rel:
             return err("Invalid image format.", 415, "unsupported_media")
         ev.event_image = rel
@@ -562,21 +633,7 @@ def api_create_event():
         current_app.logger.exception("Failed to create event")
         return err("Failed to create event.", 500, "db_error")
 
-    return ok({
-        "event_id": ev.event_id,
-        "event_name": ev.event_name,
-        "organising_club_id": ev.organising_club_id,
-        "event_coordinator": ev.event_coordinator,
-        "venue": ev.venue,
-        "start_at": ev.start_at.isoformat() if ev.start_at else None,
-        "end_at": ev.end_at.isoformat() if ev.end_at else None,
-        "event_image": image_url(ev.event_image) if getattr(ev, "event_image", None) else None,
-        "max_participants": ev.max_participants,
-        "status": ev.status,
-        "description": ev.description or "",
-        "created_time": ev.created_time.isoformat() if getattr(ev, "created_time", None) else None,
-        "updated_time": ev.updated_time.isoformat() if getattr(ev, "updated_time", None) else None,
-    }, 201)
+    return ok(serialize(ev), 201)
 
 # ===== UPDATE EVENT (PUT) with 'upcoming must be future' =====
 @api.put("/events/<int:event_id>")
@@ -656,7 +713,7 @@ def api_update_event(event_id):
     # ---- optional image upload ----
     file = request.files.get("event_image")
     if file and file.filename:
-        rel = _save_upload(file, "EVENT_UPLOAD_FOLDER")
+        rel = _save_upload(file)
         if not rel:
             return err("Invalid image format.", 415, "unsupported_media")
         ev.event_image = rel
@@ -668,21 +725,7 @@ def api_update_event(event_id):
         current_app.logger.exception("Failed to update event")
         return err("Failed to update event.", 500, "db_error")
 
-    return ok({
-        "event_id": ev.event_id,
-        "event_name": ev.event_name,
-        "organising_club_id": ev.organising_club_id,
-        "event_coordinator": ev.event_coordinator,
-        "venue": ev.venue,
-        "start_at": ev.start_at.isoformat() if ev.start_at else None,
-        "end_at": ev.end_at.isoformat() if ev.end_at else None,
-        "event_image": image_url(ev.event_image) if getattr(ev, "event_image", None) else None,
-        "max_participants": ev.max_participants,
-        "status": ev.status,
-        "description": ev.description or "",
-        "created_time": ev.created_time.isoformat() if getattr(ev, "created_time", None) else None,
-        "updated_time": ev.updated_time.isoformat() if getattr(ev, "updated_time", None) else None,
-    })
+    return ok(serialize(ev))
 
 
 # ===== SOFT DELETE EVENT =====
@@ -716,6 +759,7 @@ def api_list_colleges():
     q = _qstr("q")
     status = _qstr("status", "all")
     sort = _qstr("sort", "newest")
+    only = _qfields()
 
     query = College.query.filter(College.is_deleted.is_(False))
     if q:
@@ -724,17 +768,18 @@ def api_list_colleges():
         query = query.filter(College.status == status)
 
     if sort == "name":
-        query = query.order_by(College.college_name.asc())
+        keys = [(College.college_name, "asc"), (College.college_id, "asc")]
     elif sort == "oldest":
-        query = query.order_by(College.created_time.asc(), College.college_id.asc())
+        keys = [(College.created_time, "asc"), (College.college_id, "asc")]
     else:
-        query = query.order_by(College.created_time.desc(), College.college_id.desc())
+        keys = [(College.created_time, "desc"), (College.college_id, "desc")]
+    query = query.order_by(*sort_clauses(keys)).options(*column_options(College, "list", only, keys))
 
-    rows, meta = _paginate(query)
+    rows, meta = _paginate(query, keys)
 
     page_ids = [c.college_id for c in rows]
     members_by_college = {}
-    if page_ids:
+    if page_ids and wanted(only, "members_count"):
         members_by_college = dict(
             db.session.query(Member.college_id, func.count(Member.member_id))
             .filter(Member.is_deleted.is_(False), (Member.status == "active") | (Member.status.is_(None)), Member.college_id.in_(page_ids))
@@ -743,27 +788,13 @@ def api_list_colleges():
         )
 
     data = [
-        {
-            "college_id": c.college_id,
-            "college_name": c.college_name,
-            "members_count": members_by_college.get(c.college_id, 0),
-            "clubs_count": 0,
-            "email": c.email,
-            "location": c.location,
-            "status": (c.status or "active").lower(),
-            "authority_name": c.authority_name,
-            "authority_role": c.authority_role,
-            "phone": c.phone,
-            "description": c.description,
-            "created_time": c.created_time.isoformat() if c.created_time else None,
-        }
+        serialize(c, "list", only, members_count=members_by_college.get(c.college_id, 0), clubs_count=0)
         for c in rows
     ]
 
-    active_count = db.session.query(func.count(College.college_id)).filter(College.status == "active", College.is_deleted.is_(False)).scalar() or 0
-    inactive_count = db.session.query(func.count(College.college_id)).filter(College.status == "inactive", College.is_deleted.is_(False)).scalar() or 0
+    stats = get_stats()
 
-    return ok({"colleges": data, "counts": {"active": active_count, "inactive": inactive_count}}, **meta)
+    return ok({"colleges": data, "counts": {"active": stats.active_colleges, "inactive": stats.inactive_colleges}}, **meta)
 
 #POST Colleges
 @api.post("/colleges")
@@ -805,19 +836,7 @@ def api_create_college():
         return err("Failed to create college.", 500, "db_error")
 
     # ---- success: return full created record ----
-    return ok({
-        "college_id": col.college_id,
-        "college_name": col.college_name,
-        "email": col.email,
-        "location": col.location,
-        "authority_name": col.authority_name,
-        "authority_role": col.authority_role,
-        "phone": col.phone,
-        "description": col.description,
-        "status": col.status,
-        "created_time": col.created_time.isoformat() if getattr(col, "created_time", None) else None,
-        "updated_time": col.updated_time.isoformat() if getattr(col, "updated_time", None) else None,
-    }, 201)
+    return ok(serialize(col), 201)
 
 #Update Colleges
 @api.put("/colleges/<int:college_id>")
@@ -873,19 +892,7 @@ def api_update_college(college_id: int):
         return err("Failed to update college.", 500, "db_error")
 
     # ---- return full updated data ----
-    return ok({
-        "college_id": col.college_id,
-        "college_name": col.college_name,
-        "email": col.email,
-        "location": col.location,
-        "authority_name": col.authority_name,
-        "authority_role": col.authority_role,
-        "phone": col.phone,
-        "description": col.description,
-        "status": col.status,
-        "created_time": col.created_time.isoformat() if getattr(col, "created_time", None) else None,
-        "updated_time": col.updated_time.isoformat() if getattr(col, "updated_time", None) else None,
-    })
+    return ok(serialize(col))
 
 #Delete Colleges
 @api.delete("/colleges/<int:college_id>")
@@ -916,6 +923,8 @@ def api_list_coordinators():
     club_id     = _qint("club_id")
     college_id  = _qint("college_id")
     sort        = _qstr("sort", "newest")       # newest|name
+    only        = _qfields()
+    expands     = _qexpand(COORDINATOR_EXPANDS)
     only_orphan = (request.args.get("only_orphaned", "").strip().lower() in ("1", "true", "yes"))
 
     # LEFT JOIN club so we can show coordinators even when the club is deleted/missing
@@ -941,12 +950,19 @@ def api_list_coordinators():
 
     # sort
     if sort == "name":
-        query = query.order_by(Coordinator.coordinator_name.asc())
+        keys = [(Coordinator.coordinator_name, "asc"), (Coordinator.coordinator_id, "asc")]
     else:
-        query = query.order_by(Coordinator.created_time.desc())
+        keys = [(Coordinator.created_time, "desc"), (Coordinator.coordinator_id, "desc")]
+    query = query.order_by(*sort_clauses(keys)).options(
+        *column_options(Coordinator, "list", only, keys, _expand_columns(COORDINATOR_EXPANDS, expands)),
+        # only the name and deleted flag are read from the joined rows
+        load_only(Club.club_name, Club.is_deleted),
+        lazyload(Club.members),
+        load_only(College.college_name, College.is_deleted),
+    )
 
     # paginate
-    rows, meta = _paginate(query)
+    rows, meta = _paginate(query, keys)
 
     # build payload
     data = []
@@ -954,47 +970,24 @@ def api_list_coordinators():
         # club_deleted = True if club is missing OR present but soft-deleted
         club_deleted = (club is None) or bool(getattr(club, "is_deleted", False))
 
-        data.append({
-            "coordinator_id": c.coordinator_id,
-            "coordinator_name": c.coordinator_name,
-            "club_id": c.club_id,
-            "club_name": (club.club_name if club else None),
-            "club_deleted": club_deleted,   # <- single flag as requested
-            "college_id": c.college_id,
-            "college_name": (college.college_name if college and not getattr(college, "is_deleted", False) else None),
-            "faculty_dept": c.faculty_dept,
-            "role_type": c.role_type,
-            "email": c.email,
-            "phone": c.phone,
-            "description": c.description,
-            "status": c.status,
-            "image_path": image_url(c.coordinator_image) if c.coordinator_image else None,
-            "created_time": c.created_time.isoformat() if getattr(c, "created_time", None) else None,
-        })
+        data.append(serialize(
+            c, "list", only,
+            club_name=(club.club_name if club else None),
+            club_deleted=club_deleted,   # <- single flag as requested
+            college_name=(college.college_name if college and not getattr(college, "is_deleted", False) else None),
+        ))
+    expand(zip(data, (c for c, _, _ in rows)), COORDINATOR_EXPANDS, expands)
 
     # counts (independent of club state)
-    student_count = (
-        db.session.query(Coordinator)
-        .filter(Coordinator.is_deleted.is_(False),
-                Coordinator.role_type == "student",
-                Coordinator.status == "active")
-        .count()
-    )
-    faculty_like_count = (
-        db.session.query(Coordinator)
-        .filter(Coordinator.is_deleted.is_(False),
-                Coordinator.role_type.in_(["faculty", "lead", "co-lead", "mentor"]),
-                Coordinator.status == "active")
-        .count()
-    )
+    stats = get_stats()
 
-    # dropdowns: show only non-deleted clubs/colleges
-    clubs = Club.query.filter(Club.is_deleted.is_(False)).order_by(Club.club_name.asc()).all()
-    colleges = College.query.filter(College.is_deleted.is_(False)).order_by(College.college_name.asc()).all()
+    # dropdowns: show only non-deleted clubs/colleges (cached reference data)
+    clubs = club_options()
+    colleges = college_options()
 
     return ok({
         "coordinators": data,
-        "counts": {"students": student_count, "faculty_like": faculty_like_count},
+        "counts": {"students": stats.student_coordinators, "faculty_like": stats.faculty_coordinators},
         "dropdowns": {
             "clubs": [{"club_id": c.club_id, "club_name": c.club_name} for c in clubs],
             "colleges": [{"college_id": c.college_id, "college_name": c.college_name} for c in colleges],
@@ -1038,7 +1031,7 @@ def api_create_coordinator():
 
     file = request.files.get("coordinator_image")
     if file and file.filename:
-        rel = _save_upload(file, "COORDINATOR_UPLOAD_FOLDER")
+        rel = _save_upload(file)
         if not rel:
             return err("Invalid image format.", 415, "unsupported_media")
         co.coordinator_image = rel
@@ -1052,23 +1045,11 @@ def api_create_coordinator():
         return err("Failed to create coordinator.", 500, "db_error")
 
     # ✅ return full created record
-    return ok({
-        "coordinator_id": co.coordinator_id,
-        "coordinator_name": co.coordinator_name,
-        "club_id": co.club_id,
-        "club_name": club.club_name if club else None,
-        "college_id": co.college_id,
-        "college_name": (college.college_name if college else None),
-        "faculty_dept": co.faculty_dept,
-        "role_type": co.role_type,
-        "email": co.email,
-        "phone": co.phone,
-        "description": co.description,
-        "status": co.status,
-        "image": image_url(co.coordinator_image) if getattr(co, "coordinator_image", None) else None,
-        "created_time": co.created_time.isoformat() if getattr(co, "created_time", None) else None,
-        "updated_time": co.updated_time.isoformat() if getattr(co, "updated_time", None) else None,
-    }, 201)
+    return ok(serialize(
+        co,
+        club_name=club.club_name if club else None,
+        college_name=(college.college_name if college else None),
+    ), 201)
 
 @api.put("/coordinators/<int:coordinator_id>")
 def api_update_coordinator(coordinator_id: int):
@@ -1122,7 +1103,7 @@ def api_update_coordinator(coordinator_id: int):
     # ---- image upload ----
     file = request.files.get("coordinator_image")
     if file and file.filename:
-        rel = _save_upload(file, "COORDINATOR_UPLOAD_FOLDER")
+        rel = _save_upload(file)
         if not rel:
             return err("Invalid image format.", 415, "unsupported_media")
         co.coordinator_image = rel
@@ -1136,23 +1117,11 @@ def api_update_coordinator(coordinator_id: int):
         return err("Failed to update coordinator.", 500, "db_error")
 
     # ---- full success response ----
-    return ok({
-        "coordinator_id": co.coordinator_id,
-        "coordinator_name": co.coordinator_name,
-        "club_id": co.club_id,
-        "club_name": club.club_name if club else None,
-        "college_id": co.college_id,
-        "college_name": college.college_name if college else None,
-        "faculty_dept": co.faculty_dept,
-        "role_type": co.role_type,
-        "email": co.email,
-        "phone": co.phone,
-        "description": co.description,
-        "status": co.status,
-        "image": image_url(co.coordinator_image) if getattr(co, "coordinator_image", None) else None,
-        "created_time": co.created_time.isoformat() if getattr(co, "created_time", None) else None,
-        "updated_time": co.updated_time.isoformat() if getattr(co, "updated_time", None) else None,
-    })
+    return ok(serialize(
+        co,
+        club_name=club.club_name if club else None,
+        college_name=college.college_name if college else None,
+    ))
 #Delete coordinators
 @api.delete("/coordinators/<int:coordinator_id>")
 def api_delete_coordinator(coordinator_id: int):
@@ -1178,12 +1147,11 @@ def api_delete_coordinator(coordinator_id: int):
 # =====================================================================
 # Members (GET/POST/PUT/DELETE/RESTORE) — distinct pagination fix
 # =====================================================================
-@api.get("/members")
-def api_list_members():
+def _members_query():
+    """Member query filtered by ?q=&club_ids=&status= and ordered by ?sort=; returns (query, keys)."""
     q = _qstr("q")
     status_filter = _qstr("status", "all")
     sort_by = _qstr("sort", "newest")
-    include_set = {s.strip().lower() for s in (_qstr("include") or "").split(",") if s}
 
     raw_club_ids = request.args.getlist("club_ids")
     club_ids = [int(cid) for cid in raw_club_ids if str(cid).isdigit()]
@@ -1194,10 +1162,17 @@ def api_list_members():
         base = base.filter(Member.member_name.ilike(f"%{q}%"))
 
     if club_ids:
-        base = (
-            base.join(member_clubs, Member.member_id == member_clubs.c.member_id)
+        # semi-join: one row per member however many of the clubs match,
+        # probed through the member_clubs (member_id, club_id) primary key
+        base = base.filter(
+            select(member_clubs.c.member_id)
             .join(Club, member_clubs.c.club_id == Club.club_id)
-            .filter(Club.is_deleted.is_(False), member_clubs.c.club_id.in_(club_ids))
+            .where(
+                member_clubs.c.member_id == Member.member_id,
+                member_clubs.c.club_id.in_(club_ids),
+                Club.is_deleted.is_(False),
+            )
+            .exists()
         )
 
     if status_filter == "active":
@@ -1207,65 +1182,58 @@ def api_list_members():
 
     # sorting on base
     if sort_by == "name":
-        base = base.order_by(Member.member_name.asc())
+        keys = [(Member.member_name, "asc"), (Member.member_id, "asc")]
     elif sort_by == "oldest":
-        base = base.order_by(Member.created_time.asc())
+        keys = [(Member.created_time, "asc"), (Member.member_id, "asc")]
     else:
-        base = base.order_by(Member.created_time.desc())
+        keys = [(Member.created_time, "desc"), (Member.member_id, "desc")]
+    base = base.order_by(*sort_clauses(keys))
+    return base, keys
 
-    # distinct members to avoid duplicates due to M2M
-    base = base.distinct(Member.member_id)
 
-    page_rows, meta = _paginate(base)
+@api.get("/members")
+def api_list_members():
+    include_set = {s.strip().lower() for s in (_qstr("include") or "").split(",") if s}
+    only = _qfields()
+    expands = _qexpand(MEMBER_EXPANDS)
+    if "college" in expands:
+        # the expanded object replaces the college name
+        only = (only if only is not None else field_names(Member, "list")) - {"college"}
+    base, keys = _members_query()
+    # the page query only picks ids; the rows themselves are loaded below
+    page_rows, meta = _paginate(base.options(load_only(*(col for col, _ in keys))), keys)
     member_ids = [m.member_id for m in page_rows]
 
+    options = column_options(Member, "list", only, extra=_expand_columns(MEMBER_EXPANDS, expands))
+    if wanted(only, "college"):
+        options.append(selectinload(Member.college).load_only(College.college_name, College.is_deleted))
+    if wanted(only, "club", "club_ids"):
+        options.append(
+            selectinload(Member.clubs)
+            .options(load_only(Club.club_name, Club.is_deleted), lazyload(Club.members))
+        )
     members = (
         db.session.query(Member)
-        .options(selectinload(Member.college), selectinload(Member.clubs))
+        .options(*options)
         .filter(Member.member_id.in_(member_ids))
         .all()
     )
     by_id = {m.member_id: m for m in members}
     ordered = [by_id[i] for i in member_ids if i in by_id]
 
-    data = []
-    for m in ordered:
-        visible_clubs = [c for c in m.clubs if not getattr(c, "is_deleted", False)]
-        data.append(
-            {
-                "id": m.member_id,
-                "name": m.member_name,
-                "club": ", ".join([c.club_name for c in visible_clubs]) if visible_clubs else "-",
-                "college": m.college.college_name if m.college and not m.college.is_deleted else "-",
-                "college_id": m.college_id,
-                "faculty_dept": m.faculty_dept,
-                "email": m.email,
-                "phone": m.phone,
-                "image_path": image_url(m.member_image) if m.member_image else None,
-                "description": m.description,
-                "status": m.status,
-                "club_ids": [c.club_id for c in visible_clubs],
-                "created_time": m.created_time.isoformat() if m.created_time else None,
-            }
-        )
+    data = [serialize(m, "list", only) for m in ordered]
+    expand(zip(data, ordered), MEMBER_EXPANDS, expands)
 
-    total_members = db.session.query(func.count(Member.member_id)).filter(Member.is_deleted.is_(False)).scalar() or 0
-    active_members = (
-        db.session.query(func.count(Member.member_id))
-        .filter(Member.is_deleted.is_(False), (Member.status == "active") | (Member.status.is_(None)))
-        .scalar()
-        or 0
-    )
-    inactive_members = total_members - active_members
+    stats = get_stats()
 
     payload = {
         "members": data,
-        "counts": {"total": total_members, "active": active_members, "inactive": inactive_members},
+        "counts": {"total": stats.total_members, "active": stats.active_members, "inactive": stats.inactive_members},
     }
 
     if "dropdowns" in include_set:
-        clubs = Club.query.filter(Club.is_deleted.is_(False)).order_by(Club.club_name.asc()).all()
-        colleges = College.query.filter(College.is_deleted.is_(False)).order_by(College.college_name.asc()).all()
+        clubs = club_options()
+        colleges = college_options()
         payload["dropdowns"] = {
             "clubs": [{"club_id": c.club_id, "club_name": c.club_name} for c in clubs],
             "colleges": [{"college_id": c.college_id, "college_name": c.college_name} for c in colleges],
@@ -1273,6 +1241,34 @@ def api_list_members():
 
     return ok(payload, **meta)
 
+#POST members (bulk)
+@api.post("/members/bulk")
+def api_bulk_import_members():
+    """
+    Stream a CSV (header row) or NDJSON body of members:
+        member_name, club_ids ("1;2" in CSV, [1, 2] in NDJSON), college_id,
+        faculty_dept, email, phone, description, status
+    Returns a per-row error report; valid rows are committed chunk by chunk.
+    """
+    fmt = _qstr("format").lower()
+    if not fmt:
+        mimetype = request.mimetype or ""
+        if mimetype in ("text/csv", "application/csv"):
+            fmt = "csv"
+        elif mimetype in ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/jsonlines"):
+            fmt = "ndjson"
+    if fmt not in IMPORT_FORMATS:
+        return err("Send text/csv or application/x-ndjson (or pass ?format=csv|ndjson).", 415, "unsupported_media")
+
+    # imports are far larger than a form post; the body is streamed, never buffered
+    request.max_content_length = current_app.config.get("BULK_IMPORT_MAX_BYTES")
+    chunk_size = min(10000, max(1, _qint("chunk_size", current_app.config.get("BULK_IMPORT_CHUNK_SIZE", 1000)) or 1000))
+
+    report = import_members(iter_records(request.stream, fmt), chunk_size=chunk_size)
+    status = 201 if report["inserted"] else 422
+    return ok(report, status)
+
+
 #POST members
 @api.post("/members")
 def api_create_member():
@@ -1318,7 +1314,7 @@ def api_create_member():
     image_rel_path = None
     file = request.files.get("member_image")
     if file and file.filename:
-        rel = _save_upload(file, "MEMBER_UPLOAD_FOLDER")
+        rel = _save_upload(file)
         if not rel:
             return err("Invalid image format.", 415, "unsupported_media")
         image_rel_path = rel
@@ -1347,6 +1343,7 @@ def api_create_member():
                     joined_date=func.now()
                 )
             )
+        refresh_primary_club(db.session.connection(), member_ids=[mem.member_id])
 
         db.session.commit()
     except Exception:
@@ -1355,21 +1352,11 @@ def api_create_member():
         return err("Failed to create member.", 500, "db_error")
 
     # ---- build full response (use local 'clubs' & 'college' to avoid reloading) ----
-    return ok({
-        "member_id": mem.member_id,
-        "member_name": mem.member_name,
-        "college_id": mem.college_id,
-        "college_name": (college.college_name if college else None),
-        "faculty_dept": mem.faculty_dept,
-        "email": mem.email,
-        "phone": mem.phone,
-        "image_path": image_url(mem.member_image) if getattr(mem, "member_image", None) else None,
-        "description": mem.description or "",
-        "status": mem.status,
-        "clubs": [{"club_id": c.club_id, "club_name": c.club_name} for c in clubs],
-        "created_time": mem.created_time.isoformat() if getattr(mem, "created_time", None) else None,
-        "updated_time": mem.updated_time.isoformat() if getattr(mem, "updated_time", None) else None,
-    }, 201)
+    return ok(serialize(
+        mem,
+        college_name=(college.college_name if college else None),
+        clubs=[{"club_id": c.club_id, "club_name": c.club_name} for c in clubs],
+    ), 201)
 
 # Update Members
 @api.put("/members/<int:member_id>")
@@ -1425,29 +1412,19 @@ def api_update_member(member_id: int):
     raw_ids = get_list(request, data, "club_ids")
     if raw_ids:
         club_ids = sorted({int(x) for x in raw_ids if str(x).isdigit()})
-        clubs = Club.query.filter(
-            Club.club_id.in_(club_ids),
-            Club.is_deleted.is_(False)
-        ).all()
-        if len(clubs) != len(club_ids):
+        valid_ids = db.session.execute(
+            select(Club.club_id).where(Club.club_id.in_(club_ids), Club.is_deleted.is_(False))
+        ).scalars().all()
+        if len(valid_ids) != len(club_ids):
             return err("One or more clubs are invalid/deleted.", 422, "validation_error")
 
-        db.session.execute(
-            member_clubs.delete().where(member_clubs.c.member_id == m.member_id)
-        )
-        for c in clubs:
-            db.session.execute(
-                member_clubs.insert().values(
-                    member_id=m.member_id,
-                    club_id=c.club_id,
-                    joined_date=func.now()
-                )
-            )
+        # only removed/added clubs are written; kept memberships keep their joined_date
+        set_member_clubs(db.session.connection(), m.member_id, club_ids)
 
     # --- optional image upload ---
     file = request.files.get("member_image")
     if file and file.filename:
-        rel = _save_upload(file, "MEMBER_UPLOAD_FOLDER")
+        rel = _save_upload(file)
         if not rel:
             return err("Invalid image format.", 415, "unsupported_media")
         m.member_image = rel
@@ -1472,22 +1449,12 @@ def api_update_member(member_id: int):
         .all()
     )
 
-    return ok({
-        "member_id": m.member_id,
-        "member_name": m.member_name,
-        "college_id": m.college_id,
-        "college_name": (college.college_name if college and not getattr(college, "is_deleted", False) else None),
-        "faculty_dept": m.faculty_dept,
-        "email": m.email,
-        "phone": m.phone,
-        "image_path": image_url(m.member_image) if getattr(m, "member_image", None) else None,
-        "description": m.description or "",
-        "status": m.status,
-        "clubs": [{"club_id": c.club_id, "club_name": c.club_name} for c in clubs_q],
-        "created_time": m.created_time.isoformat() if getattr(m, "created_time", None) else None,
-        "updated_time": m.updated_time.isoformat() if getattr(m, "updated_time", None) else None,
-        "message": "Member updated successfully."
-    })
+    return ok(serialize(
+        m,
+        college_name=(college.college_name if college and not getattr(college, "is_deleted", False) else None),
+        clubs=[{"club_id": c.club_id, "club_name": c.club_name} for c in clubs_q],
+        message="Member updated successfully.",
+    ))
 
 #Delete Members
 @api.delete("/members/<int:member_id>")
@@ -1513,13 +1480,16 @@ def api_delete_member(member_id: int):
 # =====================================================================
 # Announcements (GET/POST/PUT/DELETE/RESTORE) — boolean parsing fixed
 # =====================================================================
-@api.get("/announcements")
-def api_list_announcements():
+def _announcements_query():
+    """
+    Announcement query filtered by ?q=&club_id=&status=&pinned= and ordered by ?sort=;
+    returns (query, keys, search, hits). keys is None for relevance order.
+    status is a stored status (draft|published|expired) or active|scheduled (publishing.py).
+    """
     q = _qstr("q")
     club_id = _qint("club_id")
     status = _qstr("status")
     sort = _qstr("sort", "pinned")
-    include = {s.strip().lower() for s in (_qstr("include") or "").split(",") if s}
     pinned_s = _qstr("pinned")
     pinned = None
     if pinned_s:
@@ -1528,11 +1498,19 @@ def api_list_announcements():
             pinned = pb
 
     query = Announcement.query.filter(Announcement.is_deleted.is_(False))
+    search, hits = None, None
     if q:
-        query = query.filter(or_(Announcement.title.ilike(f"%{q}%"), Announcement.content.ilike(f"%{q}%")))
+        search = search_backend()
+        hits = search.hits("announcements", q)
+        if hits is not None:
+            query = query.join(hits, hits.c.id == Announcement.id)
+        else:
+            query = query.filter(or_(Announcement.title.ilike(f"%{q}%"), Announcement.content.ilike(f"%{q}%")))
     if club_id:
         query = query.filter(Announcement.club_id == club_id)
-    if status:
+    if status in STATE_FILTERS:
+        query = query.filter(STATE_FILTERS[status](datetime.now()))
+    elif status:
         query = query.filter(Announcement.status == status)
     if pinned is not None:
         query = query.filter(Announcement.pinned == pinned)
@@ -1540,45 +1518,67 @@ def api_list_announcements():
     created_col = getattr(Announcement, "created_time", None)
     updated_col = getattr(Announcement, "updated_at", None)
 
-    if sort == "updated" and updated_col is not None:
-        query = query.order_by(Announcement.pinned.desc(), updated_col.desc())
+    if sort == "relevance" and hits is not None:
+        # score is not a model column, so relevance pages are offset-only
+        keys = None
+    elif sort == "updated" and updated_col is not None:
+        keys = [(Announcement.pinned, "desc"), (updated_col, "desc"), (Announcement.id, "desc")]
     elif sort == "newest" and created_col is not None:
-        query = query.order_by(Announcement.pinned.desc(), created_col.desc())
+        keys = [(Announcement.pinned, "desc"), (created_col, "desc"), (Announcement.id, "desc")]
     elif sort == "oldest" and created_col is not None:
-        query = query.order_by(Announcement.pinned.desc(), created_col.asc())
+        keys = [(Announcement.pinned, "desc"), (created_col, "asc"), (Announcement.id, "asc")]
     else:
         if updated_col is not None:
-            query = query.order_by(Announcement.pinned.desc(), updated_col.desc())
+            keys = [(Announcement.pinned, "desc"), (updated_col, "desc"), (Announcement.id, "desc")]
         else:
-            query = query.order_by(Announcement.pinned.desc())
+            keys = [(Announcement.pinned, "desc"), (Announcement.id, "desc")]
+    if keys:
+        query = query.order_by(*sort_clauses(keys))
+    else:
+        query = query.order_by(hits.c.score.desc(), Announcement.id.desc())
+    return query, keys, search, hits
+
+
+@api.get("/announcements")
+def api_list_announcements():
+    q = _qstr("q")
+    include = {s.strip().lower() for s in (_qstr("include") or "").split(",") if s}
+    only = _qfields()
+    expands = _qexpand(ANNOUNCEMENT_EXPANDS)
+    query, keys, search, hits = _announcements_query()
+    query = query.options(
+        *column_options(Announcement, "default", only, keys, _expand_columns(ANNOUNCEMENT_EXPANDS, expands))
+    )
 
-    rows, meta = _paginate(query)
+    rows, meta = _paginate(query, keys)
+    snippets = {}
+    if hits is not None and wanted(only, "snippet"):
+        snippets = search.snippets("announcements", q, [a.id for a in rows])
 
     def ser(a: Announcement):
-        return {
-            "id": a.id,
-            "club_id": a.club_id,
-            "title": a.title,
-            "content": a.content,
-            "publish_at": a.publish_at.isoformat() if a.publish_at else None,
-            "expire_at": a.expire_at.isoformat() if a.expire_at else None,
-            "priority": a.priority,
-            "audience": a.audience,
-            "status": a.status,
-            "send_email": bool(a.send_email),
-            "pinned": bool(a.pinned),
-            "updated_at": a.updated_at.isoformat() if getattr(a, "updated_at", None) else None,
-            "created_time": a.created_time.isoformat() if getattr(a, "created_time", None) else None,
-        }
+        if q:
+            return serialize(a, only=only, snippet=snippets.get(a.id))
+        return serialize(a, only=only)
 
-    payload = {"announcements": [ser(a) for a in rows]}
+    data = [ser(a) for a in rows]
+    expand(zip(data, rows), ANNOUNCEMENT_EXPANDS, expands)
+    payload = {"announcements": data}
 
     if "dropdowns" in include:
-        clubs = Club.query.filter(Club.is_deleted.is_(False)).order_by(Club.club_name.asc()).all()
+        clubs = club_options()
         payload["dropdowns"] = {"clubs": [{"club_id": c.club_id, "club_name": c.club_name} for c in clubs]}
 
     return ok(payload, **meta)
 
+#Live announcements (published, between publish_at and expire_at), cached until the next boundary
+@api.get("/announcements/active")
+def api_active_announcements():
+    club_id = _qint("club_id")
+    data = active_announcements()
+    if club_id:
+        data = [a for a in data if a["club_id"] == club_id]
+    return ok({"announcements": data}, total=len(data))
+
 #Create Announcements
 @api.post("/announcements")
 def api_create_announcement():
@@ -1645,23 +1645,11 @@ def api_create_announcement():
         return err("Failed to create announcement.", 500, "db_error")
 
     # ---- Response with full data ----
-    return ok({
-        "id": ann.id,
-        "title": ann.title,
-        "content": ann.content,
-        "club_id": ann.club_id,
-        "club_name": club.club_name if club else None,
-        "publish_at": ann.publish_at.isoformat() if ann.publish_at else None,
-        "expire_at": ann.expire_at.isoformat() if ann.expire_at else None,
-        "priority": ann.priority,
-        "audience": ann.audience,
-        "status": ann.status,
-        "send_email": ann.send_email,
-        "pinned": ann.pinned,
-        "created_at": ann.created_at.isoformat() if getattr(ann, "created_at", None) else None,
-        "updated_at": ann.updated_at.isoformat() if getattr(ann, "updated_at", None) else None,
-        "message": "Announcement created successfully."
-    }, 201)
+    return ok(serialize(
+        ann,
+        club_name=club.club_name if club else None,
+        message="Announcement created successfully.",
+    ), 201)
 #Update Announcements
 # ===== UPDATE ANNOUNCEMENT (full response) =====
 @api.put("/announcements/<int:ann_id>")
@@ -1698,7 +1686,8 @@ def api_update_announcement(ann_id: int):
 
     # ---- status / priority / audience ----
     status = (get_scalar(request, data, "status") or ann.status or "draft").strip().lower()
-    if status not in {"draft", "published"}:
+    # "expired" is kept as-is; publishing.py re-publishes it if expire_at moved ahead
+    if status not in {"draft", "published", "expired"}:
         return err("Invalid status.", 422, "validation_error")
     if status == "published" and not publish_at:
         return err("publish_at is required to publish.", 422, "validation_error")
@@ -1739,23 +1728,11 @@ def api_update_announcement(ann_id: int):
     # fetch club name safely for response
     club_for_resp = db.session.get(Club, ann.club_id) if ann.club_id else None
 
-    return ok({
-        "id": ann.id,
-        "title": ann.title,
-        "content": ann.content,
-        "club_id": ann.club_id,
-        "club_name": (club_for_resp.club_name if club_for_resp and not getattr(club_for_resp, "is_deleted", False) else None),
-        "publish_at": ann.publish_at.isoformat() if ann.publish_at else None,
-        "expire_at": ann.expire_at.isoformat() if ann.expire_at else None,
-        "priority": ann.priority,
-        "audience": ann.audience,
-        "status": ann.status,
-        "send_email": bool(ann.send_email),
-        "pinned": bool(ann.pinned),
-        "created_at": ann.created_time.isoformat() if getattr(ann, "created_time", None) else None,
-        "updated_at": ann.updated_time.isoformat() if getattr(ann, "updated_time", None) else None,
-        "message": "Announcement updated successfully."
-    })
+    return ok(serialize(
+        ann,
+        club_name=(club_for_resp.club_name if club_for_resp and not getattr(club_for_resp, "is_deleted", False) else None),
+        message="Announcement updated successfully.",
+    ))
 
 #Delete Announcements
 @api.delete("/announcements/<int:ann_id>")
@@ -1779,3 +1756,47 @@ def api_delete_announcement(ann_id: int):
         "message": f"Announcement '{ann.title}' deleted successfully."
     }, 200)
 
+#E-mail delivery progress of an announcement (see mailer.py)
+@api.get("/announcements/<int:ann_id>/deliveries")
+def api_announcement_deliveries(ann_id: int):
+    ann = db.session.get(Announcement, ann_id)
+    if not ann:
+        return err("Announcement not found.", 404, "not_found")
+    counts = delivery_counts(ann_id)
+    return ok({
+        "id": ann.id,
+        "send_email": bool(ann.send_email),
+        "total": sum(counts.values()),
+        "counts": {status: counts.get(status, 0) for status in ("queued", "sent", "failed", "cancelled")},
+    })
+
+
+# =====================================================================
+# Admin
+# =====================================================================
+@api.get("/admin/pool")
+def api_admin_pool():
+    """Connection pool of the process serving this request (see dbpool.py)."""
+    return ok({**pool_status(), "profile": current_app.config.get("DB_PROFILE", "dev")})
+
+
+# =====================================================================
+# Exports (streamed CSV / NDJSON, same filters as the list endpoints)
+# =====================================================================
+@api.get("/export/<entity>")
+def api_export(entity: str):
+    fmt = _qstr("format", "csv").lower()
+    if entity not in EXPORTS:
+        return err(f"Unknown export '{entity}'. Use one of: {', '.join(EXPORTS)}.", 404, "not_found")
+    if fmt not in EXPORT_FORMATS:
+        return err("format must be csv or ndjson.", 400, "bad_request")
+
+    if entity == "members":
+        query, _ = _members_query()
+        query = query.options(selectinload(Member.clubs).lazyload(Club.members))
+    elif entity == "events":
+        query = _events_query()[0]
+    else:
+        query = _announcements_query()[0]
+
+    return export_response(query, entity, fmt)
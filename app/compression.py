@@ -0,0 +1,150 @@
+# app/compression.py
+"""
+Response compression.
+
+Dynamic responses (HTML pages, JSON) are gzip- or brotli-encoded in an
+`after_request` hook when the client accepts it and the body is at least
+COMPRESS_MIN_SIZE bytes. Brotli is used when the optional `brotli` package is
+installed. Streamed responses (exports) and files are left alone.
+
+Static files are compressed once, ahead of time:
+
+    python run.py compress-static
+
+writes `style.css.gz` / `style.css.br` (etc.) next to each text asset, and the
+static view serves the best variant the client accepts, as long as it is not
+older than the source file.
+"""
+import gzip
+import mimetypes
+import os
+
+import click
+from flask import current_app, request, send_from_directory
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:     # optional: gzip only
+    brotli = None
+
+COMPRESSIBLE = {
+    "text/html", "text/css", "text/plain", "text/csv", "text/javascript",
+    "application/javascript", "application/json", "application/x-ndjson", "image/svg+xml",
+}
+STATIC_EXTENSIONS = (".css", ".js", ".html", ".svg", ".json", ".txt")
+
+# (file suffix, Content-Encoding), best first
+_VARIANTS = ((".br", "br"), (".gz", "gzip"))
+
+
+def _encoders(best: bool = False) -> dict:
+    """coding -> fn(bytes) -> bytes; `best` (build time) uses the slowest, smallest settings."""
+    level = 9 if best else current_app.config.get("COMPRESS_LEVEL", 6)
+    quality = 11 if best else min(level, 11)
+    encoders = {"gzip": lambda data: gzip.compress(data, compresslevel=level, mtime=0)}
+    if brotli is not None:
+        encoders["br"] = lambda data: brotli.compress(data, quality=quality)
+    return encoders
+
+
+def _accepted(coding: str) -> bool:
+    return request.accept_encodings.quality(coding) > 0
+
+
+# ---------- Dynamic responses ----------
+
+def _compress_response(resp):
+    if (
+        resp.direct_passthrough
+        or resp.is_streamed
+        or not 200 <= resp.status_code < 300
+        or resp.status_code in (204, 206)
+        or "Content-Encoding" in resp.headers
+        or resp.mimetype not in COMPRESSIBLE
+        or "no-transform" in (resp.headers.get("Cache-Control") or "")
+    ):
+        return resp
+    resp.vary.add("Accept-Encoding")
+    if (resp.content_length or 0) < current_app.config.get("COMPRESS_MIN_SIZE", 500):
+        return resp
+
+    encoders = _encoders()
+    coding = next((c for _, c in _VARIANTS if c in encoders and _accepted(c)), None)
+    if coding is None:
+        return resp
+    resp.set_data(encoders[coding](resp.get_data()))
+    resp.headers["Content-Encoding"] = coding
+    return resp
+
+
+# ---------- Static files ----------
+
+def _static_variant(folder: str, filename: str):
+    """(variant filename, coding) of the best fresh precompressed copy the client accepts."""
+    source = safe_join(folder, filename)
+    if source is None or not os.path.isfile(source):
+        return None
+    mtime = os.path.getmtime(source)
+    for suffix, coding in _VARIANTS:
+        path = source + suffix
+        if _accepted(coding) and os.path.isfile(path) and os.path.getmtime(path) >= mtime:
+            return filename + suffix, coding
+    return None
+
+
+def _send_static(filename):
+    app = current_app
+    variant = _static_variant(app.static_folder, filename)
+    if variant is None:
+        resp = app.send_static_file(filename)
+    else:
+        name, coding = variant
+        resp = send_from_directory(
+            app.static_folder, name,
+            mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+            max_age=app.get_send_file_max_age(filename),
+        )
+        resp.headers["Content-Encoding"] = coding
+    if filename.endswith(STATIC_EXTENSIONS):
+        resp.vary.add("Accept-Encoding")
+    return resp
+
+
+def compress_static(folder: str, min_size: int = 0) -> list:
+    """Write .gz (and .br when brotli is installed) next to every text asset; returns the sources."""
+    encoders = _encoders(best=True)
+    done = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if not name.endswith(STATIC_EXTENSIONS):
+                continue
+            source = os.path.join(root, name)
+            with open(source, "rb") as f:
+                data = f.read()
+            if len(data) < min_size:
+                continue
+            for suffix, coding in _VARIANTS:
+                if coding not in encoders:
+                    continue
+                tmp = source + suffix + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(encoders[coding](data))
+                os.replace(tmp, source + suffix)
+            done.append(source)
+    return done
+
+
+# ---------- Wiring ----------
+
+def register_compression(app):
+    app.after_request(_compress_response)
+    app.view_functions["static"] = _send_static
+
+    @app.cli.command("compress-static")
+    def compress_static_command():
+        """Write precompressed .gz/.br copies of the static text assets."""
+        files = compress_static(app.static_folder, app.config.get("COMPRESS_MIN_SIZE", 500))
+        for path in files:
+            click.echo(os.path.relpath(path, app.static_folder))
+        click.echo(f"{len(files)} file(s) compressed" + ("" if brotli else " (gzip only: brotli not installed)"))
@@ -0,0 +1,170 @@
+# app/dbpool.py
+"""
+Connection pool settings, warm-up and live pool metrics.
+
+SQLALCHEMY_ENGINE_OPTIONS is built from a profile picked by DB_PROFILE
+(dev | test | prod); any single value can be overridden from the environment:
+
+    AI_NEXUS_DB_PROFILE=prod AI_NEXUS_DB_POOL_SIZE=20 python run.py
+
+Every profile recycles connections well below MySQL's default wait_timeout, and
+dev/prod ping each connection on checkout, so a connection the server dropped
+while idle is replaced instead of failing the request. The pool is a QueuePool
+that also times each checkout. `pool_status()` (GET /api/admin/pool) reports
+connections checked out and in overflow, plus checkout wait times, for this
+process. Each process can hold up to pool_size + max_overflow connections, which
+is what to budget against MySQL's max_connections.
+
+At startup DB_POOL_WARMUP connections are opened (prod: the whole pool), so
+the first requests do not pay for the connect/handshake.
+"""
+import logging
+import threading
+import time
+
+from sqlalchemy import exc, make_url, text
+from sqlalchemy.pool import QueuePool
+
+from models import db
+
+log = logging.getLogger(__name__)
+
+PROFILES = {
+    "dev": dict(pool_size=5, max_overflow=5, pool_timeout=30, pool_recycle=1800, pool_pre_ping=True, warmup=0),
+    "test": dict(pool_size=2, max_overflow=0, pool_timeout=5, pool_recycle=1800, pool_pre_ping=False, warmup=0),
+    "prod": dict(pool_size=10, max_overflow=10, pool_timeout=10, pool_recycle=1800, pool_pre_ping=True, warmup=None),
+}
+
+# profile key -> (config key holding the override, type)
+_OVERRIDES = {
+    "pool_size": ("DB_POOL_SIZE", int),
+    "max_overflow": ("DB_MAX_OVERFLOW", int),
+    "pool_timeout": ("DB_POOL_TIMEOUT", float),
+    "pool_recycle": ("DB_POOL_RECYCLE", int),
+    "pool_pre_ping": ("DB_POOL_PRE_PING", lambda v: str(v).lower() in ("1", "true", "yes", "on")),
+    "warmup": ("DB_POOL_WARMUP", int),
+}
+
+
+def _settings(config) -> dict:
+    name = (config.get("DB_PROFILE") or "dev").lower()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown DB_PROFILE {name!r}; use one of: {', '.join(PROFILES)}")
+    settings = dict(PROFILES[name])
+    for key, (config_key, cast) in _OVERRIDES.items():
+        value = config.get(config_key)
+        if value not in (None, ""):
+            settings[key] = cast(value)
+    if settings["warmup"] is None:
+        settings["warmup"] = settings["pool_size"]
+    return settings
+
+
+def _in_memory(uri: str) -> bool:
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(config) -> dict:
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured profile (pool settings only; not for in-memory SQLite)."""
+    settings = _settings(config)
+    if _in_memory(config["SQLALCHEMY_DATABASE_URI"]):
+        return {}       # single shared connection (StaticPool); nothing to size
+    options = {k: v for k, v in settings.items() if k != "warmup"}
+    options["poolclass"] = TimedQueuePool
+    return options
+
+
+# ---------- Metrics ----------
+
+class _Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False):
+        with self.lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+
+metrics = _Metrics()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited (including opening a new connection)."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        metrics.record(time.perf_counter() - started)
+        return conn
+
+
+def pool_status() -> dict:
+    """Live state of this process's pool."""
+    engine = db.engine
+    pool = engine.pool
+    status = {"pool": type(pool).__name__, "dialect": engine.dialect.name}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            timeout_s=pool.timeout(),
+            recycle_s=pool._recycle,
+            pre_ping=pool._pre_ping,
+            max_connections=pool.size() + max(pool._max_overflow, 0),
+        )
+    with metrics.lock:
+        status.update(
+            checkouts=metrics.checkouts,
+            checkout_timeouts=metrics.timeouts,
+            wait_ms_avg=round(metrics.wait_total / metrics.checkouts * 1000, 3) if metrics.checkouts else 0.0,
+            wait_ms_max=round(metrics.wait_max * 1000, 3),
+        )
+    return status
+
+
+# ---------- Warm-up ----------
+
+def warm_up(count: int) -> int:
+    """Open `count` pooled connections and return them to the pool; returns how many were opened."""
+    conns = []
+    try:
+        for _ in range(count):
+            conn = db.engine.connect()
+            conns.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in conns:
+            conn.close()
+    return len(conns)
+
+
+# ---------- Wiring ----------
+
+def register_pool(app):
+    settings = _settings(app.config)
+    if settings["warmup"] > 0 and not _in_memory(app.config["SQLALCHEMY_DATABASE_URI"]):
+        with app.app_context():
+            try:
+                warm_up(min(settings["warmup"], settings["pool_size"]))
+            except exc.SQLAlchemyError as e:
+                log.warning("Connection pool warm-up failed: %s", e)
@@ -0,0 +1,118 @@
+# app/etags.py
+"""
+Conditional GET (ETag / If-None-Match) for hot read endpoints.
+
+Every INSERT/UPDATE/DELETE against a watched table advances that table's write
+generation in `cache_generations` ("table:<name>"), once per transaction, when
+the transaction commits (refdata.bump). This is noted from a Core `after_execute`
+hook, so ORM flushes and Core writes (bulk import, membership sync, sort-key
+refresh) are all covered.
+
+    @api.get("/clubs")
+    @conditional("clubs", "members", "member_clubs")
+    def api_list_clubs(): ...
+
+The validator is a hash of the endpoint, its query string and the generations
+of the tables it reads (plus a time bucket for time-relative payloads). A
+matching If-None-Match is answered with 304 after one primary-key read, before
+the view runs any query or serializes anything.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from flask import current_app, request
+from sqlalchemy import event, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql.dml import UpdateBase
+
+import refdata
+from loaders import BATCH_TABLES
+from models import db, CacheGeneration
+
+WATCHED_TABLES = {
+    "clubs", "colleges", "coordinators", "members", "member_clubs", "events", "announcements",
+}
+
+
+# ---------- Write side ----------
+
+def _after_execute(conn, clauseelement, multiparams, params, execution_options, result):
+    if not isinstance(clauseelement, UpdateBase):
+        return
+    table = getattr(clauseelement.table, "name", None)
+    if table in WATCHED_TABLES:
+        refdata.bump(conn, refdata.table_key(table))
+
+
+# ---------- Read side ----------
+
+def _generations(tables) -> dict:
+    names = [refdata.table_key(t) for t in tables]
+    rows = dict(db.session.execute(
+        select(CacheGeneration.name, CacheGeneration.generation).where(CacheGeneration.name.in_(names))
+    ).all())
+    missing = [n for n in names if n not in rows]
+    if missing:
+        # create the counters up front so writers never race on the first insert
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(insert(CacheGeneration.__table__), [{"name": n, "generation": 0} for n in missing])
+        except IntegrityError:
+            pass
+        rows.update({n: 0 for n in missing})
+    return rows
+
+
+def table_generations(*tables) -> tuple:
+    """Write generations of `tables`, in order (for process-local caches keyed on them)."""
+    gens = _generations(tables)
+    return tuple(gens[refdata.table_key(t)] for t in tables)
+
+
+def compute_etag(tables, time_bucket: int | None = None) -> str:
+    gens = _generations(tables)
+    parts = [request.endpoint or "", request.query_string.decode("latin-1")]
+    parts += [f"{name}={gens[name]}" for name in sorted(gens)]
+    if time_bucket:
+        parts.append(str(int(time.time() // time_bucket)))
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+
+def _expanded_tables(expands: dict) -> set:
+    """Tables read by the ?expand= batches this request asks for."""
+    names = (request.args.get("expand") or "").split(",")
+    return {t for n in names if n.strip() in expands for t in BATCH_TABLES[expands[n.strip()][0]]}
+
+
+def conditional(*tables, time_bucket: int | None = None, expands: dict | None = None):
+    """
+    Serve 304 Not Modified when If-None-Match matches the current validator.
+    `time_bucket` (seconds) also rolls the ETag for payloads that depend on "now".
+    `expands` is the endpoint's ?expand= spec; expanded relations add their tables.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            watched = set(tables) | _expanded_tables(expands) if expands else tables
+            etag = compute_etag(watched, time_bucket)
+            if request.if_none_match.contains_weak(etag):
+                resp = current_app.response_class(status=304)
+                resp.set_etag(etag, weak=True)
+                resp.headers["Cache-Control"] = "private, no-cache"
+                return resp
+            resp = current_app.make_response(view(*args, **kwargs))
+            if resp.status_code == 200:
+                resp.set_etag(etag, weak=True)
+                resp.headers["Cache-Control"] = "private, no-cache"
+            return resp
+        return wrapper
+    return decorator
+
+
+# ---------- Wiring ----------
+
+def register_etags(app):
+    if not event.contains(Engine, "after_execute", _after_execute):
+        event.listen(Engine, "after_execute", _after_execute)
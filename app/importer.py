@@ -0,0 +1,246 @@
+# app/importer.py
+"""
+Bulk member import (POST /api/members/bulk).
+
+    report = import_members(iter_records(request.stream, "csv"))
+
+The body is parsed record by record from the request stream, validated against
+club/college id sets loaded once up front, and written in chunks: one
+executemany INSERT for the members, one for their `member_clubs` rows, one
+commit per chunk. A bad row never aborts the import; it is reported by line
+number and skipped.
+
+Member ids for the `member_clubs` rows come from ordered executemany RETURNING
+where the database has it (SQLite), and on MySQL from LAST_INSERT_ID() of a
+single multi-row INSERT per chunk (see `_insert_members_mysql`).
+
+These are Core inserts, so the ORM flush listeners do not see them: the stats
+row is bumped per chunk and `primary_club_name` is computed here.
+"""
+import codecs
+import csv
+import json
+import re
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import func, insert, select
+
+import stats
+from models import db, Club, College, Member, member_clubs
+from utils import clean_phone
+
+FORMATS = ("csv", "ndjson")
+MEMBER_STATUS_VALUES = ("active", "inactive")
+MAX_ERRORS = 1000           # rows beyond this are still counted, just not listed
+
+# column -> max length (matches models.Member)
+_LIMITS = {"member_name": 100, "faculty_dept": 100, "email": 120}
+
+
+class RowError(ValueError):
+    """A single input record failed validation."""
+
+
+# ---------- Parsing ----------
+
+def iter_records(stream, fmt: str):
+    """
+    Yield (line_no, record) from a binary stream without reading it all into memory.
+    `record` is a dict, or a RowError when the line itself cannot be parsed.
+    """
+    text = codecs.getreader("utf-8-sig")(stream)
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for rec in reader:
+            yield reader.line_num, rec
+        return
+    for line_no, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            rec = json.loads(line)
+        except ValueError as e:
+            yield line_no, RowError(f"invalid JSON: {e}")
+            continue
+        yield line_no, rec if isinstance(rec, dict) else RowError("each line must be a JSON object")
+
+
+def _split_ids(raw) -> list:
+    if raw is None:
+        return []
+    items = raw if isinstance(raw, list) else re.split(r"[;,|\s]+", str(raw))
+    out = []
+    for x in items:
+        s = str(x).strip()
+        if not s:
+            continue
+        if not s.isdigit():
+            raise RowError(f"club id {s!r} is not an integer")
+        out.append(int(s))
+    return sorted(set(out))
+
+
+def _text(rec, key):
+    val = rec.get(key)
+    val = str(val).strip() if val is not None else ""
+    limit = _LIMITS.get(key)
+    if limit and len(val) > limit:
+        raise RowError(f"{key} is longer than {limit} characters")
+    return val or None
+
+
+def validate_member(rec: dict, club_names: dict, college_ids: set):
+    """Turn one input record into (members row, club_ids); raises RowError."""
+    rec = {str(k).strip().lower().replace("-", "_").replace(" ", "_"): v for k, v in rec.items() if k is not None}
+
+    name = _text(rec, "member_name")
+    if not name:
+        raise RowError("member_name is required")
+
+    club_ids = _split_ids(rec.get("club_ids"))
+    if not club_ids:
+        raise RowError("at least one club_id is required")
+    unknown = [c for c in club_ids if c not in club_names]
+    if unknown:
+        raise RowError(f"invalid/deleted club ids: {unknown}")
+
+    college_id = rec.get("college_id")
+    if college_id in (None, ""):
+        college_id = None
+    else:
+        if not str(college_id).strip().isdigit() or int(college_id) not in college_ids:
+            raise RowError("invalid/deleted college")
+        college_id = int(college_id)
+
+    status = (_text(rec, "status") or "active").lower()
+    if status not in MEMBER_STATUS_VALUES:
+        raise RowError(f"status must be one of {', '.join(MEMBER_STATUS_VALUES)}")
+
+    raw_phone = _text(rec, "phone")
+    phone = clean_phone(raw_phone)
+    if raw_phone and not phone:
+        raise RowError("invalid phone")
+
+    now = datetime.now()
+    row = {
+        "member_name": name,
+        "college_id": college_id,
+        "faculty_dept": _text(rec, "faculty_dept"),
+        "email": _text(rec, "email"),
+        "phone": phone,
+        "description": _text(rec, "description"),
+        "status": status,
+        "is_deleted": False,
+        "created_time": now,
+        "updated_time": now,
+        "primary_club_name": min(club_names[c] for c in club_ids),
+    }
+    return row, club_ids
+
+
+# ---------- Writing ----------
+
+def _insert_members(conn, rows) -> list:
+    """INSERT the chunk and return the new member_ids in input order."""
+    table = Member.__table__
+    if conn.dialect.insert_executemany_returning_sort_by_parameter_order:
+        result = conn.execute(
+            insert(table).returning(table.c.member_id, sort_by_parameter_order=True), rows
+        )
+        return list(result.scalars())
+    if conn.dialect.name in ("mysql", "mariadb"):
+        return _insert_members_mysql(conn, rows)
+    # no way to match keys to rows: one statement per row
+    return [conn.execute(insert(table), row).inserted_primary_key[0] for row in rows]
+
+
+def _insert_members_mysql(conn, rows) -> list:
+    """
+    One multi-row INSERT ... VALUES for the chunk. LAST_INSERT_ID() is the id of
+    its first row; InnoDB reserves all the ids of such a statement (row count
+    known up front) in one step, so they are consecutive in every
+    innodb_autoinc_lock_mode, spaced by auto_increment_increment.
+    """
+    table = Member.__table__
+    first = conn.execute(insert(table).values(rows)).lastrowid
+    step = conn.exec_driver_sql("SELECT @@auto_increment_increment").scalar()
+    ids = list(range(first, first + len(rows) * step, step))
+    # our rows are the only ones in the range we can see; anything else means the guess was wrong
+    seen = conn.scalar(
+        select(func.count()).select_from(table).where(table.c.member_id.between(ids[0], ids[-1]))
+    )
+    if seen != len(rows):
+        raise RuntimeError(f"inserted member ids are not consecutive ({seen} of {len(rows)} in range)")
+    return ids
+
+
+def _write_chunk(chunk) -> None:
+    rows = [row for _, row, _ in chunk]
+    with db.engine.begin() as conn:
+        ids = _insert_members(conn, rows)
+        links = [
+            {"member_id": member_id, "club_id": club_id, "joined_date": row["created_time"]}
+            for member_id, (_, row, club_ids) in zip(ids, chunk)
+            for club_id in club_ids
+        ]
+        conn.execute(insert(member_clubs), links)
+        stats.bump(
+            conn,
+            total_members=len(rows),
+            active_members=sum(1 for r in rows if r["status"] == "active"),
+        )
+
+
+def import_members(records, chunk_size: int = 1000) -> dict:
+    """Validate and insert `records` ((line_no, dict) pairs); returns the per-row report."""
+    club_names = dict(db.session.execute(
+        select(Club.club_id, Club.club_name).where(Club.is_deleted.is_(False))
+    ).all())
+    college_ids = set(db.session.execute(
+        select(College.college_id).where(College.is_deleted.is_(False))
+    ).scalars())
+    db.session.rollback()   # release the read transaction; chunks use their own connections
+
+    report = {"received": 0, "inserted": 0, "failed": 0, "chunks": 0, "errors": []}
+
+    def fail(line_no, message):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_ERRORS:
+            report["errors"].append({"line": line_no, "error": message})
+
+    def flush(chunk):
+        try:
+            _write_chunk(chunk)
+        except Exception as e:
+            current_app.logger.exception("Bulk member import: chunk failed")
+            for line_no, _, _ in chunk:
+                fail(line_no, f"database error: {e.__class__.__name__}")
+            return
+        report["inserted"] += len(chunk)
+        report["chunks"] += 1
+
+    chunk = []
+    try:
+        for line_no, rec in records:
+            report["received"] += 1
+            try:
+                if isinstance(rec, RowError):
+                    raise rec
+                row, club_ids = validate_member(rec, club_names, college_ids)
+            except RowError as e:
+                fail(line_no, str(e))
+                continue
+            chunk.append((line_no, row, club_ids))
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+    except (csv.Error, UnicodeDecodeError) as e:
+        # the rest of the body is unreadable; keep what was already committed
+        report["aborted"] = f"could not parse input: {e}"
+    if chunk:
+        flush(chunk)
+
+    report["errors_truncated"] = report["failed"] > len(report["errors"])
+    return report
@@ -0,0 +1,322 @@
+# app/jobs.py
+"""
+Background jobs kept in the `jobs` table of the app's own database (SQLite or
+MySQL; no broker).
+
+Work that does not have to finish inside a request is registered as a task and
+queued from the request instead of being run there:
+
+    @task("generate-thumbnails")
+    def _generate_thumbnails(path): ...
+
+    enqueue("generate-thumbnails", path="uploads/store/ab/cd/<sha256>.png")
+
+`enqueue` only adds the row to the current session, so the job is committed (or
+rolled back) together with the caller's own changes. Workers run it later:
+
+    python run.py run-jobs --workers 4
+
+A worker claims a due job with a conditional UPDATE (status, run_at and lock are
+re-checked in the WHERE clause, so two workers never both win the same row) and
+holds it for JOB_VISIBILITY_TIMEOUT seconds. A job whose worker died becomes
+claimable again once that lock expires. The outcome is only recorded while the
+worker still holds the job on the attempt it claimed, so a worker that ran past
+its lock cannot mark done, or re-schedule, a job another worker has taken over.
+A failed job is retried with exponential backoff until it has used
+`max_attempts`, then it is left as `failed` with the last error. Higher `priority` runs first; `run_at` / `delay` schedule a job for
+later.
+
+Periodic tasks (`@task(name, every="CONFIG_KEY")`) queue their next run when a
+run finishes, CONFIG_KEY seconds later; workers queue the first run on start.
+`@task(name, on_failure=fn)` calls `fn(error, **payload)` once the job has given
+up, so a task can record the outcome on the rows it was working on.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import traceback
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app
+from sqlalchemy import and_, delete, or_, select, update
+
+from models import db, Job
+
+log = logging.getLogger(__name__)
+
+TASKS = {}       # name -> callable(**payload)
+PERIODIC = {}    # name -> config key holding the interval in seconds (<= 0 disables)
+ON_FAILURE = {}  # name -> callable(error, **payload), run when a job is left as failed
+
+
+def task(name: str, every: str | None = None, on_failure=None):
+    """Register the decorated function as the handler for jobs named `name`."""
+    def decorator(fn):
+        TASKS[name] = fn
+        if every:
+            PERIODIC[name] = every
+        if on_failure:
+            ON_FAILURE[name] = on_failure
+        return fn
+    return decorator
+
+
+def enqueue(name: str, *, priority: int = 0, run_at: datetime | None = None,
+            delay: float | None = None, max_attempts: int | None = None, **payload) -> Job:
+    """Queue `name(**payload)`; the job is saved with the current transaction."""
+    if name not in TASKS:
+        raise ValueError(f"Unknown task {name!r}")
+    if run_at is None:
+        run_at = datetime.now() + timedelta(seconds=delay or 0)
+    job = Job(
+        task=name,
+        payload=json.dumps(payload),
+        priority=priority,
+        run_at=run_at,
+        max_attempts=max_attempts or current_app.config.get("JOB_MAX_ATTEMPTS", 3),
+    )
+    db.session.add(job)
+    return job
+
+
+def _queue_periodic(name: str, delay: float = 0, exclude: int | None = None) -> None:
+    """Queue the next run of periodic task `name` unless one is already pending."""
+    if current_app.config.get(PERIODIC[name], 0) <= 0:
+        return
+    pending = select(Job.id).where(Job.task == name, Job.status.in_(("queued", "running")))
+    if exclude is not None:
+        pending = pending.where(Job.id != exclude)
+    if db.session.scalar(pending.limit(1)) is None:
+        enqueue(name, delay=delay)
+
+
+def ensure_periodic() -> None:
+    """Queue a first run of every periodic task that has none pending."""
+    for name in PERIODIC:
+        _queue_periodic(name)
+    db.session.commit()
+
+
+# ---------- Claiming ----------
+
+def _due(now: datetime):
+    return or_(
+        and_(Job.status == "queued", Job.run_at <= now),
+        and_(Job.status == "running", Job.locked_until < now),   # worker gone, lock expired
+    )
+
+
+def claim(worker: str, limit: int = 1) -> list:
+    """Lock up to `limit` due jobs for `worker`; returns their ids (highest priority first)."""
+    now = datetime.now()
+    timeout = current_app.config.get("JOB_VISIBILITY_TIMEOUT", 300)
+    candidates = db.session.scalars(
+        select(Job.id)
+        .where(_due(now))
+        .order_by(Job.priority.desc(), Job.run_at, Job.id)
+        .limit(limit * 4)       # some may be taken by another worker meanwhile
+    ).all()
+    claimed = []
+    for job_id in candidates:
+        result = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, _due(now))
+            .values(
+                status="running",
+                locked_by=worker,
+                locked_until=now + timedelta(seconds=timeout),
+                attempts=Job.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        if result.rowcount:
+            claimed.append(job_id)
+            if len(claimed) == limit:
+                break
+    return claimed
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    base = current_app.config.get("JOB_RETRY_BACKOFF", 30)
+    return timedelta(seconds=base * 2 ** (attempts - 1))
+
+
+def _finish(job, owner: str, attempt: int, **values) -> bool:
+    """Record a job's outcome if `owner` still holds it on `attempt`; False (and logged) if not."""
+    result = db.session.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.status == "running", Job.locked_by == owner, Job.attempts == attempt)
+        .values(locked_by=None, locked_until=None, **values)
+    )
+    if result.rowcount:
+        return True
+    log.warning("Job %s (%s) was taken over after its lock expired; attempt %s by %s not recorded",
+                job.id, job.task, attempt, owner)
+    return False
+
+
+def run_job(job_id: int, worker: str | None = None) -> bool:
+    """Run one job claimed by `worker` (default: whoever holds it) and record the outcome; True if it succeeded."""
+    job = db.session.get(Job, job_id)
+    owner, attempt = worker or job.locked_by, job.attempts
+    if job.status != "running" or job.locked_by != owner:
+        log.warning("Job %s (%s) is no longer held by %s; not run", job.id, job.task, owner)
+        return False
+    fn = TASKS.get(job.task)
+    try:
+        if fn is None:
+            raise LookupError(f"Unknown task {job.task!r}")
+        if job.attempts > job.max_attempts:
+            raise TimeoutError("Visibility timeout expired on the last attempt")
+        fn(**json.loads(job.payload or "{}"))
+    except Exception as e:
+        error = traceback.format_exc(limit=5)
+        db.session.rollback()
+        log.warning("Job %s (%s) failed on attempt %s", job.id, job.task, attempt, exc_info=True)
+        if attempt >= job.max_attempts or fn is None:
+            outcome = dict(status="failed", finished_at=datetime.now())
+        else:
+            outcome = dict(status="queued", run_at=datetime.now() + _retry_delay(attempt))
+        recorded = _finish(job, owner, attempt, last_error=error, **outcome)
+        if recorded:
+            _next_run(job)
+        db.session.commit()
+        if recorded and outcome["status"] == "failed":
+            _gave_up(job, f"{type(e).__name__}: {e}")
+        return False
+    if _finish(job, owner, attempt, status="done", finished_at=datetime.now()):
+        _next_run(job)
+    db.session.commit()
+    return True
+
+
+def _gave_up(job, error: str) -> None:
+    hook = ON_FAILURE.get(job.task)
+    if hook is None:
+        return
+    try:
+        hook(error, **json.loads(job.payload or "{}"))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        log.exception("on_failure hook of job %s (%s) failed", job.id, job.task)
+
+
+def _next_run(job) -> None:
+    if job.task in PERIODIC and job.status in ("done", "failed"):
+        _queue_periodic(job.task, current_app.config.get(PERIODIC[job.task], 0), exclude=job.id)
+
+
+# ---------- Workers ----------
+
+def work(app, worker: str, *, once: bool = False, batch: int = 1) -> int:
+    """Claim and run jobs until stopped (or, with `once`, until none is due); returns the count run."""
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    done = 0
+    with app.app_context():
+        poll = app.config.get("JOB_POLL_INTERVAL", 2)
+        ensure_periodic()
+        while not stopping:
+            ids = claim(worker, batch)
+            if not ids:
+                if once:
+                    break
+                time.sleep(poll)
+                continue
+            for job_id in ids:
+                run_job(job_id, worker)
+                done += 1
+            db.session.remove()
+    return done
+
+
+def _work_in_child(app, worker: str, once: bool, batch: int) -> None:
+    # connections inherited from the parent must not be shared with it
+    with app.app_context():
+        db.engine.dispose(close=False)
+    work(app, worker, once=once, batch=batch)
+
+
+def purge(older_than_days: int) -> int:
+    """Delete done jobs finished more than `older_than_days` ago; returns the count deleted."""
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    result = db.session.execute(delete(Job).where(Job.status == "done", Job.finished_at < cutoff))
+    db.session.commit()
+    return result.rowcount
+
+
+@task("purge-jobs")
+def _purge_jobs(older_than_days: int = 7):
+    purge(older_than_days)
+
+
+# ---------- Wiring ----------
+
+def register_jobs(app):
+    @app.cli.command("run-jobs")
+    @click.option("--workers", default=1, show_default=True, help="Worker processes to start.")
+    @click.option("--batch", default=1, show_default=True, help="Jobs each worker claims at a time.")
+    @click.option("--once", is_flag=True, help="Exit when no job is due instead of polling.")
+    def run_jobs_command(workers, batch, once):
+        """Run queued background jobs."""
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(name)s: %(message)s")
+        name = f"{socket.gethostname()}:{os.getpid()}"
+        if workers <= 1:
+            click.echo(f"{work(app, name, once=once, batch=batch)} job(s) run.")
+            return
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise click.ClickException("--workers > 1 needs fork(); start several `run-jobs` processes instead.")
+        ctx = multiprocessing.get_context("fork")
+        procs = [
+            ctx.Process(target=_work_in_child, args=(app, f"{name}/{i}", once, batch), name=f"jobs-{i}")
+            for i in range(workers)
+        ]
+        for p in procs:
+            p.start()
+        try:
+            for p in procs:
+                p.join()
+        except KeyboardInterrupt:
+            for p in procs:
+                p.terminate()
+            for p in procs:
+                p.join()
+
+    @app.cli.command("enqueue-job")
+    @click.argument("name")
+    @click.option("--arg", "args", multiple=True, metavar="KEY=VALUE", help="Task keyword argument (JSON value or string).")
+    @click.option("--priority", default=0, show_default=True)
+    @click.option("--delay", default=0.0, show_default=True, help="Seconds before the job may run.")
+    def enqueue_job_command(name, args, priority, delay):
+        """Queue a job by task name, e.g. `enqueue-job purge-jobs --arg older_than_days=30`."""
+        payload = {}
+        for arg in args:
+            key, _, raw = arg.partition("=")
+            try:
+                payload[key] = json.loads(raw)
+            except ValueError:
+                payload[key] = raw
+        try:
+            job = enqueue(name, priority=priority, delay=delay, **payload)
+        except ValueError as e:
+            raise click.ClickException(f"{e}; known tasks: {', '.join(sorted(TASKS))}")
+        db.session.commit()
+        click.echo(f"queued job {job.id} ({name})")
+
+    @app.cli.command("jobs-status")
+    def jobs_status_command():
+        """Job counts by task and status."""
+        rows = db.session.execute(
+            select(Job.task, Job.status, db.func.count()).group_by(Job.task, Job.status).order_by(Job.task, Job.status)
+        ).all()
+        for name, status, count in rows:
+            click.echo(f"{name:<28} {status:<8} {count}")
+        if not rows:
+            click.echo("no jobs")
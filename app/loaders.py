@@ -0,0 +1,130 @@
+# app/loaders.py
+"""
+Request-scoped batched loading for ?expand= (DataLoader pattern).
+
+A list endpoint first registers every foreign key on the page, then reads
+them back; the first read resolves all pending keys of that kind with one
+`IN` query, and the results are memoized for the rest of the request:
+
+    expand(pairs, {"club": ("clubs", "organising_club_id")}, {"club"})
+
+Two lists in one response (e.g. upcoming + all events) share the same batch,
+so a page costs one query per related entity type, never one per row.
+"""
+from flask import g
+from sqlalchemy import func, select
+from sqlalchemy.orm import lazyload, load_only
+
+from models import db, Club, College, Member, member_clubs
+from serializers import serialize
+
+
+class InvalidExpand(ValueError):
+    """?expand= named something the endpoint cannot expand."""
+
+
+def parse_expand(raw: str, spec: dict) -> set:
+    """?expand=a,b -> {"a", "b"}, checked against the endpoint's `spec`."""
+    names = {n.strip() for n in (raw or "").split(",") if n.strip()}
+    unknown = names - spec.keys()
+    if unknown:
+        raise InvalidExpand(
+            f"cannot expand {', '.join(sorted(unknown))}; choose from {', '.join(sorted(spec))}"
+        )
+    return names
+
+
+class Loader:
+    """Collects keys with `want()`; the first `get()` resolves every pending key in one batch."""
+
+    def __init__(self, batch):
+        self._batch = batch         # fn(sorted keys) -> {key: value}
+        self._pending = set()
+        self._values = {}
+
+    def want(self, keys) -> None:
+        self._pending.update(k for k in keys if k is not None and k not in self._values)
+
+    def get(self, key):
+        if key is None:
+            return None
+        if key not in self._values:
+            self._pending.add(key)
+            self._flush()
+        return self._values[key]
+
+    def _flush(self) -> None:
+        keys, self._pending = self._pending, set()
+        found = self._batch(sorted(keys))
+        for k in keys:
+            self._values[k] = found.get(k)
+
+
+# ---------- Batches ----------
+
+def _clubs(ids) -> dict:
+    rows = (
+        db.session.query(Club)
+        .options(load_only(Club.club_name, Club.club_category, Club.status), lazyload(Club.members))
+        .filter(Club.club_id.in_(ids), Club.is_deleted.is_(False))
+        .all()
+    )
+    return {c.club_id: serialize(c, "ref") for c in rows}
+
+
+def _colleges(ids) -> dict:
+    rows = (
+        db.session.query(College)
+        .options(load_only(College.college_name, College.location, College.status))
+        .filter(College.college_id.in_(ids), College.is_deleted.is_(False))
+        .all()
+    )
+    return {c.college_id: serialize(c, "ref") for c in rows}
+
+
+def _club_member_counts(ids) -> dict:
+    counts = dict(db.session.execute(
+        select(member_clubs.c.club_id, func.count(member_clubs.c.member_id))
+        .join(Member, Member.member_id == member_clubs.c.member_id)
+        .where(member_clubs.c.club_id.in_(ids), Member.is_deleted.is_(False))
+        .group_by(member_clubs.c.club_id)
+    ).all())
+    return {k: counts.get(k, 0) for k in ids}
+
+
+BATCHES = {
+    "clubs": _clubs,
+    "colleges": _colleges,
+    "club_members_count": _club_member_counts,
+}
+
+# tables each batch reads (conditional GET must watch them when expanded)
+BATCH_TABLES = {
+    "clubs": ("clubs",),
+    "colleges": ("colleges",),
+    "club_members_count": ("members", "member_clubs"),
+}
+
+
+def loader(name: str) -> Loader:
+    """The current request's loader for `name` (see BATCHES)."""
+    loaders = g.setdefault("loaders", {})
+    if name not in loaders:
+        loaders[name] = Loader(BATCHES[name])
+    return loaders[name]
+
+
+def expand(pairs, spec: dict, names) -> None:
+    """
+    Add each expansion in `names` to the serialized items.
+    `pairs` is [(item dict, model obj)]; `spec` maps name -> (batch name, foreign-key attribute).
+    """
+    pairs = list(pairs)
+    for name in names:
+        source, attr = spec[name]
+        loader(source).want(getattr(obj, attr) for _, obj in pairs)
+    for name in names:
+        source, attr = spec[name]
+        ld = loader(source)
+        for item, obj in pairs:
+            item[name] = ld.get(getattr(obj, attr))
@@ -0,0 +1,351 @@
+# app/mailer.py
+"""
+E-mail delivery for announcements saved with `send_email=True`.
+
+When an announcement is flushed as published with `send_email` set (created
+that way, or its status / send_email / publish_at / audience just changed), a
+`send-announcement` job is queued for its publish time (jobs.py). Nothing is
+sent from the request.
+
+That job resolves the audience in the database with one INSERT ... SELECT into
+`announcement_deliveries` (one row per distinct address; addresses that already
+have a row are skipped, so running it again only adds new recipients), then
+queues one `send-announcement-batch` job per EMAIL_BATCH_SIZE queued recipients
+not already covered by a pending batch. Batch jobs run in the `run-jobs` workers
+and send over one SMTP connection per worker process, reused across batches, at
+most EMAIL_RATE_LIMIT messages per second.
+
+Each recipient's row records sent / failed / cancelled. A temporary SMTP error,
+or no connection to the server at all, counts as a try for the recipients it
+held up; they stay queued and the batch job is retried with backoff, up to
+EMAIL_MAX_ATTEMPTS tries per recipient. When a batch job gives up, whatever is
+still queued in it is marked failed with the error. Queue `send-announcement`
+again (`python run.py enqueue-job send-announcement --arg announcement_id=<id>`)
+to resume an announcement whose batches were lost.
+
+Audiences: all_members (every member, whatever `club_id` is), members (of
+`club_id` when set), and the other values the announcement forms offer:
+coordinators, student_coordinators, college_coordinators (of `club_id` when
+set) and colleges.
+"""
+import json
+import smtplib
+import time
+from datetime import datetime
+from email.message import EmailMessage
+
+from flask import current_app
+from sqlalchemy import and_, event, func, insert, inspect, literal, or_, select
+from sqlalchemy.orm import Session
+
+from jobs import enqueue, task
+from models import db, Announcement, AnnouncementDelivery, College, Coordinator, Job, Member, member_clubs
+from stats import FACULTY_ROLES
+
+# changes that can make an announcement due for sending
+_TRIGGER_ATTRS = ("status", "send_email", "publish_at", "audience", "club_id", "is_deleted")
+_PENDING = "mailer_pending"     # key in Session.info: announcement ids flushed as sendable
+_BATCH_TASK = "send-announcement-batch"
+
+_smtp = None    # this process's connection, reused across batches
+
+
+class DeliveryDeferred(Exception):
+    """Some recipients hit a temporary error; raised so the batch job is retried."""
+
+
+# ---------- Audience ----------
+
+def _has_email(col):
+    return and_(col.isnot(None), col != "")
+
+
+def _member_recipients(ann, in_club: bool = True):
+    q = select(Member.email).where(
+        Member.is_deleted.is_(False),
+        or_(Member.status == "active", Member.status.is_(None)),
+        _has_email(Member.email),
+    )
+    if in_club and ann.club_id:
+        q = q.join(member_clubs, member_clubs.c.member_id == Member.member_id).where(
+            member_clubs.c.club_id == ann.club_id
+        )
+    return q
+
+
+def _coordinator_recipients(ann, *roles):
+    q = select(Coordinator.email).where(
+        Coordinator.is_deleted.is_(False),
+        Coordinator.status == "active",
+        _has_email(Coordinator.email),
+    )
+    if roles:
+        q = q.where(Coordinator.role_type.in_(roles))
+    if ann.club_id:
+        q = q.where(Coordinator.club_id == ann.club_id)
+    return q
+
+
+def _college_recipients(ann):
+    return select(College.email).where(
+        College.is_deleted.is_(False),
+        College.status == "active",
+        _has_email(College.email),
+    )
+
+
+AUDIENCES = {
+    "all_members": lambda ann: _member_recipients(ann, in_club=False),
+    "members": _member_recipients,
+    "coordinators": _coordinator_recipients,
+    "student_coordinators": lambda ann: _coordinator_recipients(ann, "student"),
+    "college_coordinators": lambda ann: _coordinator_recipients(ann, *FACULTY_ROLES),
+    "colleges": _college_recipients,
+}
+
+
+def fan_out(ann) -> int:
+    """Insert a queued delivery row per distinct recipient of `ann`; returns the number inserted."""
+    recipients = AUDIENCES.get(ann.audience or "all_members", _member_recipients)(ann)
+    emails = recipients.distinct().subquery()
+    stmt = (
+        insert(AnnouncementDelivery)
+        .from_select(
+            ["announcement_id", "email", "status", "attempts"],
+            select(literal(ann.id), emails.c[0], literal("queued"), literal(0)),
+        )
+        # skip addresses that already have a row (uq_delivery_announcement_email)
+        .prefix_with("OR IGNORE", dialect="sqlite")
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("IGNORE", dialect="mariadb")
+    )
+    return db.session.execute(stmt).rowcount
+
+
+# ---------- SMTP ----------
+
+def _connect():
+    cfg = current_app.config
+    cls = smtplib.SMTP_SSL if cfg.get("MAIL_USE_SSL") else smtplib.SMTP
+    smtp = cls(cfg.get("MAIL_SERVER", "localhost"), cfg.get("MAIL_PORT", 25), timeout=cfg.get("MAIL_TIMEOUT", 30))
+    if cfg.get("MAIL_USE_TLS"):
+        smtp.starttls()
+    if cfg.get("MAIL_USERNAME"):
+        smtp.login(cfg["MAIL_USERNAME"], cfg.get("MAIL_PASSWORD") or "")
+    return smtp
+
+
+def _close():
+    global _smtp
+    if _smtp is not None:
+        try:
+            _smtp.quit()
+        except OSError:     # smtplib.SMTPException included
+            _smtp.close()
+    _smtp = None
+
+
+def _connection():
+    """The process's SMTP connection: reused while the server still answers NOOP."""
+    global _smtp
+    if _smtp is not None:
+        try:
+            if _smtp.noop()[0] == 250:
+                return _smtp
+        except OSError:
+            pass
+        _close()
+    _smtp = _connect()
+    return _smtp
+
+
+def _message(ann, to: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = current_app.config.get("MAIL_DEFAULT_SENDER", "noreply@localhost")
+    msg["To"] = to
+    msg["Subject"] = ann.title
+    msg.set_content(ann.content)
+    return msg
+
+
+def _permanent(exc) -> bool:
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in exc.recipients.values())
+    return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code >= 500
+
+
+class _Throttle:
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self.next_at = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if now < self.next_at:
+            time.sleep(self.next_at - now)
+        self.next_at = max(now, self.next_at) + self.interval
+
+
+# ---------- Jobs ----------
+
+def _sendable(ann) -> bool:
+    return bool(ann and not ann.is_deleted and ann.send_email and ann.status == "published")
+
+
+def _pending_batches(announcement_id: int) -> list:
+    """(first_id, last_id) of the announcement's batch jobs that are still queued or running."""
+    payloads = db.session.scalars(
+        select(Job.payload).where(Job.task == _BATCH_TASK, Job.status.in_(("queued", "running")))
+    )
+    ranges = []
+    for payload in payloads:
+        args = json.loads(payload)
+        if args.get("announcement_id") == announcement_id:
+            ranges.append((args["first_id"], args["last_id"]))
+    return ranges
+
+
+@task("send-announcement")
+def _send_announcement(announcement_id: int):
+    ann = db.session.get(Announcement, announcement_id)
+    if not _sendable(ann) or (ann.publish_at and ann.publish_at > datetime.now()):
+        return      # unpublished, or re-queued for a later publish time
+    fan_out(ann)
+
+    # every queued recipient that no pending batch will pick up (new, or left by a lost batch)
+    covered = _pending_batches(ann.id)
+    ids = [
+        i for i in db.session.scalars(
+            select(AnnouncementDelivery.id)
+            .where(AnnouncementDelivery.announcement_id == ann.id, AnnouncementDelivery.status == "queued")
+            .order_by(AnnouncementDelivery.id)
+        )
+        if not any(first <= i <= last for first, last in covered)
+    ]
+    size = current_app.config.get("EMAIL_BATCH_SIZE", 200)
+    for start in range(0, len(ids), size):
+        chunk = ids[start:start + size]
+        enqueue(
+            _BATCH_TASK,
+            announcement_id=ann.id, first_id=chunk[0], last_id=chunk[-1],
+            max_attempts=current_app.config.get("EMAIL_MAX_ATTEMPTS", 3),
+        )
+    db.session.commit()
+
+
+def _queued_in(announcement_id: int, first_id: int, last_id: int):
+    return (
+        select(AnnouncementDelivery)
+        .where(
+            AnnouncementDelivery.announcement_id == announcement_id,
+            AnnouncementDelivery.id.between(first_id, last_id),
+            AnnouncementDelivery.status == "queued",
+        )
+        .order_by(AnnouncementDelivery.id)
+    )
+
+
+def _batch_failed(error: str, announcement_id: int, first_id: int, last_id: int):
+    """The batch job gave up: its recipients still queued will not be tried again."""
+    for d in db.session.scalars(_queued_in(announcement_id, first_id, last_id)):
+        d.status = "failed"
+        d.last_error = (d.last_error or error)[:255]
+
+
+@task(_BATCH_TASK, on_failure=_batch_failed)
+def _send_batch(announcement_id: int, first_id: int, last_id: int):
+    ann = db.session.get(Announcement, announcement_id)
+    pending = db.session.scalars(_queued_in(announcement_id, first_id, last_id)).all()
+    if not pending:
+        return
+    if not _sendable(ann):
+        for d in pending:
+            d.status = "cancelled"
+        db.session.commit()
+        return
+
+    global _smtp
+    max_attempts = current_app.config.get("EMAIL_MAX_ATTEMPTS", 3)
+    throttle = _Throttle(current_app.config.get("EMAIL_RATE_LIMIT", 10))
+    deferred = 0
+    try:
+        _connection()
+    except OSError as e:
+        # server unreachable: a try for every recipient of the batch
+        for d in pending:
+            d.attempts += 1
+            d.last_error = str(e)[:255] or type(e).__name__
+            if d.attempts >= max_attempts:
+                d.status = "failed"
+            else:
+                deferred += 1
+        db.session.commit()
+        if deferred:
+            raise DeliveryDeferred(f"could not connect to the SMTP server: {e}") from e
+        return
+    for d in pending:
+        throttle.wait()
+        d.attempts += 1
+        try:
+            (_smtp or _connection()).send_message(_message(ann, d.email))
+        except OSError as e:
+            if isinstance(e, smtplib.SMTPServerDisconnected) or not isinstance(e, smtplib.SMTPException):
+                _smtp = None        # connection lost: reconnect for the next recipient
+            d.last_error = str(e)[:255]
+            if _permanent(e) or d.attempts >= max_attempts:
+                d.status = "failed"
+            else:
+                deferred += 1
+        else:
+            d.status = "sent"
+            d.sent_at = datetime.now()
+            d.last_error = None
+        db.session.commit()     # record each recipient as soon as it is known
+    if deferred:
+        raise DeliveryDeferred(f"{deferred} recipient(s) deferred after a temporary SMTP error")
+
+
+def delivery_counts(announcement_id: int) -> dict:
+    rows = db.session.execute(
+        select(AnnouncementDelivery.status, func.count())
+        .where(AnnouncementDelivery.announcement_id == announcement_id)
+        .group_by(AnnouncementDelivery.status)
+    ).all()
+    return {status: count for status, count in rows}
+
+
+# ---------- Triggers ----------
+
+def _after_flush(session, flush_context):
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Announcement) or not _sendable(obj):
+            continue
+        attrs = inspect(obj).attrs
+        if obj in session.new or any(attrs[a].history.has_changes() for a in _TRIGGER_ATTRS):
+            session.info.setdefault(_PENDING, {})[obj.id] = obj.publish_at
+
+
+def _after_flush_postexec(session, flush_context):
+    # queued here (not in after_flush) so the jobs are flushed with the same commit
+    now = datetime.now()
+    for ann_id, publish_at in session.info.pop(_PENDING, {}).items():
+        run_at = publish_at if publish_at and publish_at > now else None
+        enqueue("send-announcement", announcement_id=ann_id, run_at=run_at, priority=1)
+
+
+def _discard_pending(session, *args):
+    session.info.pop(_PENDING, None)
+
+
+# ---------- Wiring ----------
+
+def register_mailer(app):
+    for name, fn in (
+        ("after_flush", _after_flush),
+        ("after_flush_postexec", _after_flush_postexec),
+        ("after_soft_rollback", _discard_pending),
+    ):
+        if not event.contains(Session, name, fn):
+            event.listen(Session, name, fn)
@@ -0,0 +1,42 @@
+# app/memberships.py
+"""
+Member <-> club membership writes.
+
+`set_member_clubs()` replaces a member's clubs by set difference: only removed
+club ids are deleted and only new ones inserted (one multi-row INSERT), so
+untouched rows keep their original `joined_date` and `member_clubs` sees the
+smallest possible write.
+"""
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select
+
+from models import member_clubs
+from sortkeys import refresh_primary_club
+
+
+def set_member_clubs(conn, member_id: int, club_ids) -> tuple:
+    """Make `club_ids` the member's clubs; returns (added, removed) id sets."""
+    table = member_clubs
+    wanted = {int(c) for c in club_ids}
+    current = set(conn.execute(
+        select(table.c.club_id).where(table.c.member_id == member_id)
+    ).scalars())
+
+    added, removed = wanted - current, current - wanted
+    if removed:
+        conn.execute(
+            delete(table).where(table.c.member_id == member_id, table.c.club_id.in_(removed))
+        )
+    if added:
+        now = datetime.now()
+        conn.execute(
+            insert(table).values([
+                {"member_id": member_id, "club_id": club_id, "joined_date": now}
+                for club_id in sorted(added)
+            ])
+        )
+    if added or removed:
+        # Core write: the sortkeys flush listener does not see it
+        refresh_primary_club(conn, member_ids=[member_id])
+    return added, removed
@@ -83,6 +83,10 @@ EVENT_STATUS_VALUES = ("upcoming", "completed", "cancelled")
 
 class Event(db.Model):
     __tablename__ = "events"
+    __table_args__ = (
+        # past "upcoming" events (sweeper.py)
+        db.Index("ix_events_status_start", "is_deleted", "status", "start_at"),
+    )
 
     event_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
 
@@ -189,6 +193,9 @@ class Member(db.Model):
     is_deleted = db.Column(db.Boolean, default=False, nullable=False, index=True)
     deleted_at = db.Column(db.DateTime(timezone=True), nullable=True)
 
+    # Alphabetically first non-deleted club name; maintained by sortkeys.py for "sort by club"
+    primary_club_name = db.Column(db.String(100), nullable=True, index=True)
+
     # Relationships
     clubs   = db.relationship("Club", secondary="member_clubs", back_populates="members")
     college = db.relationship("College", backref="members")
@@ -197,6 +204,10 @@ class Member(db.Model):
 
 class Announcement(db.Model):
     __tablename__ = "announcements"
+    __table_args__ = (
+        # live / scheduled / expired lookups (publishing.py)
+        db.Index("ix_announcements_active", "is_deleted", "status", "publish_at", "expire_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     club_id = db.Column(db.Integer, db.ForeignKey("clubs.club_id"), nullable=True)
@@ -210,7 +221,7 @@ class Announcement(db.Model):
     priority = db.Column(db.String(20), default="normal")  # normal | high | urgent
     audience = db.Column(db.String(50), default="all_members")
 
-    status = db.Column(db.String(20), default="draft")     # draft | published
+    status = db.Column(db.String(20), default="draft")     # draft | published | expired
 
     send_email = db.Column(db.Boolean, default=False)
     pinned     = db.Column(db.Boolean, default=False)
@@ -223,3 +234,88 @@ class Announcement(db.Model):
     club = db.relationship("Club", backref="announcements", lazy=True)
 
 
+
+
+# --------------------------
+# Dashboard counters (single row, id=1) — maintained by stats.py
+# --------------------------
+class EntityStats(db.Model):
+    __tablename__ = "entity_stats"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    active_clubs          = db.Column(db.Integer, default=0, nullable=False)
+    active_colleges       = db.Column(db.Integer, default=0, nullable=False)
+    inactive_colleges     = db.Column(db.Integer, default=0, nullable=False)
+    active_coordinators   = db.Column(db.Integer, default=0, nullable=False)
+    student_coordinators  = db.Column(db.Integer, default=0, nullable=False)
+    faculty_coordinators  = db.Column(db.Integer, default=0, nullable=False)  # faculty|lead|co-lead|mentor
+    total_members         = db.Column(db.Integer, default=0, nullable=False)
+    active_members        = db.Column(db.Integer, default=0, nullable=False)
+    upcoming_events       = db.Column(db.Integer, default=0, nullable=False)
+    completed_events      = db.Column(db.Integer, default=0, nullable=False)
+
+    reconciled_at = db.Column(db.DateTime, default=datetime.now, nullable=False)
+
+    @property
+    def inactive_members(self) -> int:
+        return self.total_members - self.active_members
+
+
+# --------------------------
+# Cache generations (one row per cached reference list) — bumped by refdata.py
+# --------------------------
+class CacheGeneration(db.Model):
+    __tablename__ = "cache_generations"
+
+    name = db.Column(db.String(50), primary_key=True)   # e.g. "clubs", "colleges"
+    generation = db.Column(db.Integer, default=0, nullable=False)
+
+
+# --------------------------
+# Background jobs (queue table) — claimed and run by jobs.py workers
+# --------------------------
+class Job(db.Model):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        db.Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    task = db.Column(db.String(100), nullable=False)               # registered name, e.g. "generate-thumbnails"
+    payload = db.Column(db.Text, nullable=False, default="{}")     # JSON keyword arguments
+    priority = db.Column(db.Integer, default=0, nullable=False)    # higher runs first
+
+    status = db.Column(db.String(20), default="queued", nullable=False)  # queued | running | done | failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, default=3, nullable=False)
+
+    run_at = db.Column(db.DateTime, default=datetime.now, nullable=False)   # not claimed before this
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_until = db.Column(db.DateTime, nullable=True)   # visibility timeout of a running job
+    last_error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.now, nullable=False)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<Job {self.id} {self.task!r} status={self.status!r} attempts={self.attempts}>"
+
+
+# --------------------------
+# Announcement e-mail deliveries (one row per recipient) — written by mailer.py
+# --------------------------
+class AnnouncementDelivery(db.Model):
+    __tablename__ = "announcement_deliveries"
+    __table_args__ = (
+        db.UniqueConstraint("announcement_id", "email", name="uq_delivery_announcement_email"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    announcement_id = db.Column(db.Integer, db.ForeignKey("announcements.id"), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
+
+    status = db.Column(db.String(20), default="queued", nullable=False)  # queued | sent | failed | cancelled
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    last_error = db.Column(db.String(255), nullable=True)
+    sent_at = db.Column(db.DateTime, nullable=True)
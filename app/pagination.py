@@ -0,0 +1,267 @@
+# app/pagination.py
+import base64
+import json
+import threading
+import time
+from datetime import date, datetime
+from math import ceil
+
+from sqlalchemy import and_, func, inspect as sa_inspect, literal, or_
+from sqlalchemy.engine import Row
+
+
+class InvalidCursor(ValueError):
+    """Raised when a ?cursor= token cannot be decoded for the current sort."""
+
+
+# exact     -> SELECT COUNT(*) over the filtered set
+# none      -> no count; has_more comes from fetching per_page + 1 rows
+# estimated -> the planner's row estimate (MySQL/PostgreSQL EXPLAIN); exact elsewhere
+# cached    -> exact count, reused for COUNT_CACHE_TTL seconds per filter set
+COUNT_MODES = ("exact", "none", "estimated", "cached")
+
+
+# ---------- Sort keys ----------
+# A sort key list looks like [(Member.created_time, "desc"), (Member.member_id, "desc")].
+# The last key must be unique (usually the primary key) so the order is stable.
+# Nullable keys (Announcement.pinned, College.created_time) are sorted and compared
+# as COALESCE(col, <lowest value>): a NULL in a seek comparison is never true, so
+# rows with a NULL key would otherwise drop out of keyset pages.
+
+_NULL_FILL = {
+    bool: False,
+    int: -2 ** 63,
+    str: "",
+    datetime: datetime(1000, 1, 1),
+    date: date(1000, 1, 1),
+}
+
+
+def _python_type(col):
+    try:
+        return col.type.python_type
+    except (AttributeError, NotImplementedError):
+        return None
+
+
+def _null_fill(col):
+    """Value a NULL in nullable sort key `col` sorts as (None for NOT NULL keys)."""
+    if not getattr(col.expression, "nullable", False):
+        return None
+    return _NULL_FILL.get(_python_type(col))
+
+
+def _sort_expr(col):
+    fill = _null_fill(col)
+    return col if fill is None else func.coalesce(col, fill)
+
+
+def sort_clauses(keys) -> list:
+    """Turn [(column, "asc"|"desc"), ...] into ORDER BY clauses."""
+    return [_sort_expr(col).asc() if direction == "asc" else _sort_expr(col).desc() for col, direction in keys]
+
+
+def row_key(row, keys) -> list:
+    """Read the sort-key values of a result row (entity or (entity, extra, ...) row)."""
+    values = []
+    for col, _ in keys:
+        owner = col.class_
+        entity = row
+        if isinstance(row, Row):
+            entity = next((x for x in row if isinstance(x, owner)), row[0])
+        values.append(getattr(entity, col.key))
+    return values
+
+
+# ---------- Cursor tokens ----------
+
+def encode_cursor(values) -> str:
+    """Opaque, URL-safe token holding the sort-key values of the last row on a page."""
+    plain = [v.isoformat() if isinstance(v, (datetime, date)) else v for v in values]
+    raw = json.dumps(plain, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+# JSON value types accepted for a sort key of each Python type
+_JSON_TYPES = {bool: bool, int: int, float: (int, float), str: str}
+
+
+def decode_cursor(token: str, keys) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor("cursor is malformed.")
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise InvalidCursor("cursor does not match the requested sort.")
+
+    out = []
+    for (col, _), v in zip(keys, values):
+        kind = _python_type(col)
+        if v is None:
+            if not getattr(col.expression, "nullable", False):
+                raise InvalidCursor("cursor is malformed.")
+        elif kind in (datetime, date):
+            try:
+                v = datetime.fromisoformat(v)
+            except (TypeError, ValueError):
+                raise InvalidCursor("cursor is malformed.")
+        elif kind in _JSON_TYPES and (
+            not isinstance(v, _JSON_TYPES[kind]) or (isinstance(v, bool) and kind is not bool)
+        ):
+            # (bool is an int to isinstance(); only JSON true/false fits a boolean key)
+            raise InvalidCursor("cursor is malformed.")
+        out.append(v)
+    return out
+
+
+def seek_filter(keys, values):
+    """
+    WHERE clause selecting rows strictly after `values` in `keys` order:
+    (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...  (">" becomes "<" for desc keys).
+    """
+    exprs = [_sort_expr(col) for col, _ in keys]
+    # typed binds: SQLAlchemy refuses "<" / ">" against a bare True/False
+    values = [literal(_null_fill(col) if v is None else v, col.type) for (col, _), v in zip(keys, values)]
+    branches = []
+    for i, (_, direction) in enumerate(keys):
+        after = exprs[i] > values[i] if direction == "asc" else exprs[i] < values[i]
+        equal = [exprs[j] == values[j] for j in range(i)]
+        branches.append(and_(*equal, after))
+    return or_(*branches)
+
+
+# ---------- Total-count strategies ----------
+
+class _CountCache:
+    """Small in-process TTL cache for COUNT(*) results, keyed by normalized filter set."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit and hit[0] > time.monotonic():
+                return hit[1]
+            self._data.pop(key, None)
+            return None
+
+    def set(self, key, value, ttl: float):
+        with self._lock:
+            if len(self._data) >= self.max_entries:
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = (time.monotonic() + ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+count_cache = _CountCache()
+
+
+def estimate_count(query) -> int | None:
+    """Planner row estimate for `query`, or None when the dialect has no cheap estimate."""
+    session = query.session
+    conn = session.connection()
+    dialect = conn.dialect.name
+    if dialect not in ("mysql", "mariadb", "postgresql"):
+        return None
+
+    compiled = query.order_by(None).statement.compile(dialect=conn.dialect)
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+
+    if dialect == "postgresql":
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    row = conn.exec_driver_sql(f"EXPLAIN {compiled}", params).mappings().first()
+    if not row or row.get("rows") is None:
+        return None
+    filtered = row.get("filtered")
+    return int(row["rows"] * (float(filtered) / 100 if filtered is not None else 1))
+
+
+def exact_count(query) -> int:
+    """COUNT(*) over the query's rows, selecting only the primary key (no Text columns, no ORDER BY)."""
+    entity = query.column_descriptions[0]["entity"]
+    if entity is None:
+        return query.count()
+    return query.order_by(None).with_entities(*sa_inspect(entity).primary_key).count()
+
+
+def count_rows(query, mode: str, cache_key=None, cache_ttl: float = 30):
+    """Return (total, mode_used). total is None for mode "none"."""
+    if mode == "none":
+        return None, "none"
+    if mode == "estimated":
+        total = estimate_count(query)
+        if total is not None:
+            return total, "estimated"
+        return exact_count(query), "exact"
+    if mode == "cached" and cache_key is not None:
+        total = count_cache.get(cache_key)
+        if total is None:
+            total = exact_count(query)
+            count_cache.set(cache_key, total, cache_ttl)
+        return total, "cached"
+    return exact_count(query), "exact"
+
+
+# ---------- Paginators ----------
+
+def page_args(args, per_default: int = 20, per_max: int = 100):
+    """(page, per_page) from ?page=&per_page=, clamped to sane bounds."""
+    per_page = min(per_max, args.get("per_page", per_default, type=int) or per_default)
+    page = max(1, args.get("page", 1, type=int) or 1)
+    return page, max(1, per_page)
+
+
+def offset_page(query, page: int, per_page: int, count: str = "exact", cache_key=None, cache_ttl: float = 30):
+    """LIMIT/OFFSET page; the total comes from the chosen count strategy."""
+    total, count_used = count_rows(query, count, cache_key, cache_ttl)
+    if count_used == "exact":
+        rows = query.limit(per_page).offset((page - 1) * per_page).all()
+        has_more = None
+    else:
+        rows = query.limit(per_page + 1).offset((page - 1) * per_page).all()
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+
+    meta = {"page": page, "per_page": per_page, "count": count_used}
+    if total is not None:
+        meta["total"] = total
+        meta["pages"] = ceil(total / per_page) if per_page else 1
+    if has_more is not None:
+        meta["has_more"] = has_more
+    return rows, meta
+
+
+def keyset_page(query, keys, cursor: str | None, per_page: int, count: str = "none", cache_key=None, cache_ttl: float = 30):
+    """
+    Seek page: rows after `cursor` in `keys` order. The query must already be
+    ordered by sort_clauses(keys). No OFFSET, so page N costs the same as page 1;
+    a total is only computed when a count strategy other than "none" is asked for.
+    """
+    total, count_used = count_rows(query, count, cache_key, cache_ttl)
+    if cursor:
+        query = query.filter(seek_filter(keys, decode_cursor(cursor, keys)))
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    meta = {
+        "per_page": per_page,
+        "count": count_used,
+        "has_more": has_more,
+        "next_cursor": encode_cursor(row_key(rows[-1], keys)) if has_more and rows else None,
+    }
+    if total is not None:
+        meta["total"] = total
+    return rows, meta
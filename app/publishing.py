@@ -0,0 +1,254 @@
+# app/publishing.py
+"""
+Publish / expire lifecycle of announcements.
+
+An announcement is live while it is published, its publish_at has passed and its
+expire_at has not. `STATE_FILTERS` holds the WHERE clauses for the live,
+scheduled and expired states; they use ix_announcements_active
+(is_deleted, status, publish_at, expire_at).
+
+The stored status follows expire_at:
+- On every flush, a published announcement whose expire_at has passed is saved
+  as `expired`. An expired one whose expire_at was moved into the future goes
+  back to `published`.
+- Each process keeps a heap of upcoming expire_at boundaries. A timer thread
+  sleeps until the earliest one, then flips that row with one conditional
+  UPDATE (a no-op if another process got there first or the row changed since).
+  The table is never polled.
+
+`active_announcements()`, the live list for readers, is cached per process
+until the next publish or expire boundary, or until announcements or clubs are
+written (table generations, see etags.py), whichever comes first.
+"""
+import heapq
+import logging
+import os
+import threading
+from datetime import datetime
+
+import click
+from flask import current_app, has_app_context
+from sqlalchemy import and_, event, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from etags import table_generations
+from jobs import task
+from models import db, Announcement, Club
+from serializers import serialize
+
+log = logging.getLogger(__name__)
+
+ACTIVE_INDEX = "ix_announcements_active"
+CACHE_TABLES = ("announcements", "clubs")
+_MAX_SLEEP = 3600       # re-check the clock at least hourly (wall-clock jumps)
+
+
+# ---------- States ----------
+
+def _published():
+    return and_(Announcement.is_deleted.is_(False), Announcement.status == "published")
+
+
+def active_filter(now: datetime):
+    return and_(
+        _published(),
+        or_(Announcement.publish_at.is_(None), Announcement.publish_at <= now),
+        or_(Announcement.expire_at.is_(None), Announcement.expire_at > now),
+    )
+
+
+def scheduled_filter(now: datetime):
+    return and_(_published(), Announcement.publish_at > now)
+
+
+def expired_filter(now: datetime):
+    return and_(
+        Announcement.is_deleted.is_(False),
+        or_(Announcement.status == "expired", and_(Announcement.status == "published", Announcement.expire_at <= now)),
+    )
+
+
+# ?status= values handled as time-relative states rather than a stored status
+STATE_FILTERS = {"active": active_filter, "scheduled": scheduled_filter, "expired": expired_filter}
+
+
+def expire_due(ann_id: int | None = None) -> int:
+    """Flip published announcements past expire_at to `expired`; returns the count flipped."""
+    stmt = (
+        update(Announcement)
+        .where(_published(), Announcement.expire_at <= datetime.now())
+        # a system change: keep updated_at (and so the "newest" order) as it was
+        .values(status="expired", updated_at=Announcement.updated_at)
+    )
+    if ann_id is not None:
+        stmt = stmt.where(Announcement.id == ann_id)
+    with db.engine.begin() as conn:
+        return conn.execute(stmt).rowcount
+
+
+@task("expire-announcements")
+def _expire_announcements():
+    expire_due()
+
+
+# ---------- Boundary scheduler ----------
+
+class _Scheduler:
+    """Min-heap of (expire_at, announcement id); one daemon thread per process sleeps until the head."""
+
+    def __init__(self):
+        self.heap = []
+        self.queued = set()
+        self.cv = threading.Condition()
+        self.pid = None     # process that owns the thread (a forked child must start its own)
+
+    def add(self, app, ann_id: int, when: datetime) -> None:
+        key = (when, ann_id)
+        with self.cv:
+            self._start(app)
+            if key in self.queued:
+                return
+            self.queued.add(key)
+            heapq.heappush(self.heap, key)
+            if self.heap[0] == key:
+                self.cv.notify()
+
+    def start(self, app) -> None:
+        """Start this process's timer thread (once); it loads every pending expiry first."""
+        with self.cv:
+            self._start(app)
+
+    def _start(self, app) -> None:
+        if self.pid == os.getpid():
+            return
+        self.pid = os.getpid()
+        self.heap, self.queued = [], set()
+        threading.Thread(target=self._run, args=(app,), name="announcement-expiry", daemon=True).start()
+
+    def _load(self, app) -> None:
+        with app.app_context():
+            rows = db.session.execute(
+                select(Announcement.expire_at, Announcement.id)
+                .where(_published(), Announcement.expire_at.isnot(None))
+            ).all()
+            db.session.remove()
+        with self.cv:
+            for key in rows:
+                if tuple(key) not in self.queued:
+                    self.queued.add(tuple(key))
+                    heapq.heappush(self.heap, tuple(key))
+
+    def _next_due(self):
+        with self.cv:
+            while True:
+                if not self.heap:
+                    self.cv.wait()
+                    continue
+                when, ann_id = self.heap[0]
+                delay = (when - datetime.now()).total_seconds()
+                if delay <= 0:
+                    heapq.heappop(self.heap)
+                    self.queued.discard((when, ann_id))
+                    return ann_id
+                self.cv.wait(min(delay, _MAX_SLEEP))
+
+    def _run(self, app) -> None:
+        try:
+            self._load(app)
+        except Exception:
+            log.exception("Could not load announcement expiry times")
+        while True:
+            ann_id = self._next_due()
+            try:
+                with app.app_context():
+                    expire_due(ann_id)
+            except Exception:
+                log.exception("Could not expire announcement %s", ann_id)
+
+
+scheduler = _Scheduler()
+
+
+def _watch(ann) -> None:
+    if ann.expire_at and ann.status == "published" and not ann.is_deleted and has_app_context():
+        scheduler.add(current_app._get_current_object(), ann.id, ann.expire_at)
+
+
+# ---------- Live list cache ----------
+
+_cache = None       # (table generations, valid until, rows)
+_cache_lock = threading.Lock()
+
+
+def _next_boundary(now: datetime, rows) -> datetime | None:
+    next_publish = db.session.scalar(select(func.min(Announcement.publish_at)).where(scheduled_filter(now)))
+    times = [a.expire_at for a, _ in rows if a.expire_at] + ([next_publish] if next_publish else [])
+    return min(times, default=None)
+
+
+def active_announcements() -> list:
+    """Live announcements (no club, or a non-deleted one), pinned first then newest, serialized."""
+    global _cache
+    gens = table_generations(*CACHE_TABLES)
+    now = datetime.now()
+    with _cache_lock:
+        hit = _cache
+    if hit and hit[0] == gens and (hit[1] is None or now < hit[1]):
+        return hit[2]
+
+    rows = db.session.execute(
+        select(Announcement, Club.club_name)
+        .outerjoin(Club, Announcement.club_id == Club.club_id)
+        .where(active_filter(now), or_(Announcement.club_id.is_(None), Club.is_deleted.is_(False)))
+        .order_by(Announcement.pinned.desc(), Announcement.publish_at.desc(), Announcement.id.desc())
+    ).all()
+    data = [serialize(a, club_name=club_name) for a, club_name in rows]
+    with _cache_lock:
+        _cache = (gens, _next_boundary(now, rows), data)
+    for a, _ in rows:
+        _watch(a)       # also picks up expiries written by other processes
+    return data
+
+
+# ---------- Flush hooks ----------
+
+def _before_flush(session, flush_context, instances):
+    now = datetime.now()
+    for obj in session.new | session.dirty:
+        if not isinstance(obj, Announcement):
+            continue
+        past = obj.expire_at is not None and obj.expire_at <= now
+        if obj.status == "published" and past:
+            obj.status = "expired"
+        elif obj.status == "expired" and not past:
+            obj.status = "published"
+
+
+def _after_flush(session, flush_context):
+    for obj in session.new | session.dirty:
+        if isinstance(obj, Announcement):
+            _watch(obj)
+
+
+def ensure_publishing_schema() -> None:
+    """Create ix_announcements_active on databases created before it existed."""
+    index = next(i for i in Announcement.__table__.indexes if i.name == ACTIVE_INDEX)
+    index.create(db.engine, checkfirst=True)
+
+
+# ---------- Wiring ----------
+
+def register_publishing(app):
+    for name, fn in (("before_flush", _before_flush), ("after_flush", _after_flush)):
+        if not event.contains(Session, name, fn):
+            event.listen(Session, name, fn)
+
+    @app.before_request
+    def _start_scheduler():
+        if scheduler.pid != os.getpid():
+            scheduler.start(app)
+
+    @app.cli.command("expire-announcements")
+    def expire_announcements_command():
+        """Mark published announcements past their expire_at as expired."""
+        click.echo(f"{expire_due()} announcement(s) expired.")
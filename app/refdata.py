@@ -0,0 +1,155 @@
+# app/refdata.py
+"""
+Process-local cache for the club/college dropdown lists.
+
+Each list is tagged with a generation number stored in `cache_generations`. Any
+flush that creates, renames or (soft-)deletes a Club/College bumps the generation
+in the same transaction, so every worker process sees the change on its next
+read: one primary-key lookup of the generations instead of re-querying every
+club and college by name.
+
+`bump()` only notes the names on the connection; the counters are written when
+that transaction commits, in name order. A writer therefore holds a counter's
+row lock for the commit only, not for its whole transaction, and two writers
+never take the same counters in opposite orders.
+"""
+import threading
+from collections import namedtuple
+
+from flask import g, has_app_context
+from sqlalchemy import event, insert, inspect, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from models import db, Club, College, CacheGeneration
+
+ClubOption = namedtuple("ClubOption", "club_id club_name")
+CollegeOption = namedtuple("CollegeOption", "college_id college_name")
+
+# cache name -> (model, attributes whose change invalidates the list)
+WATCHED = {
+    "clubs": (Club, ("club_name", "is_deleted")),
+    "colleges": (College, ("college_name", "is_deleted")),
+}
+
+_local = {}          # name -> (generation, rows)
+_lock = threading.Lock()
+_PENDING = "pending_generation_bumps"   # key in Connection.info: names to bump at commit
+
+
+# ---------- Generations ----------
+
+def _generations() -> dict:
+    """Current generation per list (memoized for the rest of the request)."""
+    if has_app_context() and "refdata_generations" in g:
+        return g.refdata_generations
+    rows = db.session.execute(
+        select(CacheGeneration.name, CacheGeneration.generation)
+        .where(CacheGeneration.name.in_(WATCHED))
+    ).all()
+    gens = {name: gen for name, gen in rows}
+    if has_app_context():
+        g.refdata_generations = gens
+    return gens
+
+
+def table_key(table: str) -> str:
+    """Name of `table`'s write generation (see etags.py)."""
+    return "table:" + table
+
+
+def bump(conn, *names):
+    """Advance the generation of each name in `names` when `conn`'s transaction commits."""
+    conn.info.setdefault(_PENDING, set()).update(names)
+
+
+def _forget(names):
+    if not names:
+        return
+    with _lock:
+        for name in names:
+            _local.pop(name, None)
+    if has_app_context():
+        g.pop("refdata_generations", None)
+
+
+def _apply(conn):
+    names = conn.info.pop(_PENDING, None)
+    if not names:
+        return
+    table = CacheGeneration.__table__
+    for name in sorted(names):
+        res = conn.execute(
+            update(table).where(table.c.name == name).values(generation=table.c.generation + 1)
+        )
+        if res.rowcount == 0:
+            conn.execute(insert(table).values(name=name, generation=1))
+    _forget(names)
+
+
+def _discard(conn):
+    # a list read after the flush may have cached rows that are now rolled back
+    _forget(conn.info.pop(_PENDING, ()))
+
+
+def _touched(session) -> set:
+    names = set()
+    for name, (model, attrs) in WATCHED.items():
+        for obj in session.new | session.deleted:
+            if isinstance(obj, model):
+                names.add(name)
+        for obj in session.dirty:
+            if isinstance(obj, model):
+                state = inspect(obj)
+                if any(state.attrs[a].history.has_changes() for a in attrs):
+                    names.add(name)
+    return names
+
+
+def _after_flush(session, flush_context):
+    names = _touched(session)
+    if names:
+        bump(session.connection(), *sorted(names))
+
+
+# ---------- Lists ----------
+
+def _cached(name, load):
+    gen = _generations().get(name, 0)
+    with _lock:
+        hit = _local.get(name)
+    if hit and hit[0] == gen:
+        return hit[1]
+    rows = load()
+    with _lock:
+        _local[name] = (gen, rows)
+    return rows
+
+
+def club_options() -> list:
+    """Non-deleted clubs ordered by name, as (club_id, club_name)."""
+    return _cached("clubs", lambda: [
+        ClubOption(*r) for r in db.session.execute(
+            select(Club.club_id, Club.club_name)
+            .where(Club.is_deleted.is_(False))
+            .order_by(Club.club_name.asc())
+        )
+    ])
+
+
+def college_options() -> list:
+    """Non-deleted colleges ordered by name, as (college_id, college_name)."""
+    return _cached("colleges", lambda: [
+        CollegeOption(*r) for r in db.session.execute(
+            select(College.college_id, College.college_name)
+            .where(College.is_deleted.is_(False))
+            .order_by(College.college_name.asc())
+        )
+    ])
+
+
+def register_refdata(app):
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Engine, "commit", _apply)
+        event.listen(Engine, "rollback", _discard)
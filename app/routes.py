@@ -1,18 +1,25 @@
 # routes.py
-import os
 from datetime import datetime
 from operator import or_
-from uuid import uuid4
 
 from flask import render_template, request, redirect, url_for, flash, current_app
-from werkzeug.utils import secure_filename
 from models import db, Club, Event ,Coordinator,College,Announcement,Member, member_clubs
-from utils import time_ago,parse_dt,card_datetime,table_date,relpath_from_static,clean_phone,clean_role,ALLOWED_ROLES
-from sqlalchemy import func, case
+from utils import time_ago,parse_dt,card_datetime,table_date,clean_phone,clean_role,ALLOWED_ROLES,page_url
+from sqlalchemy import func, case, select
+from sqlalchemy.orm import lazyload, selectinload
+from stats import get_stats
+from refdata import club_options, college_options
+from search import get_backend as search_backend
+from pagination import page_args, offset_page
+from memberships import set_member_clubs
+from storage import save_image
+from publishing import STATE_FILTERS
 
 
 
 def register_routes(app):
+    app.add_template_global(page_url)
+
     # ---------- Dashboard ----------
     @app.route("/", methods=["GET"])
     def index():
@@ -31,42 +38,8 @@ def register_routes(app):
             for ch in clubs
         ]
 
-        # ✅ Counts for dashboard cards (only active + not deleted)
-        active_clubs = (
-            db.session.query(func.count(Club.club_id))
-            .filter(Club.status == "active", Club.is_deleted.is_(False))
-            .scalar()
-        )
-
-        active_colleges = (
-            db.session.query(func.count(College.college_id))
-            .filter(College.status == "active", College.is_deleted.is_(False))
-            .scalar()
-        )
-
-        active_coordinators = (
-            db.session.query(func.count(Coordinator.coordinator_id))
-            .filter(Coordinator.status == "active", Coordinator.is_deleted.is_(False))
-            .scalar()
-        )
-
-        active_members = (
-            db.session.query(func.count(Member.member_id))
-            .filter(Member.status == "active", Member.is_deleted.is_(False))
-            .scalar()
-        )
-
-        total_members = (
-            db.session.query(func.count(Member.member_id))
-            .filter(Member.is_deleted.is_(False))
-            .scalar()
-        )
-
-        upcoming_events_count = (
-            db.session.query(func.count(Event.event_id))
-            .filter(Event.status == "upcoming", Event.is_deleted.is_(False))
-            .scalar()
-        )
+        # ✅ Counts for dashboard cards (only active + not deleted), from the stats row
+        stats = get_stats()
 
         # ✅ Fetch *nearest* upcoming (not deleted) events
         now_local = datetime.now()
@@ -107,22 +80,17 @@ def register_routes(app):
         ]
 
         # ✅ Clubs dropdown in Event modal (non-deleted)
-        clubs = (
-            Club.query
-            .filter(Club.is_deleted.is_(False))
-            .order_by(Club.club_name.asc())
-            .all()
-        )
+        clubs = club_options()
 
         return render_template(
             "index.html",
             recent_clubs=recent_clubs,
-            active_clubs=active_clubs,
-            active_colleges=active_colleges,
-            active_coordinators=active_coordinators,
-            active_members=active_members,
-            total_members=total_members,
-            upcoming_events_count=upcoming_events_count,
+            active_clubs=stats.active_clubs,
+            active_colleges=stats.active_colleges,
+            active_coordinators=stats.active_coordinators,
+            active_members=stats.active_members,
+            total_members=stats.total_members,
+            upcoming_events_count=stats.upcoming_events,
             upcoming_events=upcoming_events_vm,
             recent_events=recent_events_vm,
             clubs=clubs,
@@ -131,24 +99,54 @@ def register_routes(app):
     # ---------- clubs ----------
     @app.route("/clubs")
     def clubs():
-        """Display all active (non-deleted) clubs with coordinator and member info."""
+        """Display one page of active (non-deleted) clubs with coordinator and member info."""
+        q = request.args.get('q', '').strip()
+        status_filter = request.args.get('status', 'all')
+        sort_by = request.args.get('sort', 'none')
+        page, per_page = page_args(request.args)
+
+        # ✅ Member count and first coordinator per club as correlated subqueries,
+        #    so the page costs the same number of statements however many clubs exist
+        member_count_sq = (
+            select(func.count(member_clubs.c.member_id))
+            .select_from(member_clubs.join(Member, Member.member_id == member_clubs.c.member_id))
+            .where(member_clubs.c.club_id == Club.club_id, Member.is_deleted.is_(False))
+            .correlate(Club)
+            .scalar_subquery()
+        )
+        coordinator_sq = (
+            select(Coordinator.coordinator_name)
+            .where(Coordinator.club_id == Club.club_id, Coordinator.is_deleted.is_(False))
+            .order_by(Coordinator.coordinator_id.asc())
+            .limit(1)
+            .correlate(Club)
+            .scalar_subquery()
+        )
 
-        # ✅ Fetch only non-deleted clubs
-        clubs = (
-            Club.query
+        # ✅ Fetch only non-deleted clubs (skip the selectin load of Club.members)
+        query = (
+            db.session.query(Club, member_count_sq.label("members_count"), coordinator_sq.label("coordinator_name"))
+            .options(lazyload(Club.members))
             .filter(Club.is_deleted.is_(False))  # ⬅️ ignore soft-deleted records
-            .order_by(Club.created_time.desc())
-            .all()
         )
+        if q:
+            query = query.filter(Club.club_name.ilike(f'%{q}%'))
+        if status_filter in ('active', 'inactive'):
+            query = query.filter(Club.status == status_filter)
+
+        if sort_by == 'name':
+            query = query.order_by(Club.club_name.asc(), Club.club_id.asc())
+        elif sort_by == 'coordinator':
+            query = query.order_by(coordinator_sq.asc(), Club.club_id.asc())
+        elif sort_by == 'oldest':
+            query = query.order_by(Club.created_time.asc(), Club.club_id.asc())
+        else:
+            query = query.order_by(Club.created_time.desc(), Club.club_id.desc())
 
-        clubs_vm = []
-        for club in clubs:
-            # ✅ Coordinator name (if any)
-            coordinator_name = club.coordinators[0].coordinator_name if club.coordinators else "—"
-
-            # ✅ Member count (relationship preloaded if using selectinload)
-            member_count = len(club.members)
+        rows, meta = offset_page(query, page, per_page)
 
+        clubs_vm = []
+        for club, member_count, coordinator_name in rows:
             clubs_vm.append({
                 "club_id": club.club_id,
                 "club_name": club.club_name,
@@ -157,11 +155,18 @@ def register_routes(app):
                 "description": club.description,
                 "status": club.status,
                 "created_time": club.created_time,
-                "members": member_count,
-                "coordinator": coordinator_name,
+                "members": member_count or 0,
+                "coordinator": coordinator_name or "—",
             })
 
-        return render_template("clubs.html", clubs=clubs_vm)
+        return render_template(
+            "clubs.html",
+            clubs=clubs_vm,
+            meta=meta,
+            q=q,
+            status=status_filter,
+            sort=sort_by,
+        )
 
     #create clubs
     @app.route("/clubs/create", methods=["POST"])
@@ -202,13 +207,7 @@ def register_routes(app):
                 flash("Invalid logo format. Allowed: png, jpg, jpeg, gif, webp.", "error")
                 return back_to_modal()
 
-            safe_name = secure_filename(file.filename)
-            save_dir = current_app.config["CLUB_UPLOAD_FOLDER"]  # e.g., <project>/static/uploads/clubs
-            os.makedirs(save_dir, exist_ok=True)
-            save_path = os.path.join(save_dir, safe_name)
-            file.save(save_path)
-
-            logo_rel_path = relpath_from_static(save_path)
+            logo_rel_path = save_image(file)
 
         try:
             club = Club(
@@ -249,49 +248,55 @@ def register_routes(app):
             .all()
         )
 
-        # ✅ All (non-deleted) events for the table/list
-        all_events = (
-            Event.query
-            .filter(Event.is_deleted.is_(False))
-            .order_by(Event.created_time.desc())
-            .all()
-        )
+        # ✅ One page of (non-deleted) events for the table/list
+        q = request.args.get('q', '').strip()
+        status_filter = request.args.get('status', 'all')
+        club_id = request.args.get('club_id', type=int)
+        sort_by = request.args.get('sort', 'none')
+        page, per_page = page_args(request.args)
 
-        # ✅ Counts should also ignore soft-deleted rows
-        upcoming_count = (
-            db.session.query(Event)
-            .filter(
-                Event.is_deleted.is_(False),
-                Event.status == "upcoming",
+        query = Event.query.filter(Event.is_deleted.is_(False))
+        if q:
+            hits = search_backend().hits("events", q)
+            if hits is not None:
+                query = query.join(hits, hits.c.id == Event.event_id)
+            else:
+                query = query.filter(Event.event_name.ilike(f'%{q}%') | Event.description.ilike(f'%{q}%'))
+        if status_filter in ('upcoming', 'completed', 'cancelled'):
+            query = query.filter(Event.status == status_filter)
+        if club_id:
+            query = query.filter(Event.organising_club_id == club_id)
 
-            )
-            .count()
-        )
+        if sort_by == 'name':
+            query = query.order_by(Event.event_name.asc(), Event.event_id.asc())
+        elif sort_by == 'coordinator':
+            query = query.order_by(Event.event_coordinator.asc(), Event.event_id.asc())
+        elif sort_by == 'newest':
+            query = query.order_by(Event.start_at.desc(), Event.event_id.desc())
+        elif sort_by == 'oldest':
+            query = query.order_by(Event.start_at.asc(), Event.event_id.asc())
+        else:
+            query = query.order_by(Event.created_time.desc(), Event.event_id.desc())
 
-        completed_count = (
-            db.session.query(Event)
-            .filter(
-                Event.is_deleted.is_(False),
-                Event.status == "completed",
-            )
-            .count()
-        )
+        all_events, meta = offset_page(query, page, per_page)
+
+        # ✅ Counts should also ignore soft-deleted rows
+        stats = get_stats()
 
         # ✅ Clubs dropdown should not list deleted clubs
-        clubs = (
-            Club.query
-            .filter(Club.is_deleted.is_(False))
-            .order_by(Club.club_name.asc())
-            .all()
-        )
+        clubs = club_options()
 
         return render_template(
             "events.html",
             clubs=clubs,
             upcoming_events=upcoming_events,
             all_events=all_events,
-            upcoming_count=upcoming_count,
-            completed_count=completed_count,
+            meta=meta,
+            q=q,
+            status=status_filter,
+            sort=sort_by,
+            upcoming_count=stats.upcoming_events,
+            completed_count=stats.completed_events,
             card_datetime=card_datetime,
             table_date=table_date,
         )
@@ -367,12 +372,7 @@ def register_routes(app):
                 flash("Invalid image format. Allowed: png, jpg, jpeg, gif, webp.", "error")
                 return back_to_modal(start_time, end_time)
 
-            safe_name = secure_filename(file.filename)
-            save_dir = current_app.config["EVENT_UPLOAD_FOLDER"]
-            os.makedirs(save_dir, exist_ok=True)
-            save_path = os.path.join(save_dir, safe_name)
-            file.save(save_path)
-            img_rel_path = relpath_from_static(save_path)
+            img_rel_path = save_image(file)
 
         # Insert into DB
         try:
@@ -402,32 +402,49 @@ def register_routes(app):
     # ---------- Colleges ----------
     @app.route("/colleges")
     def colleges():
-        # 1) List only non-deleted colleges (newest first)
-        rows = (
-            College.query
-            .filter(College.is_deleted.is_(False))
-            .order_by(College.created_time.desc(), College.college_id.desc())
-            .all()
-        )
+        q = request.args.get('q', '').strip()
+        status_filter = request.args.get('status', 'all')
+        sort_by = request.args.get('sort', 'none')
+        page, per_page = page_args(request.args)
 
-        # 2) Active member counts per college (exclude soft-deleted members)
-        members_by_college = dict(
-            db.session.query(Member.college_id, func.count(Member.member_id))
-            .filter(
+        # Active member counts per college (exclude soft-deleted members)
+        member_count_sq = (
+            select(func.count(Member.member_id))
+            .where(
+                Member.college_id == College.college_id,
                 Member.status == "active",
                 Member.is_deleted.is_(False),
             )
-            .group_by(Member.college_id)
-            .all()
+            .correlate(College)
+            .scalar_subquery()
         )
 
+        # 1) One page of non-deleted colleges (newest first unless sorted)
+        query = db.session.query(College, member_count_sq.label("members_count")).filter(College.is_deleted.is_(False))
+        if q:
+            query = query.filter(College.college_name.ilike(f'%{q}%'))
+        if status_filter in ('active', 'inactive'):
+            query = query.filter(College.status == status_filter)
+
+        if sort_by == 'name':
+            query = query.order_by(College.college_name.asc(), College.college_id.asc())
+        elif sort_by == 'members':
+            query = query.order_by(member_count_sq.desc(), College.college_id.desc())
+        elif sort_by == 'oldest':
+            query = query.order_by(College.created_time.asc(), College.college_id.asc())
+        else:
+            query = query.order_by(College.created_time.desc(), College.college_id.desc())
+
+        # 2) Only the visible page is loaded
+        rows, meta = offset_page(query, page, per_page)
+
         # 3) Build view model
         colleges_vm = []
-        for col in rows:
+        for col, members_count in rows:
             colleges_vm.append({
                 "college_id": col.college_id,
                 "college_name": col.college_name,
-                "members_count": members_by_college.get(col.college_id, 0),
+                "members_count": members_count or 0,
                 "clubs_count": 0,  # placeholder until wired
                 "email": col.email,
                 "location": col.location,
@@ -440,25 +457,17 @@ def register_routes(app):
             })
 
         # 4) Stats cards (exclude soft-deleted colleges)
-        active_count = (
-            db.session.query(func.count(College.college_id))
-            .filter(College.status == "active", College.is_deleted.is_(False))
-            .scalar()
-        )
-        inactive_count = (
-            db.session.query(func.count(College.college_id))
-            .filter(College.status == "inactive", College.is_deleted.is_(False))
-            .scalar()
-        )
+        stats = get_stats()
 
         return render_template(
             "colleges.html",
             colleges=colleges_vm,
-            active_count=active_count,
-            inactive_count=inactive_count,
-            q="",
-            status="all",
-            sort="none",
+            active_count=stats.active_colleges,
+            inactive_count=stats.inactive_colleges,
+            meta=meta,
+            q=q,
+            status=status_filter,
+            sort=sort_by,
         )
 #create college
     @app.route("/colleges/create", methods=["POST"])
@@ -521,42 +530,19 @@ def register_routes(app):
         """Display active coordinators (non-deleted) along with their clubs and colleges."""
 
         # ✅ Only non-deleted clubs and colleges (for dropdowns / modal)
-        clubs = (
-            Club.query
-            .filter(Club.is_deleted.is_(False))
-            .order_by(Club.club_name.asc())
-            .all()
-        )
-        colleges = (
-            College.query
-            .filter(College.is_deleted.is_(False))
-            .order_by(College.college_name.asc())
-            .all()
-        )
+        clubs = club_options()
+        colleges = college_options()
 
         # ✅ Stat cards: count active & non-deleted coordinators
-        student_count = (
-            db.session.query(Coordinator)
-            .filter(
-                Coordinator.role_type == "student",
-                Coordinator.status == "active",
-                Coordinator.is_deleted.is_(False),
-            )
-            .count()
-        )
+        stats = get_stats()
 
-        faculty_count = (
-            db.session.query(Coordinator)
-            .filter(
-                Coordinator.role_type.in_(["faculty", "lead", "co-lead", "mentor"]),
-                Coordinator.status == "active",
-                Coordinator.is_deleted.is_(False),
-            )
-            .count()
-        )
+        q = request.args.get('q', '').strip()
+        club_id = request.args.get('club_id', type=int)
+        sort_by = request.args.get('sort', 'none')
+        page, per_page = page_args(request.args)
 
         # ✅ Fetch only active + non-deleted coordinators and join with non-deleted clubs/colleges
-        rows = (
+        query = (
             db.session.query(Coordinator, Club, College)
             .join(Club, Coordinator.club_id == Club.club_id)
             .outerjoin(College, Coordinator.college_id == College.college_id)
@@ -566,9 +552,22 @@ def register_routes(app):
                 Club.is_deleted.is_(False),
                 or_(College.is_deleted.is_(False), College.is_deleted.is_(None)),  # handle optional college
             )
-            .order_by(Coordinator.created_time.desc())
-            .all()
         )
+        if q:
+            query = query.filter(Coordinator.coordinator_name.ilike(f'%{q}%'))
+        if club_id:
+            query = query.filter(Coordinator.club_id == club_id)
+
+        if sort_by == 'name':
+            query = query.order_by(Coordinator.coordinator_name.asc(), Coordinator.coordinator_id.asc())
+        elif sort_by == 'club':
+            query = query.order_by(Club.club_name.asc(), Coordinator.coordinator_id.asc())
+        elif sort_by == 'oldest':
+            query = query.order_by(Coordinator.created_time.asc(), Coordinator.coordinator_id.asc())
+        else:
+            query = query.order_by(Coordinator.created_time.desc(), Coordinator.coordinator_id.desc())
+
+        rows, meta = offset_page(query, page, per_page)
 
         # ✅ Shape the result for template
         coordinators = []
@@ -594,8 +593,12 @@ def register_routes(app):
             clubs=clubs,
             colleges=colleges,
             coordinators=coordinators,
-            student_count=student_count,
-            faculty_count=faculty_count,
+            meta=meta,
+            q=q,
+            club_id=str(club_id) if club_id else "all",
+            sort=sort_by,
+            student_count=stats.student_coordinators,
+            faculty_count=stats.faculty_coordinators,
         )
 
     # ---------- create coordinators (updated for soft-delete) ----------
@@ -667,13 +670,7 @@ def register_routes(app):
                 flash("Invalid image format. Allowed: png, jpg, jpeg, gif, webp.", "error")
                 return back_to_modal()
 
-            safe_name = secure_filename(file.filename)
-            save_dir = current_app.config["COORDINATOR_UPLOAD_FOLDER"]
-            os.makedirs(save_dir, exist_ok=True)
-            save_path = os.path.join(save_dir, safe_name)
-            file.save(save_path)
-
-            image_rel_path = os.path.relpath(save_path, current_app.static_folder)
+            image_rel_path = save_image(file)
 
         # --- Insert ---
         try:
@@ -711,14 +708,10 @@ def register_routes(app):
         status_filter = request.args.get('status', 'all')
         club_id = request.args.get('club_id', type=int) if request.args.get('club_id') else None
         sort_by = request.args.get('sort', 'none')
+        page, per_page = page_args(request.args)
 
         # ✅ Only non-deleted clubs in dropdown
-        clubs = (
-            Club.query
-            .filter(Club.is_deleted.is_(False))
-            .order_by(Club.club_name.asc())
-            .all()
-        )
+        clubs = club_options()
 
         # Base query with join for club
         base_query = (
@@ -731,13 +724,21 @@ def register_routes(app):
             )
         )
 
-        # Apply filters
+        # Apply filters (full-text index when the query has searchable terms)
+        search, hits = None, None
         if q:
-            base_query = base_query.filter(
-                Announcement.title.ilike(f'%{q}%') | Announcement.content.ilike(f'%{q}%')
-            )
+            search = search_backend()
+            hits = search.hits("announcements", q)
+            if hits is not None:
+                base_query = base_query.join(hits, hits.c.id == Announcement.id)
+            else:
+                base_query = base_query.filter(
+                    Announcement.title.ilike(f'%{q}%') | Announcement.content.ilike(f'%{q}%')
+                )
 
-        if status_filter != 'all':
+        if status_filter in STATE_FILTERS:
+            base_query = base_query.filter(STATE_FILTERS[status_filter](datetime.now()))
+        elif status_filter != 'all':
             base_query = base_query.filter(Announcement.status == status_filter)
 
         if club_id:
@@ -748,23 +749,28 @@ def register_routes(app):
             )
 
         # Apply sorting
-        if sort_by == 'title':
-            qry = base_query.order_by(Announcement.title.asc())
+        if sort_by == 'relevance' and hits is not None:
+            qry = base_query.order_by(hits.c.score.desc(), Announcement.id.desc())
+        elif sort_by == 'title':
+            qry = base_query.order_by(Announcement.title.asc(), Announcement.id.asc())
         elif sort_by == 'club':
-            qry = base_query.order_by(Club.club_name.asc())
+            qry = base_query.order_by(Club.club_name.asc(), Announcement.id.asc())
         elif sort_by == 'newest':
-            qry = base_query.order_by(Announcement.updated_at.desc())
+            qry = base_query.order_by(Announcement.updated_at.desc(), Announcement.id.desc())
         elif sort_by == 'oldest':
-            qry = base_query.order_by(Announcement.updated_at.asc())
+            qry = base_query.order_by(Announcement.updated_at.asc(), Announcement.id.asc())
         else:
-            qry = base_query.order_by(Announcement.pinned.desc(), Announcement.updated_at.desc())
+            qry = base_query.order_by(Announcement.pinned.desc(), Announcement.updated_at.desc(), Announcement.id.desc())
 
-        announcements = qry.all()
+        announcements, meta = offset_page(qry, page, per_page)
+        snippets = search.snippets("announcements", q, [a.id for a in announcements]) if hits is not None else {}
 
         return render_template(
             "announcements.html",
             clubs=clubs,
             announcements=announcements,
+            meta=meta,
+            snippets=snippets,
             q=q,
             club_id=club_id,
             status=status_filter,
@@ -916,13 +922,7 @@ def register_routes(app):
             allowed_ext = {"png", "jpg", "jpeg", "gif", "webp"}
             ext = file.filename.rsplit(".", 1)[-1].lower() if "." in file.filename else ""
             if ext in allowed_ext:
-                safe_name = secure_filename(file.filename)
-                save_dir = current_app.config["CLUB_UPLOAD_FOLDER"]
-                os.makedirs(save_dir, exist_ok=True)
-                path = os.path.join(save_dir, safe_name)
-                file.save(path)
-                rel = os.path.relpath(path, current_app.static_folder).replace("\\", "/")
-                club.club_logo = rel
+                club.club_logo = save_image(file)
             else:
                 flash("Invalid logo format. Allowed: png, jpg, jpeg, gif, webp.", "error")
                 return redirect(url_for("clubs"))
@@ -1023,18 +1023,12 @@ def register_routes(app):
                 flash("Invalid image format. Allowed: png, jpg, jpeg, gif, webp.", "error")
                 return redirect(url_for("events"))
 
-            base = secure_filename(file.filename.rsplit(".", 1)[0])[:60] or "event"
-            unique_name = f"{base}-{uuid4().hex[:10]}.{ext}"
-            save_dir = current_app.config["EVENT_UPLOAD_FOLDER"]
-            os.makedirs(save_dir, exist_ok=True)
-            save_path = os.path.join(save_dir, unique_name)
             try:
-                file.save(save_path)
+                ev.event_image = save_image(file)
             except Exception:
                 current_app.logger.exception("Failed to save event image")
                 flash("Failed to save the image. Please try again.", "error")
                 return redirect(url_for("events"))
-            ev.event_image = relpath_from_static(save_path)
 
         try:
             db.session.commit()
@@ -1183,14 +1177,7 @@ def register_routes(app):
                 flash("Invalid image format. Allowed: png, jpg, jpeg, gif, webp.", "error")
                 return redirect(url_for("coordinators"))
 
-            safe_name = secure_filename(file.filename)
-            save_dir = current_app.config["COORDINATOR_UPLOAD_FOLDER"]
-            os.makedirs(save_dir, exist_ok=True)
-            save_path = os.path.join(save_dir, safe_name)
-            file.save(save_path)
-
-            rel = os.path.relpath(save_path, current_app.static_folder).replace("\\", "/")
-            co.coordinator_image = rel
+            co.coordinator_image = save_image(file)
 
         try:
             db.session.commit()
@@ -1255,7 +1242,7 @@ def register_routes(app):
 
         # Cross-field validation
         status = (f.get("status") or "draft").strip().lower()
-        if status not in {"draft", "published"}:
+        if status not in {"draft", "published", "expired"}:
             flash("Invalid status.", "error")
             return redirect(url_for("announcements"))
         if status == "published" and not publish_at:
@@ -1415,25 +1402,19 @@ def register_routes(app):
             club_ids = request.args.getlist('club_ids')
             status_filter = request.args.get('status', 'all')
             sort_by = request.args.get('sort', 'none')
+            page, per_page = page_args(request.args)
 
             # ✅ Dropdown data: only non-deleted clubs/colleges
-            clubs = (
-                Club.query
-                .filter(Club.is_deleted.is_(False))
-                .order_by(Club.club_name.asc())
-                .all()
-            )
-            colleges = (
-                College.query
-                .filter(College.is_deleted.is_(False))
-                .order_by(College.college_name.asc())
-                .all()
-            )
+            clubs = club_options()
+            colleges = college_options()
 
-            # ✅ Base query: only non-deleted members; keep outer-join to college
+            # ✅ Base query: only non-deleted members; keep outer-join to college.
+            #    Clubs for the whole page arrive in one batched SELECT ... IN (selectinload);
+            #    Club.members is left unloaded so it does not pull in every member of those clubs.
             query = (
                 db.session.query(Member, College)
                 .outerjoin(College, Member.college_id == College.college_id)
+                .options(selectinload(Member.clubs).lazyload(Club.members))
                 .filter(Member.is_deleted.is_(False))
             )
 
@@ -1445,11 +1426,16 @@ def register_routes(app):
             club_ids = request.args.getlist('club_ids')
             club_ids = [int(cid) for cid in club_ids if cid.isdigit()]
             if club_ids:
-                query = (
-                    query
-                    .join(member_clubs, Member.member_id == member_clubs.c.member_id)
+                # EXISTS semi-join: members in several selected clubs are listed once
+                query = query.filter(
+                    select(member_clubs.c.member_id)
                     .join(Club, member_clubs.c.club_id == Club.club_id)
-                    .filter(Club.is_deleted.is_(False), member_clubs.c.club_id.in_(club_ids))
+                    .where(
+                        member_clubs.c.member_id == Member.member_id,
+                        member_clubs.c.club_id.in_(club_ids),
+                        Club.is_deleted.is_(False),
+                    )
+                    .exists()
                 )
 
             # Apply status filter (on non-deleted members)
@@ -1460,29 +1446,23 @@ def register_routes(app):
 
             # Apply sorting
             if sort_by == 'name':
-                query = query.order_by(Member.member_name.asc())
+                query = query.order_by(Member.member_name.asc(), Member.member_id.asc())
             elif sort_by == 'club':
-                # order by the alphabetically first non-deleted club name of each member
-                query = (
-                    query
-                    .outerjoin(Member.clubs)  # joins Club via relationship
-                    .filter(or_(Club.is_deleted.is_(False), Club.club_id.is_(None)))
-                    .group_by(Member, College)
-                    .order_by(func.min(Club.club_name).asc())
-                )
+                # alphabetically first non-deleted club name, precomputed and indexed (see sortkeys.py)
+                query = query.order_by(Member.primary_club_name.asc(), Member.member_id.asc())
             elif sort_by == 'college':
                 # keep members even if their college is deleted/None; deleted colleges will sort as NULL
-                query = query.order_by(College.college_name.asc())
+                query = query.order_by(College.college_name.asc(), Member.member_id.asc())
             elif sort_by == 'email':
-                query = query.order_by(Member.email.asc())
+                query = query.order_by(Member.email.asc(), Member.member_id.asc())
             elif sort_by == 'newest':
-                query = query.order_by(Member.created_time.desc())
+                query = query.order_by(Member.created_time.desc(), Member.member_id.desc())
             elif sort_by == 'oldest':
-                query = query.order_by(Member.created_time.asc())
+                query = query.order_by(Member.created_time.asc(), Member.member_id.asc())
             else:
-                query = query.order_by(Member.created_time.desc())
+                query = query.order_by(Member.created_time.desc(), Member.member_id.desc())
 
-            rows = query.all()
+            rows, meta = offset_page(query, page, per_page)
 
             # Shape data for the template
             members = []
@@ -1512,29 +1492,17 @@ def register_routes(app):
                 })
 
             # ✅ Counts for stats (exclude soft-deleted members)
-            total_members = (
-                    db.session.query(func.count(Member.member_id))
-                    .filter(Member.is_deleted.is_(False))
-                    .scalar() or 0
-            )
-            active_members = (
-                    db.session.query(func.count(Member.member_id))
-                    .filter(
-                        Member.is_deleted.is_(False),
-                        (Member.status == "active") | (Member.status.is_(None))
-                    )
-                    .scalar() or 0
-            )
-            inactive_members = total_members - active_members
+            stats = get_stats()
 
             return render_template(
                 "members.html",
                 clubs=clubs,
                 colleges=colleges,
                 members=members,
-                total_members=total_members,
-                active_members=active_members,
-                inactive_members=inactive_members,
+                meta=meta,
+                total_members=stats.total_members,
+                active_members=stats.active_members,
+                inactive_members=stats.inactive_members,
                 q=q,
                 club_ids=club_ids,
                 status=status_filter,
@@ -1598,12 +1566,7 @@ def register_routes(app):
                 flash("Invalid image format. Allowed: png, jpg, jpeg, gif, webp.", "error")
                 return back_to_modal()
 
-            safe_name = secure_filename(file.filename)
-            save_dir = current_app.config["MEMBER_UPLOAD_FOLDER"]
-            os.makedirs(save_dir, exist_ok=True)
-            save_path = os.path.join(save_dir, safe_name)
-            file.save(save_path)
-            image_rel_path = relpath_from_static(save_path)
+            image_rel_path = save_image(file)
 
         # --- Insert into DB ---
         try:
@@ -1650,8 +1613,9 @@ def register_routes(app):
             return redirect(url_for("members"))
 
         # Validate club_ids exist
-        clubs = Club.query.filter(Club.club_id.in_(club_ids)).all()
-        if len(clubs) != len(club_ids):
+        club_ids = {int(cid) for cid in club_ids if str(cid).isdigit()}
+        valid_ids = db.session.execute(select(Club.club_id).where(Club.club_id.in_(club_ids))).scalars().all()
+        if not club_ids or len(valid_ids) != len(club_ids):
             flash("Invalid club selection.", "error")
             return redirect(url_for("members"))
 
@@ -1673,8 +1637,9 @@ def register_routes(app):
             status = "active"
         me.status = status
 
-        # Update clubs relationship
-        me.clubs = clubs
+        # Update clubs: delete removed / insert added only (kept rows keep joined_date)
+        set_member_clubs(db.session.connection(), me.member_id, club_ids)
+        db.session.expire(me, ["clubs"])
 
         # Optional image upload (same pattern as your create route)
         file = request.files.get("member_image")
@@ -1685,14 +1650,7 @@ def register_routes(app):
                 flash("Invalid image format. Allowed: png, jpg, jpeg, gif, webp.", "error")
                 return redirect(url_for("members"))
 
-            safe_name = secure_filename(file.filename)
-            save_dir = current_app.config["MEMBER_UPLOAD_FOLDER"]
-            os.makedirs(save_dir, exist_ok=True)
-            save_path = os.path.join(save_dir, safe_name)
-            file.save(save_path)
-
-            rel = os.path.relpath(save_path, current_app.static_folder).replace("\\", "/")
-            me.member_image = rel
+            me.member_image = save_image(file)
 
         try:
             db.session.commit()
@@ -1,9 +1,24 @@
 # run.py
 import os
+import sys
 from flask import Flask
+from flask.cli import ScriptInfo
 from config import Config
 from models import db
 from routes import register_routes
+from stats import register_stats, ensure_stats_row
+from refdata import register_refdata
+from search import register_search, ensure_search_schema
+from sortkeys import register_sortkeys, ensure_sort_key_schema
+from etags import register_etags
+from serializers import register_serializers
+from compression import register_compression
+from thumbnails import register_thumbnails
+from jobs import register_jobs
+from mailer import register_mailer
+from publishing import register_publishing, ensure_publishing_schema
+from sweeper import register_sweeper, ensure_sweeper_schema
+from dbpool import engine_options, register_pool
 from api import api
 # Initialize the Flask application and load configuration settings from the Config class
 app = Flask(__name__)
@@ -16,14 +31,32 @@ app.config.setdefault("CLUB_UPLOAD_FOLDER",        os.path.join(app.config["UPLO
 app.config.setdefault("EVENT_UPLOAD_FOLDER",       os.path.join(app.config["UPLOAD_FOLDER"], "events"))
 app.config.setdefault("COORDINATOR_UPLOAD_FOLDER", os.path.join(app.config["UPLOAD_FOLDER"], "coordinators"))
 app.config.setdefault("MEMBER_UPLOAD_FOLDER", os.path.join(app.config["UPLOAD_FOLDER"], "members"))
+# content-addressed store for every new upload (see storage.py)
+app.config.setdefault("IMAGE_STORE_FOLDER", os.path.join(app.config["UPLOAD_FOLDER"], "store"))
 
 app.config.setdefault("MAX_CONTENT_LENGTH", 5 * 1024 * 1024)  # 5 MB
 
+# Pool settings from DB_PROFILE (dev/test/prod); must be in place before the engine is created
+app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
+
 # Initialize database with the Flask app
 db.init_app(app)
+register_pool(app)
 
 #register all application routes
 register_routes(app)
+register_stats(app)
+register_refdata(app)
+register_search(app)
+register_sortkeys(app)
+register_etags(app)
+register_serializers(app)
+register_compression(app)
+register_thumbnails(app)
+register_jobs(app)
+register_mailer(app)
+register_publishing(app)
+register_sweeper(app)
 
 app.register_blueprint(api)
 
@@ -31,9 +64,17 @@ if __name__ == "__main__":
     #creates an application context, allowing database operations
     with app.app_context():
         # make sure all upload dirs exist
-        for key in ("UPLOAD_FOLDER", "CLUB_UPLOAD_FOLDER", "EVENT_UPLOAD_FOLDER", "COORDINATOR_UPLOAD_FOLDER","MEMBER_UPLOAD_FOLDER"):
+        for key in ("UPLOAD_FOLDER", "CLUB_UPLOAD_FOLDER", "EVENT_UPLOAD_FOLDER", "COORDINATOR_UPLOAD_FOLDER","MEMBER_UPLOAD_FOLDER","IMAGE_STORE_FOLDER"):
             os.makedirs(app.config[key], exist_ok=True)
         #db.drop_all()
         db.create_all()
+        ensure_search_schema()
+        ensure_sort_key_schema()
+        ensure_publishing_schema()
+        ensure_sweeper_schema()
+        ensure_stats_row()
         print("✅ Tables ready.")
+    if len(sys.argv) > 1:
+        # management commands, e.g. `python run.py reconcile-stats`
+        app.cli.main(args=sys.argv[1:], obj=ScriptInfo(create_app=lambda: app))
     app.run(debug=True)
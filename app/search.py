@@ -0,0 +1,278 @@
+# app/search.py
+"""
+Full-text search for announcements and events.
+
+    backend = get_backend()
+    hits = backend.hits("announcements", q)        # subquery (id, score) or None
+    query = query.join(hits, hits.c.id == Announcement.id)
+    ...
+    snippets = backend.snippets("announcements", q, [a.id for a in rows])
+
+Backends:
+  * MySQLFulltextBackend — InnoDB FULLTEXT index + MATCH ... AGAINST (BOOLEAN MODE).
+  * SQLiteFTS5Backend    — external-content FTS5 table kept in sync by triggers
+                           (local dev / tests). Soft-deleted rows are dropped from the index.
+  * LikeBackend          — ILIKE fallback for any other database.
+
+`hits()` returns None when the search string has no indexable terms; callers then
+fall back to their old ILIKE filter.
+"""
+import html
+import re
+import threading
+from collections import namedtuple
+
+import click
+from flask import current_app
+from sqlalchemy import bindparam, literal, or_, select, text
+from sqlalchemy.dialects.mysql import match as mysql_match
+
+from models import db, Announcement, Event
+
+SearchIndex = namedtuple("SearchIndex", "model pk columns")
+
+INDEXES = {
+    "announcements": SearchIndex(Announcement, "id", ("title", "content")),
+    "events": SearchIndex(Event, "event_id", ("event_name", "description")),
+}
+
+SNIPPET_WORDS = 16
+_MARK_OPEN, _MARK_CLOSE = "\x02", "\x03"
+
+
+def terms(q: str) -> list:
+    """Search words in `q` (punctuation and operators dropped)."""
+    return re.findall(r"\w+", (q or "").lower())
+
+
+def _mark_html(s: str) -> str:
+    """Escape `s` and turn the private markers into <mark> tags."""
+    return html.escape(s).replace(_MARK_OPEN, "<mark>").replace(_MARK_CLOSE, "</mark>")
+
+
+def highlight(textval: str | None, words: list, width: int = 160) -> str | None:
+    """Python-side snippet: a window around the first hit with every term wrapped in <mark>."""
+    if not textval or not words:
+        return None
+    pattern = re.compile("|".join(re.escape(w) for w in sorted(words, key=len, reverse=True)), re.I)
+    first = pattern.search(textval)
+    if not first:
+        return None
+    start = max(0, first.start() - width // 3)
+    end = min(len(textval), start + width)
+    window = textval[start:end]
+    window = pattern.sub(lambda m: f"{_MARK_OPEN}{m.group(0)}{_MARK_CLOSE}", window)
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end < len(textval) else ""
+    return _mark_html(prefix + window + suffix)
+
+
+class SearchBackend:
+    name = "base"
+
+    def ensure_schema(self, conn) -> None:
+        """Create whatever index structures the backend needs (idempotent)."""
+
+    def rebuild(self, conn) -> None:
+        """Re-index every non-deleted row from scratch."""
+
+    def hits(self, entity: str, q: str):
+        raise NotImplementedError
+
+    def snippets(self, entity: str, q: str, ids: list) -> dict:
+        """id -> highlighted HTML snippet for the rows on the current page."""
+        idx = INDEXES[entity]
+        words = terms(q)
+        if not ids or not words:
+            return {}
+        pk = getattr(idx.model, idx.pk)
+        cols = [getattr(idx.model, c) for c in idx.columns]
+        out = {}
+        for row in db.session.execute(select(pk, *cols).where(pk.in_(ids))):
+            for value in row[:0:-1]:     # body column first, then title
+                snip = highlight(value, words)
+                if snip:
+                    out[row[0]] = snip
+                    break
+        return out
+
+
+class LikeBackend(SearchBackend):
+    """No index: substring match on every column (the pre-search-index behaviour)."""
+    name = "like"
+
+    def hits(self, entity, q):
+        q = (q or "").strip()
+        if not q:
+            return None
+        idx = INDEXES[entity]
+        pk = getattr(idx.model, idx.pk)
+        cond = or_(*[getattr(idx.model, c).ilike(f"%{q}%") for c in idx.columns])
+        return select(pk.label("id"), literal(0.0).label("score")).where(cond).subquery()
+
+
+class MySQLFulltextBackend(SearchBackend):
+    name = "mysql"
+    MIN_TOKEN = 3   # innodb_ft_min_token_size default
+
+    @staticmethod
+    def _index_name(entity):
+        return f"ft_{entity}"
+
+    def ensure_schema(self, conn):
+        for entity, idx in INDEXES.items():
+            table = idx.model.__tablename__
+            exists = conn.execute(text(
+                "SELECT COUNT(*) FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = :t AND index_name = :i"
+            ), {"t": table, "i": self._index_name(entity)}).scalar()
+            if not exists:
+                cols = ", ".join(idx.columns)
+                conn.exec_driver_sql(
+                    f"ALTER TABLE {table} ADD FULLTEXT INDEX {self._index_name(entity)} ({cols})"
+                )
+
+    def rebuild(self, conn):
+        # InnoDB maintains FULLTEXT indexes itself; OPTIMIZE merges the deletion log.
+        for idx in INDEXES.values():
+            conn.exec_driver_sql(f"OPTIMIZE TABLE {idx.model.__tablename__}")
+
+    def hits(self, entity, q):
+        words = terms(q)
+        if not words or any(len(w) < self.MIN_TOKEN for w in words):
+            # terms below the index's minimum token size are never indexed
+            return LikeBackend().hits(entity, q)
+        idx = INDEXES[entity]
+        pk = getattr(idx.model, idx.pk)
+        score = mysql_match(
+            *[getattr(idx.model, c) for c in idx.columns],
+            against=" ".join(f"+{w}*" for w in words),
+        ).in_boolean_mode()
+        return select(pk.label("id"), score.label("score")).where(score > 0).subquery()
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    name = "sqlite"
+
+    @staticmethod
+    def _fts(entity):
+        return f"{entity}_fts"
+
+    def _ddl(self, entity, idx):
+        fts, table, pk = self._fts(entity), idx.model.__tablename__, idx.pk
+        cols = ", ".join(idx.columns)
+        new_vals = ", ".join(f"new.{c}" for c in idx.columns)
+        old_vals = ", ".join(f"old.{c}" for c in idx.columns)
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{cols}, content='{table}', content_rowid='{pk}')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} WHEN new.is_deleted = 0 BEGIN "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk}, {new_vals}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} WHEN old.is_deleted = 0 BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {old_vals}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) SELECT 'delete', old.{pk}, {old_vals} WHERE old.is_deleted = 0; "
+            f"INSERT INTO {fts}(rowid, {cols}) SELECT new.{pk}, {new_vals} WHERE new.is_deleted = 0; END",
+        ]
+
+    def ensure_schema(self, conn):
+        for entity, idx in INDEXES.items():
+            fts = self._fts(entity)
+            existed = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :n"), {"n": fts}
+            ).first()
+            for stmt in self._ddl(entity, idx):
+                conn.exec_driver_sql(stmt)
+            if not existed:
+                self._fill(conn, entity, idx)
+
+    def _fill(self, conn, entity, idx):
+        fts, table, pk = self._fts(entity), idx.model.__tablename__, idx.pk
+        cols = ", ".join(idx.columns)
+        conn.exec_driver_sql(
+            f"INSERT INTO {fts}(rowid, {cols}) SELECT {pk}, {cols} FROM {table} WHERE is_deleted = 0"
+        )
+
+    def rebuild(self, conn):
+        for entity, idx in INDEXES.items():
+            conn.exec_driver_sql(f"INSERT INTO {self._fts(entity)}({self._fts(entity)}) VALUES ('delete-all')")
+            self._fill(conn, entity, idx)
+
+    @staticmethod
+    def _match_expr(words):
+        # every term, prefix-matched: "foo"* "bar"*
+        return " ".join(f'"{w}"*' for w in words)
+
+    def hits(self, entity, q):
+        words = terms(q)
+        if not words:
+            return None
+        fts = self._fts(entity)
+        return (
+            text(f"SELECT rowid AS id, -bm25({fts}) AS score FROM {fts} WHERE {fts} MATCH :ftq")
+            .bindparams(bindparam("ftq", self._match_expr(words)))
+            .columns(id=db.Integer, score=db.Float)
+            .subquery()
+        )
+
+    def snippets(self, entity, q, ids):
+        words = terms(q)
+        if not ids or not words:
+            return {}
+        fts = self._fts(entity)
+        rows = db.session.execute(
+            text(
+                f"SELECT rowid, snippet({fts}, -1, :mo, :mc, '…', {SNIPPET_WORDS}) "
+                f"FROM {fts} WHERE {fts} MATCH :ftq AND rowid IN :ids"
+            ).bindparams(bindparam("ids", expanding=True)),
+            {"mo": _MARK_OPEN, "mc": _MARK_CLOSE, "ftq": self._match_expr(words), "ids": list(ids)},
+        )
+        return {rowid: _mark_html(snip) for rowid, snip in rows if snip}
+
+
+BACKENDS = {
+    "mysql": MySQLFulltextBackend,
+    "sqlite": SQLiteFTS5Backend,
+    "like": LikeBackend,
+}
+
+_ready = set()
+_lock = threading.Lock()
+
+
+def _pick(dialect: str) -> str:
+    choice = (current_app.config.get("SEARCH_BACKEND") or "auto").lower()
+    if choice != "auto":
+        return choice
+    if dialect in ("mysql", "mariadb"):
+        return "mysql"
+    return dialect if dialect in BACKENDS else "like"
+
+
+def ensure_search_schema(rebuild: bool = False) -> SearchBackend:
+    """Create (and optionally rebuild) the search index for the current database."""
+    engine = db.engine
+    backend = BACKENDS[_pick(engine.dialect.name)]()
+    with engine.begin() as conn:
+        backend.ensure_schema(conn)
+        if rebuild:
+            backend.rebuild(conn)
+    with _lock:
+        _ready.add(engine.url)
+    return backend
+
+
+def get_backend() -> SearchBackend:
+    """Search backend for the current database (index structures created on first use)."""
+    engine = db.engine
+    if engine.url not in _ready:
+        return ensure_search_schema()
+    return BACKENDS[_pick(engine.dialect.name)]()
+
+
+def register_search(app):
+    @app.cli.command("rebuild-search-index")
+    def rebuild_search_index_command():
+        """Create the full-text search index and re-index every non-deleted row."""
+        backend = ensure_search_schema(rebuild=True)
+        click.echo(f"Search index rebuilt ({backend.name}).")
@@ -0,0 +1,269 @@
+# app/serializers.py
+"""
+One JSON path for every API response.
+
+`FastJSONProvider` replaces Flask's stdlib provider (`app.json`). When orjson is
+installed it does the encoding, datetimes included, and writes the response body
+as bytes directly; otherwise it falls back to `json` with the same output
+(ISO-8601 datetimes, sorted keys).
+
+Models are turned into dicts by field specs registered per model and view:
+
+    register(Club, "list", fields("club_id", "club_name", club_logo=("club_logo", get)))
+
+    serialize(club, "list", members=3)              # -> dict, extra keys merged in
+    serialize(club, "list", only={"club_name"})     # sparse fieldset (?fields=)
+    query.options(*column_options(Club, "list", only, keys))   # ...and its SELECT list
+    ok(club)                                        # the provider uses the "default" view
+
+Every field names the columns it reads, so a sparse fieldset narrows the SQL
+column list with `load_only()` and never touches a deferred attribute.
+Serializers leave datetimes as they are; the encoder handles them natively.
+"""
+import json
+from datetime import date, datetime, time
+from operator import attrgetter
+from typing import Callable, NamedTuple
+
+from flask import url_for
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import load_only
+
+import thumbnails
+from models import Announcement, Club, College, Coordinator, Event, Member
+
+try:
+    import orjson
+except ImportError:     # optional: stdlib json is used instead
+    orjson = None
+
+
+class Field(NamedTuple):
+    get: Callable           # obj -> value
+    columns: tuple          # mapped column attributes `get` reads
+
+
+_REGISTRY = {}          # (model class, view) -> {name: Field}
+
+
+def fields(*names, **computed) -> dict:
+    """
+    Build a field spec. Plain names read the column of the same name; computed
+    fields are `name=(columns, getter)` with `columns` a name or tuple of names.
+    """
+    spec = {name: Field(attrgetter(name), (name,)) for name in names}
+    for name, (columns, get) in computed.items():
+        spec[name] = Field(get, (columns,) if isinstance(columns, str) else tuple(columns))
+    return spec
+
+
+def register(model, view: str, spec: dict) -> None:
+    _REGISTRY[(model, view)] = spec
+
+
+def field_names(model, view: str = "default") -> set:
+    return set(_REGISTRY[(model, view)])
+
+
+def wanted(only, *names) -> bool:
+    """True when a sparse fieldset `only` (None = everything) asks for any of `names`."""
+    return only is None or any(n in only for n in names)
+
+
+def serialize(obj, view: str = "default", only=None, **extra) -> dict:
+    """Serialize `obj` with its `view` spec; `only` restricts the output to those keys."""
+    spec = _REGISTRY[(type(obj), view)]
+    if only is None:
+        data = {name: f.get(obj) for name, f in spec.items()}
+        data.update(extra)
+    else:
+        data = {name: f.get(obj) for name, f in spec.items() if name in only}
+        data.update((k, v) for k, v in extra.items() if k in only)
+    return data
+
+
+def column_options(model, view: str, only, keys=None, extra=()) -> list:
+    """
+    `load_only()` for the columns the requested fields read, plus the primary key,
+    any of the model's sort-key columns (cursor tokens read them) and the `extra`
+    attribute names. Empty when `only` is None, i.e. every column is loaded.
+    """
+    if only is None:
+        return []
+    mapper = sa_inspect(model)
+    spec = _REGISTRY[(model, view)]
+    names = {col for name, f in spec.items() if name in only for col in f.columns}
+    names.update(mapper.get_property_by_column(c).key for c in mapper.primary_key)
+    names.update(col.key for col, _ in keys or () if col.class_ is model)
+    names.update(extra)
+    return [load_only(*(getattr(model, n) for n in sorted(names)))]
+
+
+def image_url(relpath: str | None, size: str | None = None):
+    """Absolute URL of an upload; `size` picks a resized variant (thumbnails.SIZES) when it exists."""
+    if not relpath:
+        return None
+    return url_for("static", filename=thumbnails.variant(relpath, size), _external=True)
+
+
+# ---------- Provider ----------
+
+class FastJSONProvider(DefaultJSONProvider):
+    @staticmethod
+    def default(o):
+        if (type(o), "default") in _REGISTRY:
+            return serialize(o)
+        if isinstance(o, (datetime, date, time)):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def _options(self, sort_keys: bool, indent: bool) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None:
+            kwargs.setdefault("default", self.default)
+            kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        option = self._options(kwargs.get("sort_keys", self.sort_keys), bool(kwargs.get("indent")))
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(
+            obj, default=self.default,
+            option=self._options(self.sort_keys, indent) | orjson.OPT_APPEND_NEWLINE,
+        )
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+# ---------- Clubs ----------
+
+_CLUB_ROW = fields(
+    "club_id", "club_name", "club_category", "description", "status", "created_time",
+    club_logo=("club_logo", lambda c: image_url(c.club_logo)),
+    club_logo_thumb=("club_logo", lambda c: image_url(c.club_logo, "thumb")),
+)
+register(Club, "list", _CLUB_ROW)
+register(Club, "default", {**_CLUB_ROW, **fields("updated_time")})
+
+
+# ---------- Events ----------
+
+_EVENT_ROW = fields(
+    "event_id", "event_name", "organising_club_id", "event_coordinator", "venue",
+    "start_at", "end_at", "max_participants", "status", "created_time",
+    event_image=("event_image", lambda ev: image_url(ev.event_image)),
+    event_image_thumb=("event_image", lambda ev: image_url(ev.event_image, "thumb")),
+    description=("description", lambda ev: ev.description or ""),
+)
+register(Event, "list", _EVENT_ROW)
+register(Event, "default", {**_EVENT_ROW, **fields("updated_time")})
+
+
+# ---------- Colleges ----------
+
+_COLLEGE_FIELDS = fields(
+    "college_id", "college_name", "email", "location", "authority_name", "authority_role",
+    "phone", "description", "status", "created_time",
+)
+register(College, "list", {
+    **_COLLEGE_FIELDS,
+    **fields(status=("status", lambda c: (c.status or "active").lower())),
+})
+register(College, "default", {
+    **_COLLEGE_FIELDS,
+    **fields(updated_time=((), lambda c: getattr(c, "updated_time", None))),
+})
+
+
+# ---------- Coordinators ----------
+# club_name / college_name come from the caller, which already has the rows
+
+_COORDINATOR_FIELDS = fields(
+    "coordinator_id", "coordinator_name", "club_id", "college_id", "faculty_dept", "role_type",
+    "email", "phone", "description", "status", "created_time",
+)
+register(Coordinator, "list", {
+    **_COORDINATOR_FIELDS,
+    **fields(
+        image_path=("coordinator_image", lambda c: image_url(c.coordinator_image)),
+        image_path_thumb=("coordinator_image", lambda c: image_url(c.coordinator_image, "thumb")),
+    ),
+})
+register(Coordinator, "default", {
+    **_COORDINATOR_FIELDS,
+    **fields("updated_time", image=("coordinator_image", lambda c: image_url(c.coordinator_image))),
+})
+
+
+# ---------- Members ----------
+
+def _visible_clubs(m: Member) -> list:
+    return [c for c in m.clubs if not c.is_deleted]
+
+
+def _club_names(m: Member) -> str:
+    return ", ".join(c.club_name for c in _visible_clubs(m)) or "-"
+
+
+def _college_name(m: Member) -> str:
+    return m.college.college_name if m.college and not m.college.is_deleted else "-"
+
+
+# members table row; `club`/`club_ids` need `clubs` loaded, `college` needs `college`
+register(Member, "list", fields(
+    "college_id", "faculty_dept", "email", "phone", "description", "status", "created_time",
+    id=("member_id", lambda m: m.member_id),
+    name=("member_name", lambda m: m.member_name),
+    club=((), _club_names),
+    club_ids=((), lambda m: [c.club_id for c in _visible_clubs(m)]),
+    college=("college_id", _college_name),
+    image_path=("member_image", lambda m: image_url(m.member_image)),
+    image_path_thumb=("member_image", lambda m: image_url(m.member_image, "thumb")),
+))
+
+# single member; `college_name` and `clubs` are added by the caller
+register(Member, "default", fields(
+    "member_id", "member_name", "college_id", "faculty_dept", "email", "phone", "status",
+    "created_time", "updated_time",
+    image_path=("member_image", lambda m: image_url(m.member_image)),
+    description=("description", lambda m: m.description or ""),
+))
+
+
+# ---------- Announcements ----------
+
+register(Announcement, "default", fields(
+    "id", "club_id", "title", "content", "publish_at", "expire_at", "priority", "audience",
+    "status", "created_at", "updated_at",
+    send_email=("send_email", lambda a: bool(a.send_email)),
+    pinned=("pinned", lambda a: bool(a.pinned)),
+))
+
+
+# ---------- Embedded references (?expand=) ----------
+
+register(Club, "ref", fields("club_id", "club_name", "club_category", "status"))
+register(College, "ref", fields("college_id", "college_name", "location", "status"))
+
+
+# ---------- Wiring ----------
+
+def register_serializers(app):
+    app.json = FastJSONProvider(app)
@@ -0,0 +1,120 @@
+# app/sortkeys.py
+"""
+Denormalized sort key for "sort by club" on the members list.
+
+`Member.primary_club_name` holds the alphabetically first non-deleted club the
+member belongs to (NULL when there is none). It is indexed, so club-sorted
+listings read members in index order instead of grouping the whole membership
+table on every page view.
+
+ORM flushes that change a member's clubs, or rename / (soft-)delete a club,
+refresh the affected members in the same transaction. Core writes to
+`member_clubs` bypass the listener and must call `refresh_primary_club()`
+themselves. `python run.py rebuild-member-sort-keys` recomputes every row.
+"""
+import click
+from sqlalchemy import event, func, inspect, or_, select, text, update
+from sqlalchemy.orm import Session
+
+from models import db, Club, Member, member_clubs
+
+# Club attributes that can change a member's primary club
+WATCHED_CLUB_ATTRS = ("club_name", "is_deleted")
+
+
+# ---------- Writes ----------
+
+def _primary_club_sq():
+    return (
+        select(func.min(Club.club_name))
+        .select_from(member_clubs.join(Club, Club.club_id == member_clubs.c.club_id))
+        .where(member_clubs.c.member_id == Member.member_id, Club.is_deleted.is_(False))
+        .scalar_subquery()
+    )
+
+
+def refresh_primary_club(conn, member_ids=None, club_ids=None) -> None:
+    """
+    Recompute primary_club_name with one set-based UPDATE for the members in
+    `member_ids` and/or every member of the clubs in `club_ids`.
+    Both None means every member.
+    """
+    members = Member.__table__
+    stmt = update(members).values(
+        primary_club_name=_primary_club_sq(),
+        # a derived column, not an edit: keep updated_time (and the "newest"/"oldest" order) as it was
+        updated_time=members.c.updated_time,
+    )
+    conds = []
+    if member_ids is not None:
+        member_ids = [i for i in set(member_ids) if i is not None]
+        if member_ids:
+            conds.append(Member.member_id.in_(member_ids))
+    if club_ids is not None:
+        club_ids = [i for i in set(club_ids) if i is not None]
+        if club_ids:
+            conds.append(Member.member_id.in_(
+                select(member_clubs.c.member_id).where(member_clubs.c.club_id.in_(club_ids))
+            ))
+    if member_ids is not None or club_ids is not None:
+        if not conds:
+            return
+        stmt = stmt.where(or_(*conds))
+    conn.execute(stmt)
+
+
+def _touched(session):
+    member_ids, club_ids = set(), set()
+    for obj in session.new | session.dirty:
+        state = inspect(obj)
+        if isinstance(obj, Member) and state.attrs.clubs.history.has_changes():
+            member_ids.add(obj.member_id)
+        elif isinstance(obj, Club):
+            hist = state.attrs.members.history
+            member_ids.update(m.member_id for m in (*hist.added, *hist.deleted))
+            if obj not in session.new and any(
+                state.attrs[a].history.has_changes() for a in WATCHED_CLUB_ATTRS
+            ):
+                club_ids.add(obj.club_id)
+    for obj in session.deleted:
+        if isinstance(obj, Club):
+            # membership rows go with the club; recompute its former members
+            members = inspect(obj).attrs.members.loaded_value
+            if isinstance(members, list):
+                member_ids.update(m.member_id for m in members)
+    return member_ids, club_ids
+
+
+def _after_flush(session, flush_context):
+    member_ids, club_ids = _touched(session)
+    if member_ids or club_ids:
+        refresh_primary_club(session.connection(), member_ids=member_ids, club_ids=club_ids)
+
+
+# ---------- Schema ----------
+
+def ensure_sort_key_schema() -> None:
+    """Add members.primary_club_name (+ index) to databases created before it existed, then backfill."""
+    engine = db.engine
+    insp = inspect(engine)
+    if any(c["name"] == "primary_club_name" for c in insp.get_columns("members")):
+        return
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE members ADD COLUMN primary_club_name VARCHAR(100)"))
+        conn.execute(text("CREATE INDEX ix_members_primary_club_name ON members (primary_club_name)"))
+        refresh_primary_club(conn)
+
+
+# ---------- Wiring ----------
+
+def register_sortkeys(app):
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+
+    @app.cli.command("rebuild-member-sort-keys")
+    def rebuild_member_sort_keys_command():
+        """Recompute members.primary_club_name for every member."""
+        ensure_sort_key_schema()
+        refresh_primary_club(db.session.connection())
+        db.session.commit()
+        click.echo("Member sort keys rebuilt.")
@@ -525,6 +525,19 @@ document.addEventListener('DOMContentLoaded', () => {
   window.initFilterSort = function ({ tbody, status, sort, search, emptyColspan = 6, filterKey } = {}) {
     const tb = q(tbody), sf = status && q(status), so = sort && q(sort), se = search && q(search);
     if (!tb) return;
+
+    // Server-paged tables: filters/sort are query params, so reload with the new value (back to page 1)
+    if (tb.closest('[data-server-paged]')) {
+      const go = (el) => {
+        const url = new URL(window.location.href);
+        if (!el.value || el.value.toLowerCase() === 'all' || el.value.toLowerCase() === 'none') url.searchParams.delete(el.name);
+        else url.searchParams.set(el.name, el.value);
+        url.searchParams.delete('page');
+        window.location.assign(url.toString());
+      };
+      [sf, so].forEach((el) => el && el.name && el.addEventListener('change', () => go(el)));
+      return;
+    }
     const base = [...tb.querySelectorAll('tr')];
     const coll = new Intl.Collator(undefined, { sensitivity: 'base' });
 
@@ -1115,6 +1128,7 @@ document.addEventListener('DOMContentLoaded', () => {
     const root = typeof container === 'string' ? document.querySelector(container) : container;
     const pg   = typeof pager === 'string' ? document.querySelector(pager) : pager;
     if (!root || !pg) return;
+    if (pg.hasAttribute('data-server')) return;   // links rendered by the server
 
     let items = [];
     let page = 1;
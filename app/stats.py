@@ -0,0 +1,230 @@
+# app/stats.py
+"""
+Dashboard counters kept in the single-row `entity_stats` table.
+
+Every ORM flush that inserts, re-statuses, soft-deletes or hard-deletes a Club,
+College, Coordinator, Member or Event applies the matching +/- deltas in the same
+transaction, so the dashboard reads one row by primary key instead of running a
+COUNT(*) per card. `flask --app run reconcile-stats` recomputes everything from scratch.
+
+The row is created at startup (`ensure_stats_row()`, from run.py); reads never
+write. Until it exists the counters are computed on the fly.
+"""
+from datetime import datetime
+
+import click
+from sqlalchemy import event, func, insert, inspect, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from jobs import task
+from models import db, Club, College, Coordinator, Member, Event, EntityStats
+
+STATS_ID = 1
+FACULTY_ROLES = ("faculty", "lead", "co-lead", "mentor")
+
+
+# ---------- Per-entity contribution to the counters ----------
+# `get(attr)` returns the attribute value for one side (before/after) of a change.
+
+def _club(get):
+    live = not get("is_deleted")
+    return {"active_clubs": int(live and get("status") == "active")}
+
+
+def _college(get):
+    live = not get("is_deleted")
+    return {
+        "active_colleges": int(live and get("status") == "active"),
+        "inactive_colleges": int(live and get("status") == "inactive"),
+    }
+
+
+def _coordinator(get):
+    active = not get("is_deleted") and get("status") == "active"
+    return {
+        "active_coordinators": int(active),
+        "student_coordinators": int(active and get("role_type") == "student"),
+        "faculty_coordinators": int(active and get("role_type") in FACULTY_ROLES),
+    }
+
+
+def _member(get):
+    live = not get("is_deleted")
+    return {
+        "total_members": int(live),
+        "active_members": int(live and get("status") in ("active", None)),
+    }
+
+
+def _event(get):
+    live = not get("is_deleted")
+    return {
+        "upcoming_events": int(live and get("status") == "upcoming"),
+        "completed_events": int(live and get("status") == "completed"),
+    }
+
+
+CONTRIBUTIONS = {
+    Club: _club,
+    College: _college,
+    Coordinator: _coordinator,
+    Member: _member,
+    Event: _event,
+}
+
+
+def _current(obj):
+    mapper = inspect(obj).mapper
+
+    def get(attr):
+        value = getattr(obj, attr)
+        if value is None:
+            # python-side column default not applied yet
+            default = mapper.columns[attr].default
+            if default is not None and default.is_scalar:
+                return default.arg
+        return value
+    return get
+
+
+def _previous(obj):
+    attrs = inspect(obj).attrs
+
+    def get(attr):
+        hist = attrs[attr].history
+        if hist.deleted:
+            return hist.deleted[0]
+        return getattr(obj, attr)
+    return get
+
+
+def _zero(attr):
+    return True if attr == "is_deleted" else None
+
+
+# ---------- Writes ----------
+
+def bump(conn, **deltas):
+    """Atomically add `deltas` to the stats row (no-op until the row exists)."""
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+    table = EntityStats.__table__
+    conn.execute(
+        update(table)
+        .where(table.c.id == STATS_ID)
+        .values({k: table.c[k] + v for k, v in deltas.items()})
+    )
+
+
+def _collect_deltas(session) -> dict:
+    deltas = {}
+
+    def add(fn, before, after):
+        b, a = fn(before), fn(after)
+        for key in a:
+            deltas[key] = deltas.get(key, 0) + a[key] - b[key]
+
+    for obj in session.new:
+        fn = CONTRIBUTIONS.get(type(obj))
+        if fn:
+            add(fn, _zero, _current(obj))
+    for obj in session.dirty:
+        fn = CONTRIBUTIONS.get(type(obj))
+        if fn and session.is_modified(obj, include_collections=False):
+            add(fn, _previous(obj), _current(obj))
+    for obj in session.deleted:
+        fn = CONTRIBUTIONS.get(type(obj))
+        if fn:
+            add(fn, _previous(obj), _zero)
+    return deltas
+
+
+def _after_flush(session, flush_context):
+    deltas = _collect_deltas(session)
+    if any(deltas.values()):
+        bump(session.connection(), **deltas)
+
+
+# ---------- Reads ----------
+
+def compute_counts() -> dict:
+    """Recompute every counter with COUNT(*) queries (used by reconcile)."""
+    q = db.session.query
+    return {
+        "active_clubs": q(func.count(Club.club_id))
+            .filter(Club.status == "active", Club.is_deleted.is_(False)).scalar() or 0,
+        "active_colleges": q(func.count(College.college_id))
+            .filter(College.status == "active", College.is_deleted.is_(False)).scalar() or 0,
+        "inactive_colleges": q(func.count(College.college_id))
+            .filter(College.status == "inactive", College.is_deleted.is_(False)).scalar() or 0,
+        "active_coordinators": q(func.count(Coordinator.coordinator_id))
+            .filter(Coordinator.status == "active", Coordinator.is_deleted.is_(False)).scalar() or 0,
+        "student_coordinators": q(func.count(Coordinator.coordinator_id))
+            .filter(Coordinator.status == "active", Coordinator.is_deleted.is_(False),
+                    Coordinator.role_type == "student").scalar() or 0,
+        "faculty_coordinators": q(func.count(Coordinator.coordinator_id))
+            .filter(Coordinator.status == "active", Coordinator.is_deleted.is_(False),
+                    Coordinator.role_type.in_(FACULTY_ROLES)).scalar() or 0,
+        "total_members": q(func.count(Member.member_id))
+            .filter(Member.is_deleted.is_(False)).scalar() or 0,
+        "active_members": q(func.count(Member.member_id))
+            .filter(Member.is_deleted.is_(False),
+                    (Member.status == "active") | (Member.status.is_(None))).scalar() or 0,
+        "upcoming_events": q(func.count(Event.event_id))
+            .filter(Event.status == "upcoming", Event.is_deleted.is_(False)).scalar() or 0,
+        "completed_events": q(func.count(Event.event_id))
+            .filter(Event.status == "completed", Event.is_deleted.is_(False)).scalar() or 0,
+    }
+
+
+def reconcile() -> EntityStats:
+    """Rebuild the stats row from the source tables and commit it."""
+    counts = compute_counts()
+    row = db.session.get(EntityStats, STATS_ID)
+    if row is None:
+        row = EntityStats(id=STATS_ID)
+        db.session.add(row)
+    for key, value in counts.items():
+        setattr(row, key, value)
+    row.reconciled_at = datetime.now()
+    db.session.commit()
+    return row
+
+
+def ensure_stats_row() -> None:
+    """Create the stats row from the source tables if it does not exist yet."""
+    if db.session.get(EntityStats, STATS_ID) is not None:
+        return
+    counts = compute_counts()
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(insert(EntityStats.__table__).values(id=STATS_ID, reconciled_at=datetime.now(), **counts))
+    except IntegrityError:
+        pass        # another process created it first
+
+
+def get_stats() -> EntityStats:
+    """Current counters: one primary-key read (computed, not stored, while the row is missing)."""
+    row = db.session.get(EntityStats, STATS_ID, populate_existing=True)
+    return row if row is not None else EntityStats(id=STATS_ID, **compute_counts())
+
+
+@task("reconcile-stats")
+def _reconcile_job():
+    reconcile()
+
+
+# ---------- Wiring ----------
+
+def register_stats(app):
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+
+    @app.cli.command("reconcile-stats")
+    def reconcile_stats_command():
+        """Recompute dashboard counters from the source tables."""
+        row = reconcile()
+        for key in compute_counts():
+            click.echo(f"{key}: {getattr(row, key)}")
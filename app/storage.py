@@ -0,0 +1,72 @@
+# app/storage.py
+"""
+Content-addressed image storage for every upload (clubs, events, coordinators,
+members, from both the HTML forms and the API).
+
+    if allowed_image(file.filename):
+        entity.image = save_image(file)     # -> "uploads/store/ab/cd/<sha256>.png"
+
+The upload is hashed while it is streamed to a temp file, then moved to
+`ab/cd/<sha256>.<ext>` under IMAGE_STORE_FOLDER. If that path already exists the
+same bytes are already stored, so the temp file is dropped and the existing
+path is reused: identical images are kept once, and two different files that
+share a name can never overwrite each other.
+
+Every upload whose image still lacks a resized WebP variant queues the
+background job that writes them (thumbnails.py), not only the first upload of
+those bytes: the job is queued in the request's transaction, and if that rolls
+back after the file was stored, the next upload of the same image queues it again.
+Stored files are immutable and may be shared by several rows; nothing here
+deletes them.
+"""
+import hashlib
+import os
+import tempfile
+
+from flask import current_app
+
+import thumbnails
+from utils import relpath_from_static
+
+ALLOWED_IMAGE_EXT = {"png", "jpg", "jpeg", "gif", "webp"}
+CHUNK_SIZE = 64 * 1024
+
+# one spelling per format, so the same bytes always map to the same path
+_EXT_ALIASES = {"jpeg": "jpg"}
+
+
+def image_ext(filename: str | None) -> str:
+    ext = filename.rsplit(".", 1)[-1].lower() if filename and "." in filename else ""
+    return _EXT_ALIASES.get(ext, ext)
+
+
+def allowed_image(filename: str | None) -> bool:
+    return image_ext(filename) in ALLOWED_IMAGE_EXT
+
+
+def save_image(file) -> str:
+    """Store an uploaded image (werkzeug FileStorage); returns its path relative to the static folder."""
+    root = current_app.config["IMAGE_STORE_FOLDER"]
+    os.makedirs(root, exist_ok=True)
+
+    digest = hashlib.sha256()
+    fd, tmp = tempfile.mkstemp(dir=root, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: file.stream.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                out.write(chunk)
+        key = digest.hexdigest()
+        dest = os.path.join(root, key[:2], key[2:4], f"{key}.{image_ext(file.filename)}")
+        if os.path.exists(dest):
+            os.remove(tmp)
+        else:
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            os.replace(tmp, dest)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    relpath = relpath_from_static(dest)
+    thumbnails.schedule(relpath)
+    return relpath
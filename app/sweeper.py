@@ -0,0 +1,71 @@
+# app/sweeper.py
+"""
+Moves events whose time has passed from `upcoming` to `completed`.
+
+An upcoming event is past once its end_at has passed, or its start_at when it
+has no end_at. `sweep_events()` completes all of them with a single UPDATE,
+narrowed by ix_events_status_start (is_deleted, status, start_at), and moves the
+same number from upcoming_events to completed_events in `entity_stats`. A Core
+UPDATE skips the ORM stats hooks, so the counters are bumped here.
+
+It runs as the periodic `sweep-events` job every EVENT_SWEEP_INTERVAL seconds
+(jobs.py; needs a `run-jobs` worker), or once with `python run.py sweep-events`.
+Each run logs the number of events completed and how long it took.
+"""
+import logging
+import time
+from datetime import datetime
+
+import click
+from sqlalchemy import or_, update
+
+from jobs import task
+from models import db, Event
+from stats import bump
+
+log = logging.getLogger(__name__)
+
+SWEEP_INDEX = "ix_events_status_start"
+
+
+def sweep_events(now: datetime | None = None) -> tuple:
+    """Complete every past upcoming event; returns (events completed, seconds taken)."""
+    now = now or datetime.now()
+    started = time.perf_counter()
+    with db.engine.begin() as conn:
+        count = conn.execute(
+            update(Event)
+            .where(
+                Event.is_deleted.is_(False),
+                Event.status == "upcoming",
+                Event.start_at < now,
+                or_(Event.end_at.is_(None), Event.end_at < now),
+            )
+            # a system change: keep updated_time (and so the "recently updated" order) as it was
+            .values(status="completed", updated_time=Event.updated_time)
+        ).rowcount
+        bump(conn, upcoming_events=-count, completed_events=count)
+    elapsed = time.perf_counter() - started
+    log.info("Event sweep: %d event(s) completed in %.1f ms", count, elapsed * 1000)
+    return count, elapsed
+
+
+@task("sweep-events", every="EVENT_SWEEP_INTERVAL")
+def _sweep_events():
+    sweep_events()
+
+
+def ensure_sweeper_schema() -> None:
+    """Create ix_events_status_start on databases created before it existed."""
+    index = next(i for i in Event.__table__.indexes if i.name == SWEEP_INDEX)
+    index.create(db.engine, checkfirst=True)
+
+
+# ---------- Wiring ----------
+
+def register_sweeper(app):
+    @app.cli.command("sweep-events")
+    def sweep_events_command():
+        """Mark upcoming events whose time has passed as completed."""
+        count, elapsed = sweep_events()
+        click.echo(f"{count} event(s) completed in {elapsed * 1000:.1f} ms.")
@@ -0,0 +1,160 @@
+# app/thumbnails.py
+"""
+Downscaled WebP variants of uploaded images.
+
+After an upload is stored, `schedule()` queues a `generate-thumbnails` job
+(jobs.py) that writes one WebP per entry in SIZES next to the original:
+
+    uploads/store/ab/cd/<sha256>.png
+    uploads/store/ab/cd/<sha256>.thumb.webp     (fits 128x128)
+    uploads/store/ab/cd/<sha256>.card.webp      (fits 640x640)
+
+`variant(relpath, "thumb")` returns the variant's path once it exists and the
+original until then, so callers never link to a missing file. API list
+responses carry `*_thumb` URLs and the HTML pages use `image_src()`. Because
+those URLs change when a variant is written, the job then advances the write
+generation of every table with a row showing that image, so ETags (etags.py)
+roll over.
+
+Needs Pillow. Without it uploads are stored as before and every variant
+resolves to the original image. `python run.py generate-thumbnails` backfills
+variants for images that are already on disk.
+"""
+import os
+
+import click
+from flask import current_app, url_for
+from sqlalchemy import literal, select
+
+import refdata
+from jobs import enqueue, task
+from models import db, Club, Coordinator, Event, Member
+from utils import relpath_from_static
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:     # optional: variants are skipped
+    Image = None
+
+SIZES = {"thumb": 128, "card": 640}
+SOURCE_EXT = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+WEBP_QUALITY = 80
+
+_ready = set()          # variant relpaths known to exist
+
+# table -> image column its serialized rows turn into *_thumb URLs
+IMAGE_COLUMNS = {
+    "clubs": Club.club_logo,
+    "events": Event.event_image,
+    "coordinators": Coordinator.coordinator_image,
+    "members": Member.member_image,
+}
+
+
+def variant_relpath(relpath: str, size: str) -> str:
+    return f"{relpath.rsplit('.', 1)[0]}.{size}.webp"
+
+
+def _is_variant(path: str) -> bool:
+    return any(path.endswith(f".{size}.webp") for size in SIZES)
+
+
+def variant(relpath: str | None, size: str | None) -> str | None:
+    """Path (relative to static) of the `size` variant of `relpath`, or `relpath` itself if not generated."""
+    if not relpath or not size:
+        return relpath
+    rel = variant_relpath(relpath, size)
+    if rel in _ready:
+        return rel
+    if os.path.isfile(os.path.join(current_app.static_folder, rel)):
+        _ready.add(rel)
+        return rel
+    return relpath
+
+
+def image_src(relpath: str | None, size: str | None = None) -> str:
+    """Template helper: static URL of an image (or its variant); '' when there is none."""
+    if not relpath:
+        return ""
+    return url_for("static", filename=variant(relpath, size))
+
+
+# ---------- Generation ----------
+
+def generate(path: str) -> list:
+    """Write every missing variant of the image at `path`; returns the paths written."""
+    if Image is None:
+        return []
+    stem = path.rsplit(".", 1)[0]
+    todo = {size: f"{stem}.{size}.webp" for size in SIZES}
+    todo = {size: out for size, out in todo.items() if not os.path.exists(out)}
+    if not todo:
+        return []
+    written = []
+    with Image.open(path) as src:
+        img = ImageOps.exif_transpose(src)
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in src.info else "RGB")
+        for size, out in todo.items():
+            copy = img.copy()
+            copy.thumbnail((SIZES[size], SIZES[size]), Image.LANCZOS)
+            tmp = out + ".tmp"
+            copy.save(tmp, "WEBP", quality=WEBP_QUALITY, method=4)
+            os.replace(tmp, out)
+            written.append(out)
+    return written
+
+
+def touch_referrers(relpaths) -> list:
+    """Advance the write generation of each table with a row showing one of `relpaths`; returns those tables."""
+    relpaths = list(relpaths)
+    tables = set()
+    with db.engine.begin() as conn:
+        for start in range(0, len(relpaths), 500):
+            chunk = relpaths[start:start + 500]
+            for table, column in IMAGE_COLUMNS.items():
+                if table not in tables and conn.scalar(select(literal(1)).where(column.in_(chunk)).limit(1)):
+                    tables.add(table)
+        refdata.bump(conn, *(refdata.table_key(t) for t in tables))
+    return sorted(tables)
+
+
+@task("generate-thumbnails")
+def _generate_thumbnails(path: str) -> None:
+    if generate(os.path.join(current_app.static_folder, path)):
+        touch_referrers([path])
+
+
+def schedule(relpath: str) -> None:
+    """Queue variant generation for a stored image (path relative to static) unless every variant exists."""
+    if Image is None or all(variant(relpath, size) != relpath for size in SIZES):
+        return
+    enqueue("generate-thumbnails", path=relpath)
+
+
+# ---------- Wiring ----------
+
+def register_thumbnails(app):
+    app.add_template_global(image_src)
+
+    @app.cli.command("generate-thumbnails")
+    def generate_thumbnails_command():
+        """Write missing WebP variants for every uploaded image."""
+        if Image is None:
+            raise click.ClickException("Pillow is not installed (pip install Pillow).")
+        count, changed = 0, []
+        for root, _, files in os.walk(app.config["UPLOAD_FOLDER"]):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.lower().endswith(SOURCE_EXT) and not _is_variant(path):
+                    relpath = relpath_from_static(path)
+                    try:
+                        written = generate(path)
+                    except Exception as e:
+                        click.echo(f"skipped {relpath}: {e}")
+                        continue
+                    count += len(written)
+                    if written:
+                        changed.append(relpath)
+        if changed:
+            touch_referrers(changed)
+        click.echo(f"{count} variant(s) written.")
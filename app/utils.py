@@ -150,3 +150,11 @@ def _to_bool(v):
         return v
     s = str(v or "").strip().lower()
     return s in {"1", "true", "yes", "on"}
+
+# ---------- Template paging helpers ----------
+
+def page_url(page: int) -> str:
+    """Current list URL with ?page= swapped; every filter/sort arg is kept."""
+    args = request.args.to_dict(flat=False)
+    args["page"] = page
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
@@ -0,0 +1,63 @@
+# benchmarks/bench_import.py
+"""
+Bulk member import (importer.import_members): rows per second and statements
+per chunk on the given database.
+
+    python benchmarks/bench_import.py --rows 100000
+    python benchmarks/bench_import.py --rows 100000 --uri mysql+pymysql://user:pw@localhost/ai_nexus_bench
+"""
+import time
+
+from common import count_statements, load_app, parser
+
+
+def main():
+    p = parser(__doc__)
+    p.add_argument("--rows", type=int, default=100_000)
+    p.add_argument("--chunk-size", type=int, default=1000)
+    p.add_argument("--clubs", type=int, default=20)
+    args = p.parse_args()
+
+    app = load_app(args.uri)
+    from importer import import_members
+    from models import db, Club, College, Member
+
+    with app.app_context():
+        clubs = [Club(club_name=f"Club {i:03d}") for i in range(args.clubs)]
+        colleges = [College(college_name=f"College {i}") for i in range(5)]
+        db.session.add_all(clubs + colleges)
+        db.session.commit()
+        club_ids = [c.club_id for c in clubs]
+        college_ids = [c.college_id for c in colleges]
+
+        records = (
+            (i + 2, {
+                "member_name": f"Member {i}",
+                "email": f"member{i}@example.org",
+                "club_ids": [club_ids[i % len(club_ids)], club_ids[(i * 7 + 1) % len(club_ids)]],
+                "college_id": college_ids[i % len(college_ids)],
+                "status": "active" if i % 5 else "inactive",
+            })
+            for i in range(args.rows)
+        )
+        with count_statements(db.engine) as statements:
+            started = time.perf_counter()
+            report = import_members(records, chunk_size=args.chunk_size)
+            elapsed = time.perf_counter() - started
+
+        assert report["inserted"] == args.rows, report
+        # every member must be linked to the clubs of its own input row
+        sample = db.session.get(Member, db.session.scalar(db.select(db.func.max(Member.member_id))))
+        i = args.rows - 1
+        assert sorted(c.club_id for c in sample.clubs) == sorted(
+            {club_ids[i % len(club_ids)], club_ids[(i * 7 + 1) % len(club_ids)]}
+        ), "member_clubs rows point at the wrong members"
+        dialect = db.engine.dialect.name
+
+    print(f"{dialect}: {args.rows} rows in {report['chunks']} chunks, "
+          f"{elapsed:.2f} s ({args.rows / elapsed:,.0f} rows/s), "
+          f"{statements[0]} statements ({statements[0] / report['chunks']:.1f} per chunk)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/bench_json.py
+"""
+Response encoding for a members list page (GET /api/members?per_page=N):
+
+- before: hand-built dicts with isoformat() datetimes, encoded by Flask's stdlib
+  provider (what `jsonify` did before serializers.py)
+- after:  serialize(m, "list"), encoded by FastJSONProvider (orjson when installed)
+
+Both sides build the same keys: image_path_thumb, added to the list view later
+(thumbnails.py), is left out with `only=` so only the encoding path differs.
+The whole-request row runs the real endpoint once with each provider as app.json.
+
+    python benchmarks/bench_json.py --per-page 100
+"""
+from common import load_app, parser, timed
+
+
+def main():
+    p = parser(__doc__)
+    p.add_argument("--per-page", type=int, default=100)
+    p.add_argument("--repeat", type=int, default=200)
+    args = p.parse_args()
+
+    app = load_app(args.uri)
+    from flask.json.provider import DefaultJSONProvider
+    from sqlalchemy.orm import selectinload
+
+    from models import db, Club, College, Member
+    from serializers import FastJSONProvider, image_url, orjson, serialize
+
+    with app.app_context():
+        clubs = [Club(club_name=f"Club {i:02d}") for i in range(10)]
+        colleges = [College(college_name=f"College {i}") for i in range(5)]
+        db.session.add_all(clubs + colleges)
+        db.session.flush()
+        for i in range(args.per_page):
+            db.session.add(Member(
+                member_name=f"Member {i:04d}", email=f"member{i}@example.org", phone="9876543210",
+                faculty_dept="Computer Science", description="Enjoys robotics and open source. " * 3,
+                college_id=colleges[i % 5].college_id, member_image=f"uploads/members/m{i}.png",
+                clubs=[clubs[i % 10], clubs[(i + 3) % 10]],
+            ))
+        db.session.commit()
+
+    def old_item(m):
+        visible_clubs = [c for c in m.clubs if not getattr(c, "is_deleted", False)]
+        return {
+            "id": m.member_id,
+            "name": m.member_name,
+            "club": ", ".join([c.club_name for c in visible_clubs]) if visible_clubs else "-",
+            "college": m.college.college_name if m.college and not m.college.is_deleted else "-",
+            "college_id": m.college_id,
+            "faculty_dept": m.faculty_dept,
+            "email": m.email,
+            "phone": m.phone,
+            "image_path": image_url(m.member_image) if m.member_image else None,
+            "description": m.description,
+            "status": m.status,
+            "club_ids": [c.club_id for c in visible_clubs],
+            "created_time": m.created_time.isoformat() if m.created_time else None,
+        }
+
+    stdlib, fast = DefaultJSONProvider(app), FastJSONProvider(app)
+    results = []
+    with app.test_request_context("/api/members"):
+        members = db.session.scalars(
+            db.select(Member).options(selectinload(Member.college), selectinload(Member.clubs))
+        ).all()
+        keys = set(old_item(members[0]))
+        built_old = {"status": True, "data": {"members": [old_item(m) for m in members]}}
+        built_new = {"status": True, "data": {"members": [serialize(m, "list", only=keys) for m in members]}}
+
+        results.append(("encode only", timed(lambda: stdlib.response(built_old), args.repeat),
+                        timed(lambda: fast.response(built_new), args.repeat)))
+        results.append(("build + encode",
+                        timed(lambda: stdlib.response({"status": True, "data": {
+                            "members": [old_item(m) for m in members]}}), args.repeat),
+                        timed(lambda: fast.response({"status": True, "data": {
+                            "members": [serialize(m, "list", only=keys) for m in members]}}), args.repeat)))
+        size = len(fast.response(built_new).get_data())
+
+    client = app.test_client()
+    url = f"/api/members?per_page={args.per_page}"
+
+    def request_with(provider):
+        app.json = provider
+        return timed(lambda: client.get(url), max(args.repeat // 10, 5))
+
+    results.append(("whole request", request_with(stdlib), request_with(fast)))
+    app.json = fast
+
+    print(f"{args.per_page} members, {size:,} bytes; encoder: {'orjson' if orjson else 'stdlib json (orjson not installed)'}")
+    print(f"{'':<16}{'before ms':>12}{'after ms':>12}{'speed-up':>10}")
+    for name, before, after in results:
+        print(f"{name:<16}{before:>12.3f}{after:>12.3f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/common.py
+"""
+Shared setup for the scripts in this directory. Each one takes --uri (default: a
+fresh SQLite file) and runs against its own empty database, so point it at a
+scratch schema, never at real data:
+
+    python benchmarks/bench_import.py --uri mysql+pymysql://user:pw@localhost/ai_nexus_bench
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+
+
+def parser(description: str) -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(description=description)
+    p.add_argument("--uri", help="database to create the tables in (default: a temporary SQLite file)")
+    return p
+
+
+def load_app(uri: str | None):
+    """Import the app (as run.py does) against `uri` and create empty tables; returns the Flask app."""
+    if not uri:
+        uri = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="ai_nexus_bench_"), "bench.db")
+    os.environ["AI_NEXUS_DATABASE_URI"] = uri
+    sys.path.insert(0, APP_DIR)
+    import run
+    from models import db
+    from publishing import ensure_publishing_schema
+    from search import ensure_search_schema
+    from sortkeys import ensure_sort_key_schema
+    from stats import ensure_stats_row
+    from sweeper import ensure_sweeper_schema
+
+    with run.app.app_context():
+        db.drop_all()
+        db.create_all()
+        ensure_search_schema()
+        ensure_sort_key_schema()
+        ensure_publishing_schema()
+        ensure_sweeper_schema()
+        ensure_stats_row()
+    return run.app
+
+
+@contextmanager
+def count_statements(engine):
+    """Count the statements sent to the database inside the block: `with count_statements(e) as n: ...; n[0]`."""
+    from sqlalchemy import event
+
+    seen = [0]
+
+    def _count(*args):
+        seen[0] += 1
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        yield seen
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+
+def timed(fn, repeat: int = 5) -> float:
+    """Best wall time of `repeat` calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
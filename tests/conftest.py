@@ -0,0 +1,77 @@
+# tests/conftest.py
+"""
+Shared fixtures. The app is imported from app/ (flat imports, as run.py does)
+against a throw-away SQLite file; every test starts from empty tables.
+
+    pip install -r requirements-dev.txt
+    python -m pytest -q
+"""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+_DB_FILE = os.path.join(tempfile.mkdtemp(prefix="ai_nexus_tests_"), "test.db")
+
+os.environ["AI_NEXUS_DATABASE_URI"] = "sqlite:///" + _DB_FILE
+os.environ.setdefault("AI_NEXUS_DB_PROFILE", "test")
+sys.path.insert(0, APP_DIR)
+
+import run     # noqa: E402
+from models import db  # noqa: E402
+from publishing import ensure_publishing_schema  # noqa: E402
+from search import ensure_search_schema  # noqa: E402
+from sortkeys import ensure_sort_key_schema  # noqa: E402
+from sweeper import ensure_sweeper_schema  # noqa: E402
+
+_schema_ready = False
+
+
+@pytest.fixture
+def app():
+    global _schema_ready
+    app = run.app
+    app.config["TESTING"] = True
+    with app.app_context():
+        if not _schema_ready:
+            db.create_all()
+            ensure_search_schema()
+            ensure_sort_key_schema()
+            ensure_publishing_schema()
+            ensure_sweeper_schema()
+            _schema_ready = True
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+    saved = dict(app.config)
+    yield app
+    app.config.clear()
+    app.config.update(saved)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def capture_sql(app):
+    """`with capture_sql() as log:` collects the (statement, parameters) sent to the database."""
+    @contextmanager
+    def capture():
+        log = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            log.append((statement, parameters))
+
+        engine = db.engine
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            yield log
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+    return capture
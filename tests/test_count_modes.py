@@ -0,0 +1,64 @@
+# tests/test_count_modes.py
+"""?count= strategies for list totals (pagination.count_rows via api._paginate)."""
+import pytest
+
+from models import db, Member
+from pagination import count_cache
+from stats import ensure_stats_row
+
+
+@pytest.fixture
+def members(app):
+    count_cache.clear()
+    with app.app_context():
+        db.session.add_all([Member(member_name=f"M{i}", status="active" if i % 2 else "inactive") for i in range(5)])
+        db.session.commit()
+        ensure_stats_row()          # so the page's dashboard counters are one row read, not COUNTs
+    yield
+    count_cache.clear()
+
+
+def _meta(client, query):
+    return client.get(f"/api/members?per_page=2&{query}").get_json()["meta"]
+
+
+def test_exact_is_the_default_for_offset_pages(client, members):
+    meta = _meta(client, "page=1")
+    assert (meta["count"], meta["total"], meta["pages"]) == ("exact", 5, 3)
+    assert "has_more" not in meta
+    assert _meta(client, "count=bogus")["count"] == "exact"
+
+
+def test_none_skips_the_count_and_reports_has_more(app, client, members, capture_sql):
+    with app.app_context(), capture_sql() as log:
+        first, last = _meta(client, "count=none&page=1"), _meta(client, "count=none&page=3")
+    assert not any("count(" in sql.lower() for sql, _ in log)
+    assert "total" not in first and (first["has_more"], last["has_more"]) == (True, False)
+    assert "total" not in _meta(client, "cursor=")          # the default in cursor mode
+
+
+def test_estimated_falls_back_to_exact_without_a_planner_estimate(client, members):
+    meta = _meta(client, "count=estimated")                 # SQLite has no cheap estimate
+    assert (meta["count"], meta["total"]) == ("exact", 5)
+
+
+def test_cached_reuses_the_total_per_filter_set(app, client, members):
+    assert _meta(client, "count=cached")["total"] == 5
+    assert _meta(client, "count=cached&status=active")["total"] == 2
+    with app.app_context():
+        db.session.add(Member(member_name="New", status="active"))
+        db.session.commit()
+    assert _meta(client, "count=cached&page=2")["total"] == 5                # paging args are not part of the key
+    assert _meta(client, "count=cached&status=active")["total"] == 2
+    assert _meta(client, "count=exact")["total"] == 6
+
+    app.config["COUNT_CACHE_TTL"] = 0
+    count_cache.clear()
+    assert _meta(client, "count=cached")["total"] == 6
+
+
+def test_exact_count_selects_only_the_primary_key(app, client, members, capture_sql):
+    with app.app_context(), capture_sql() as log:
+        _meta(client, "count=exact&sort=name")
+    count_sql = next(sql for sql, _ in log if "count(" in sql.lower())
+    assert "ORDER BY" not in count_sql and "description" not in count_sql
@@ -0,0 +1,52 @@
+# tests/test_etags.py
+"""Table write generations (etags.py / refdata.py) and conditional GET."""
+import refdata
+from etags import table_generations
+from models import db, Club, Member
+
+
+def _kinds(statements) -> list:
+    return [s.split()[0] + (" cache_generations" if "cache_generations" in s else "") for s, _ in statements]
+
+
+def test_generations_are_bumped_at_commit(app, capture_sql):
+    with app.app_context():
+        before = table_generations("clubs", "member_clubs", "members")
+        with capture_sql() as log:
+            club = Club(club_name="Alpha")
+            db.session.add(Member(member_name="M", clubs=[club]))
+            db.session.flush()
+            writes = _kinds(log)
+            db.session.commit()
+        seen = _kinds(log)
+
+        assert "UPDATE cache_generations" not in writes            # nothing locked while the transaction runs
+        bumps = [s for s in seen[len(writes):] if s.endswith("cache_generations")]
+        assert bumps                                                 # ... only when it commits
+        after = table_generations("clubs", "member_clubs", "members")
+        assert [a - b for a, b in zip(after, before)] == [1, 1, 1]   # once per table per transaction
+        assert refdata._PENDING not in db.session.connection().info
+
+
+def test_rollback_bumps_nothing(app):
+    with app.app_context():
+        before = table_generations("clubs")
+        db.session.add(Club(club_name="Gone"))
+        db.session.flush()
+        assert [c.club_name for c in refdata.club_options()] == ["Gone"]   # read inside the transaction
+        db.session.rollback()
+        assert table_generations("clubs") == before
+        assert refdata.club_options() == []                                 # not served from the cache
+
+
+def test_write_invalidates_etag(app, client):
+    with app.app_context():
+        db.session.add(Club(club_name="Alpha"))
+        db.session.commit()
+    etag = client.get("/api/clubs").headers["ETag"]
+    assert client.get("/api/clubs", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put("/api/clubs/1", json={"club_name": "Beta"})
+    r = client.get("/api/clubs", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.get_json()["data"][0]["club_name"] == "Beta"
@@ -0,0 +1,75 @@
+# tests/test_jobs.py
+"""Job runner (jobs.py): a worker whose lock expired cannot record an outcome over the new owner."""
+from datetime import datetime, timedelta
+
+import pytest
+
+import jobs
+from models import db, Job
+
+DURING_RUN = []     # callables run inside the task, e.g. another worker taking the job over
+
+
+@jobs.task("test-slow")
+def _slow(fail: bool = False):
+    while DURING_RUN:
+        DURING_RUN.pop()()
+    if fail:
+        raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def _clean(app):
+    app.config.update(JOB_RETRY_BACKOFF=0)
+    DURING_RUN.clear()
+
+
+def _take_over(worker):
+    """The lock expires while the job is still held, and `worker` claims it."""
+    db.session.execute(db.update(Job).values(locked_until=datetime.now() - timedelta(seconds=1)))
+    db.session.commit()
+    assert len(jobs.claim(worker)) == 1
+
+
+def _queue(**payload) -> int:
+    job = jobs.enqueue("test-slow", max_attempts=5, **payload)
+    db.session.commit()
+    return job.id
+
+
+def _state(job_id):
+    db.session.expire_all()
+    job = db.session.get(Job, job_id)
+    return job.status, job.locked_by, job.attempts
+
+
+@pytest.mark.parametrize("fail", [False, True])
+def test_stale_worker_does_not_overwrite_the_new_owner(app, caplog, fail):
+    with app.app_context():
+        job_id = _queue(fail=fail)
+        assert jobs.claim("a") == [job_id]
+        DURING_RUN.append(lambda: _take_over("b"))
+
+        assert jobs.run_job(job_id, "a") is not fail
+        assert _state(job_id) == ("running", "b", 2)     # b's claim is untouched
+        assert "was taken over" in caplog.text
+
+        jobs.run_job(job_id, "b")                       # b records its own outcome
+        assert _state(job_id) == ("queued" if fail else "done", None, 2)
+
+
+def test_job_taken_over_before_it_started_is_not_run(app):
+    with app.app_context():
+        job_id = _queue(fail=True)
+        assert jobs.claim("a") == [job_id]
+        _take_over("b")
+        assert jobs.run_job(job_id, "a") is False
+        assert _state(job_id) == ("running", "b", 2)
+
+
+def test_owner_records_its_outcome(app):
+    with app.app_context():
+        job_id = _queue()
+        assert jobs.claim("a") == [job_id]
+        assert jobs.run_job(job_id, "a")
+        assert _state(job_id) == ("done", None, 1)
@@ -0,0 +1,238 @@
+# tests/test_mailer.py
+"""Announcement e-mail delivery (mailer.py) against an in-process aiosmtpd sink."""
+import socket
+from datetime import datetime, timedelta
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+import jobs
+import mailer
+from models import db, Announcement, AnnouncementDelivery, Club, College, Coordinator, Job, Member
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Sink:
+    """aiosmtpd handler: `bounce*` addresses get 550, `flaky*` get 451 `flaky_for` times."""
+
+    def __init__(self, flaky_for: int = 1):
+        self.received = []
+        self.peers = set()
+        self.flaky_left = flaky_for
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("bounce"):
+            return "550 no such user"
+        if address.startswith("flaky") and self.flaky_left > 0:
+            self.flaky_left -= 1
+            return "451 try again later"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received.extend(envelope.rcpt_tos)
+        self.peers.add(session.peer)
+        return "250 OK"
+
+
+@pytest.fixture
+def sink(app):
+    handler = Sink()
+    port = _free_port()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    app.config.update(MAIL_SERVER="127.0.0.1", MAIL_PORT=port, MAIL_TIMEOUT=5)
+    yield handler
+    controller.stop()
+    mailer._close()
+
+
+@pytest.fixture(autouse=True)
+def fast_jobs(app):
+    app.config.update(EMAIL_RATE_LIMIT=0, EMAIL_BATCH_SIZE=4, EMAIL_MAX_ATTEMPTS=3, JOB_RETRY_BACKOFF=0)
+    mailer._close()
+
+
+@pytest.fixture
+def people(app):
+    """Two clubs, members in one or both, coordinators of each role, colleges."""
+    with app.app_context():
+        a, b = Club(club_name="Alpha"), Club(club_name="Beta")
+        db.session.add_all([a, b, College(college_name="C1", email="c1@college.org"),
+                            College(college_name="C2", email="c2@college.org", status="inactive")])
+        db.session.flush()
+        for i in range(6):
+            m = Member(member_name=f"M{i}", email=f"m{i}@x.org")
+            m.clubs = [a] if i < 3 else [b]
+            db.session.add(m)
+        db.session.add_all([
+            Member(member_name="NoMail", email=None, clubs=[a]),
+            Member(member_name="Gone", email="gone@x.org", is_deleted=True, clubs=[a]),
+            Member(member_name="Twin", email="m0@x.org", clubs=[b]),     # same address as M0
+            Coordinator(coordinator_name="S", club_id=a.club_id, role_type="student", email="s@x.org"),
+            Coordinator(coordinator_name="F", club_id=a.club_id, role_type="faculty", email="f@x.org"),
+            Coordinator(coordinator_name="L", club_id=b.club_id, role_type="lead", email="l@x.org"),
+        ])
+        db.session.commit()
+        return {"alpha": a.club_id, "beta": b.club_id}
+
+
+def _announce(app, **kw) -> int:
+    fields = dict(title="Hello", content="Body", status="published", send_email=True,
+                  publish_at=datetime.now() - timedelta(minutes=1))
+    fields.update(kw)
+    with app.app_context():
+        ann = Announcement(**fields)
+        db.session.add(ann)
+        db.session.commit()
+        return ann.id
+
+
+def _deliveries(app, ann_id) -> dict:
+    with app.app_context():
+        return {
+            d.email: (d.status, d.attempts)
+            for d in db.session.scalars(
+                db.select(AnnouncementDelivery).where(AnnouncementDelivery.announcement_id == ann_id)
+            )
+        }
+
+
+@pytest.mark.parametrize("audience, club, expected", [
+    ("all_members", None, {"m0@x.org", "m1@x.org", "m2@x.org", "m3@x.org", "m4@x.org", "m5@x.org"}),
+    ("all_members", "alpha", {"m0@x.org", "m1@x.org", "m2@x.org", "m3@x.org", "m4@x.org", "m5@x.org"}),
+    ("members", "alpha", {"m0@x.org", "m1@x.org", "m2@x.org"}),
+    ("members", "beta", {"m0@x.org", "m3@x.org", "m4@x.org", "m5@x.org"}),
+    ("coordinators", None, {"s@x.org", "f@x.org", "l@x.org"}),
+    ("coordinators", "beta", {"l@x.org"}),
+    ("student_coordinators", None, {"s@x.org"}),
+    ("college_coordinators", None, {"f@x.org", "l@x.org"}),
+    ("college_coordinators", "alpha", {"f@x.org"}),
+    ("colleges", None, {"c1@college.org"}),
+])
+def test_fan_out_per_audience(app, people, audience, club, expected):
+    ann_id = _announce(app, audience=audience, club_id=people[club] if club else None, send_email=False)
+    with app.app_context():
+        ann = db.session.get(Announcement, ann_id)
+        assert mailer.fan_out(ann) == len(expected)
+        assert mailer.fan_out(ann) == 0        # existing recipients are skipped, not an error
+        db.session.commit()
+    assert _deliveries(app, ann_id) == {email: ("queued", 0) for email in expected}
+
+
+def test_batches_send_each_recipient_once(app, client, people, sink):
+    ann_id = _announce(app)
+    with app.app_context():
+        assert db.session.scalar(db.select(Job.task)) == "send-announcement"
+    jobs.work(app, "test", once=True)
+
+    assert sorted(sink.received) == [f"m{i}@x.org" for i in range(6)]
+    assert len(sink.peers) == 1                      # one connection reused across both batches
+    assert set(_deliveries(app, ann_id).values()) == {("sent", 1)}
+    with app.app_context():
+        batches = db.session.scalars(db.select(Job).where(Job.task == "send-announcement-batch")).all()
+        assert [j.status for j in batches] == ["done", "done"]
+    data = client.get(f"/api/announcements/{ann_id}/deliveries").get_json()["data"]
+    assert data["counts"] == {"queued": 0, "sent": 6, "failed": 0, "cancelled": 0}
+
+    # re-saving the announcement queues send-announcement again, but nobody is mailed twice
+    with app.app_context():
+        db.session.get(Announcement, ann_id).audience = "members"
+        db.session.commit()
+    jobs.work(app, "test", once=True)
+    assert len(sink.received) == 6
+
+
+def test_permanent_failure_is_not_retried(app, people, sink):
+    with app.app_context():
+        db.session.scalar(db.select(Member).where(Member.member_name == "M1")).email = "bounce@x.org"
+        db.session.commit()
+    ann_id = _announce(app)
+    jobs.work(app, "test", once=True)
+
+    deliveries = _deliveries(app, ann_id)
+    assert deliveries.pop("bounce@x.org") == ("failed", 1)
+    assert set(deliveries.values()) == {("sent", 1)}
+    assert "bounce@x.org" not in sink.received
+
+
+def test_temporary_failure_is_retried(app, people, sink):
+    with app.app_context():
+        db.session.scalar(db.select(Member).where(Member.member_name == "M1")).email = "flaky@x.org"
+        db.session.commit()
+    ann_id = _announce(app)
+    jobs.work(app, "test", once=True)
+
+    deliveries = _deliveries(app, ann_id)
+    assert deliveries.pop("flaky@x.org") == ("sent", 2)
+    assert set(deliveries.values()) == {("sent", 1)}
+    assert sink.received.count("flaky@x.org") == 1
+    with app.app_context():
+        attempts = db.session.scalars(
+            db.select(Job.attempts).where(Job.task == "send-announcement-batch").order_by(Job.id)
+        ).all()
+    assert attempts == [2, 1]        # only the batch holding the flaky address ran again
+
+
+def test_temporary_failure_gives_up_after_max_attempts(app, people, sink):
+    sink.flaky_left = 99
+    with app.app_context():
+        db.session.scalar(db.select(Member).where(Member.member_name == "M1")).email = "flaky@x.org"
+        db.session.commit()
+    ann_id = _announce(app)
+    jobs.work(app, "test", once=True)
+
+    status, attempts = _deliveries(app, ann_id)["flaky@x.org"]
+    assert (status, attempts) == ("failed", 3)
+
+
+def test_unreachable_server_fails_recipients(app, people):
+    app.config.update(MAIL_SERVER="127.0.0.1", MAIL_PORT=_free_port(), MAIL_TIMEOUT=2)    # nothing listening
+    ann_id = _announce(app)
+    jobs.work(app, "test", once=True)
+
+    with app.app_context():
+        batch_status = db.session.scalars(
+            db.select(Job.status).where(Job.task == "send-announcement-batch")
+        ).all()
+    assert batch_status == ["done", "done"]           # each recipient used its 3 tries
+    assert set(_deliveries(app, ann_id).values()) == {("failed", 3)}
+
+
+def test_lost_batches_fail_their_recipients(app, people):
+    app.config.update(MAIL_SERVER="127.0.0.1", MAIL_PORT=_free_port(), MAIL_TIMEOUT=2, EMAIL_MAX_ATTEMPTS=5)
+    ann_id = _announce(app)
+    with app.app_context():
+        jobs.run_job(jobs.claim("test")[0])        # send-announcement: queues the batches
+        for job in db.session.scalars(db.select(Job).where(Job.task == "send-announcement-batch")):
+            job.max_attempts = 1                   # the job gives up before the recipients do
+        db.session.commit()
+    jobs.work(app, "test", once=True)
+
+    deliveries = _deliveries(app, ann_id)
+    assert {status for status, _ in deliveries.values()} == {"failed"}
+    with app.app_context():
+        errors = db.session.scalars(db.select(AnnouncementDelivery.last_error)).all()
+    assert all(errors)
+
+
+def test_send_announcement_requeues_orphaned_recipients(app, people, sink):
+    ann_id = _announce(app)
+    with app.app_context():
+        jobs.run_job(jobs.claim("test")[0])
+        # the batches are lost (e.g. purged) before any of them ran
+        db.session.execute(db.delete(Job).where(Job.task == "send-announcement-batch"))
+        jobs.enqueue("send-announcement", announcement_id=ann_id)
+        jobs.enqueue("send-announcement", announcement_id=ann_id)    # a second run adds nothing
+        db.session.commit()
+    assert set(_deliveries(app, ann_id).values()) == {("queued", 0)}
+
+    jobs.work(app, "test", once=True)
+    assert sorted(sink.received) == [f"m{i}@x.org" for i in range(6)]
+    assert set(_deliveries(app, ann_id).values()) == {("sent", 1)}
@@ -0,0 +1,58 @@
+# tests/test_member_club_filter.py
+"""
+?club_ids= on the member lists: an EXISTS semi-join probed through the
+member_clubs primary key, one row per member however many selected clubs match.
+"""
+import pytest
+from sqlalchemy import text
+
+from models import db, Club, Member
+
+
+@pytest.fixture
+def clubs(app):
+    """40 clubs; member i belongs to clubs i % 40, (i + 1) % 40 and (i + 2) % 40."""
+    with app.app_context():
+        clubs = [Club(club_name=f"Club {i:02d}") for i in range(40)]
+        db.session.add_all(clubs)
+        db.session.flush()
+        for i in range(400):
+            db.session.add(Member(member_name=f"Member {i:03d}", clubs=[clubs[(i + k) % 40] for k in range(3)]))
+        db.session.commit()
+        return [c.club_id for c in clubs]
+
+
+def test_page_query_probes_member_clubs_primary_key(app, client, clubs, capture_sql):
+    with app.app_context():
+        with capture_sql() as statements:
+            r = client.get(f"/api/members?club_ids={clubs[0]}&club_ids={clubs[1]}&per_page=50")
+        page_sql, params = next(
+            (s, p) for s, p in statements if "FROM members" in s and "member_clubs" in s and "LIMIT" in s
+        )
+        with db.engine.connect() as conn:
+            plan = [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + page_sql, params)]
+
+    assert r.status_code == 200
+    assert "EXISTS" in page_sql and "DISTINCT" not in page_sql
+    mc_steps = [step for step in plan if "member_clubs" in step]
+    assert mc_steps, plan
+    # the member_clubs (member_id, club_id) primary key, looked up by both columns
+    assert all("sqlite_autoindex_member_clubs_1 (member_id=? AND club_id=?)" in s for s in mc_steps), plan
+    assert any(step.startswith("CORRELATED") for step in plan), plan   # a semi-join, not a join
+    assert not any("DISTINCT" in step for step in plan), plan       # no de-duplication pass
+
+
+def test_members_in_several_selected_clubs_are_listed_once(app, client, clubs):
+    with app.app_context():
+        expected = db.session.scalar(
+            text("SELECT COUNT(DISTINCT member_id) FROM member_clubs WHERE club_id IN (:a, :b)"),
+            {"a": clubs[0], "b": clubs[1]},
+        )
+    r = client.get(f"/api/members?club_ids={clubs[0]}&club_ids={clubs[1]}&per_page=100")
+    body = r.get_json()
+    ids = [m["id"] for m in body["data"]["members"]]
+    assert len(ids) == len(set(ids)) == expected == 40
+    assert body["meta"]["total"] == expected
+
+    page = client.get(f"/members?club_ids={clubs[0]}&club_ids={clubs[1]}&per_page=100").get_data(as_text=True)
+    assert page.count('<td data-col="name">Member 000</td>') == 1     # member 0 is in both selected clubs
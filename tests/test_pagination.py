@@ -0,0 +1,73 @@
+# tests/test_pagination.py
+"""Cursor (keyset) pages over sort keys that may be NULL."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import db, Announcement, College
+from pagination import encode_cursor
+
+
+def _walk(client, url, key, id_key, per_page=2) -> list:
+    ids, cursor = [], ""
+    while cursor is not None:
+        body = client.get(f"{url}&per_page={per_page}&cursor={cursor}").get_json()
+        ids += [item[id_key] for item in body["data"][key]]
+        cursor = body["meta"]["next_cursor"]
+    return ids
+
+
+def _offset_ids(client, url, key, id_key) -> list:
+    return [item[id_key] for item in client.get(f"{url}&per_page=100").get_json()["data"][key]]
+
+
+@pytest.mark.parametrize("sort", ["pinned", "newest", "oldest", "updated"])
+def test_announcement_cursor_pages_include_null_pinned(app, client, sort):
+    now = datetime.now()
+    with app.app_context():
+        for i, pinned in enumerate([True, None, False, None, True, None, False]):
+            db.session.add(Announcement(title=f"A{i}", content="x", status="published", pinned=pinned,
+                                        created_at=now - timedelta(hours=i), updated_at=now - timedelta(hours=i)))
+        db.session.commit()
+
+    url = f"/api/announcements?sort={sort}"
+    ids = _walk(client, url, "announcements", "id")
+    assert len(ids) == 7
+    assert ids == _offset_ids(client, url, "announcements", "id")
+
+
+@pytest.mark.parametrize("sort", ["newest", "oldest"])
+def test_college_cursor_pages_include_null_created_time(app, client, sort):
+    now = datetime.now()
+    with app.app_context():
+        for i in range(5):
+            db.session.add(College(college_name=f"C{i}"))
+        db.session.flush()
+        db.session.execute(db.update(College).where(College.college_name.in_(["C1", "C3"]))
+                           .values(created_time=None))
+        db.session.execute(db.update(College).where(College.college_name.in_(["C0", "C2", "C4"]))
+                           .values(created_time=now))
+        db.session.commit()
+
+    url = f"/api/colleges?sort={sort}"
+    ids = _walk(client, url, "colleges", "college_id")
+    assert len(ids) == 5
+    assert ids == _offset_ids(client, url, "colleges", "college_id")
+
+
+@pytest.mark.parametrize("values", [
+    ["x", "2024-01-01T00:00:00", 1],         # pinned is a boolean
+    [True, "2024-01-01T00:00:00", "1"],      # id is an integer
+    [True, "2024-01-01T00:00:00", True],     # ... and JSON true is not one
+    [True, "2024-01-01T00:00:00", None],     # id is NOT NULL
+    [True, 20240101, 1],                     # updated_at is a timestamp
+])
+def test_cursor_with_wrong_value_types_is_rejected(app, client, values):
+    r = client.get(f"/api/announcements?cursor={encode_cursor(values)}")
+    assert r.status_code == 400
+    assert r.get_json()["error"]["code"] == "invalid_cursor"
+
+
+def test_cursor_with_null_for_a_nullable_key_is_accepted(app, client):
+    r = client.get(f"/api/announcements?cursor={encode_cursor([None, '2024-01-01T00:00:00', 1])}")
+    assert r.status_code == 200
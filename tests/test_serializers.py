@@ -0,0 +1,72 @@
+# tests/test_serializers.py
+"""FastJSONProvider and the model serializer registry (serializers.py)."""
+import json
+from datetime import date, datetime
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+import serializers
+from models import db, Club
+from serializers import FastJSONProvider, serialize
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def provider(request, app, monkeypatch):
+    if request.param == "orjson" and serializers.orjson is None:
+        pytest.skip("orjson is not installed")
+    if request.param == "stdlib":
+        monkeypatch.setattr(serializers, "orjson", None)
+    return FastJSONProvider(app)
+
+
+def _club(app):
+    with app.app_context():
+        club = Club(club_name="Alpha", club_category="Tech", created_time=datetime(2024, 5, 1, 9, 30))
+        db.session.add(club)
+        db.session.commit()
+        return club.club_id
+
+
+def test_app_uses_the_fast_provider(app):
+    assert isinstance(app.json, FastJSONProvider)
+
+
+def test_output_matches_the_stdlib_provider(app, provider):
+    payload = {"b": [1, 2.5, None, True], "a": datetime(2024, 5, 1, 9, 30, 15), "d": date(2024, 5, 1), "é": "ü"}
+    with app.app_context():
+        fast = json.loads(provider.dumps(payload))
+        assert fast == json.loads(DefaultJSONProvider(app).dumps(payload)) | {
+            "a": "2024-05-01T09:30:15", "d": "2024-05-01",         # ISO-8601, not the HTTP date format
+        }
+        assert list(fast) == sorted(fast)
+        assert provider.loads(provider.dumps(payload)) == fast
+
+
+def test_registered_models_encode_with_their_default_view(app, provider):
+    club_id = _club(app)
+    with app.test_request_context():
+        club = db.session.get(Club, club_id)
+        body = json.loads(provider.response({"data": club}).get_data())
+        expected = {k: v.isoformat() if isinstance(v, datetime) else v for k, v in serialize(club).items()}
+        assert body["data"] == expected
+        assert body["data"]["created_time"] == "2024-05-01T09:30:00"
+
+
+def test_serialize_only_and_extra(app):
+    club_id = _club(app)
+    with app.test_request_context():
+        club = db.session.get(Club, club_id)
+        assert serialize(club, "list", only={"club_name", "members"}, members=3, other=1) == {
+            "club_name": "Alpha", "members": 3,
+        }
+        assert serialize(club, "ref", members=3) == {
+            "club_id": club_id, "club_name": "Alpha", "club_category": "Tech", "status": club.status, "members": 3,
+        }
+
+
+def test_api_response_is_encoded_by_the_provider(app, client):
+    _club(app)
+    r = client.get("/api/clubs")
+    assert r.mimetype == "application/json"
+    assert r.get_json()["data"][0]["created_time"] == "2024-05-01T09:30:00"
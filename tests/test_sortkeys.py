@@ -0,0 +1,39 @@
+# tests/test_sortkeys.py
+"""members.primary_club_name (sortkeys.py): kept current without touching updated_time."""
+from datetime import datetime
+
+from models import db, Club, Member
+from sortkeys import refresh_primary_club
+
+LONG_AGO = datetime(2020, 1, 1, 12, 0)
+
+
+def _members(app) -> dict:
+    with app.app_context():
+        return {m.member_name: (m.primary_club_name, m.updated_time) for m in db.session.scalars(db.select(Member))}
+
+
+def test_club_rename_keeps_member_updated_time(app):
+    with app.app_context():
+        alpha, beta = Club(club_name="Alpha"), Club(club_name="Beta")
+        db.session.add_all([Member(member_name="A", clubs=[alpha]), Member(member_name="AB", clubs=[alpha, beta]),
+                            Member(member_name="B", clubs=[beta])])
+        db.session.commit()
+        db.session.execute(db.update(Member).values(updated_time=LONG_AGO))
+        db.session.commit()
+
+        alpha.club_name = "Zeta"
+        db.session.commit()
+        beta_id = beta.club_id
+
+    assert _members(app) == {
+        "A": ("Zeta", LONG_AGO), "AB": ("Beta", LONG_AGO), "B": ("Beta", LONG_AGO),
+    }
+
+    with app.app_context():
+        db.session.get(Club, beta_id).is_deleted = True
+        db.session.commit()
+        refresh_primary_club(db.session.connection())        # as rebuild-member-sort-keys does
+        db.session.commit()
+
+    assert _members(app) == {"A": ("Zeta", LONG_AGO), "AB": ("Zeta", LONG_AGO), "B": (None, LONG_AGO)}
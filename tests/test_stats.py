@@ -0,0 +1,36 @@
+# tests/test_stats.py
+"""Dashboard counters (stats.py): reads never write the stats row."""
+import stats
+from models import db, Club, EntityStats, Member
+
+
+def test_get_stats_without_row_computes_and_does_not_write(app, client, capture_sql):
+    with app.app_context():
+        db.session.add_all([Club(club_name="A"), Member(member_name="M", status="inactive")])
+        db.session.commit()
+
+        with capture_sql() as statements:
+            row = stats.get_stats()
+        assert (row.active_clubs, row.total_members, row.inactive_members) == (1, 1, 1)
+        assert all(sql.lstrip().upper().startswith("SELECT") for sql, _ in statements)
+        assert row not in db.session
+        db.session.rollback()
+        assert db.session.get(EntityStats, stats.STATS_ID) is None
+
+    assert client.get("/").status_code == 200
+    with app.app_context():
+        assert db.session.get(EntityStats, stats.STATS_ID) is None
+
+
+def test_ensure_stats_row_creates_once(app):
+    with app.app_context():
+        db.session.add(Club(club_name="A"))
+        db.session.commit()
+        stats.ensure_stats_row()
+        stats.ensure_stats_row()
+        assert db.session.scalar(db.select(db.func.count()).select_from(EntityStats)) == 1
+        assert stats.get_stats().active_clubs == 1
+
+        db.session.add(Club(club_name="B"))
+        db.session.commit()
+        assert stats.get_stats().active_clubs == 2       # kept current by the flush deltas
@@ -0,0 +1,95 @@
+# tests/test_thumbnails.py
+"""WebP variants (thumbnails.py): queuing on upload, *_thumb URLs and the ETags of the lists that show them."""
+import io
+import os
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+PIL = pytest.importorskip("PIL.Image")
+
+import jobs
+import storage
+import thumbnails
+from etags import table_generations
+from models import db, Club, Job
+
+
+@pytest.fixture
+def static_dir(app, tmp_path):
+    saved = app.static_folder
+    app.static_folder = str(tmp_path)
+    thumbnails._ready.clear()
+    yield tmp_path
+    app.static_folder = saved
+    thumbnails._ready.clear()
+
+
+def _image(static_dir, relpath):
+    path = static_dir / relpath
+    os.makedirs(path.parent, exist_ok=True)
+    PIL.new("RGB", (400, 300), "teal").save(path)
+    return relpath
+
+
+def test_new_variant_rolls_the_etag_of_tables_showing_it(app, client, static_dir):
+    logo = _image(static_dir, "uploads/store/ab/cd/logo.png")
+    with app.app_context():
+        db.session.add(Club(club_name="Alpha", club_logo=logo))
+        db.session.commit()
+        members_gen = table_generations("members")
+
+    clubs = client.get("/api/clubs")
+    assert clubs.get_json()["data"][0]["club_logo_thumb"].endswith("/logo.png")
+
+    with app.app_context():
+        thumbnails.schedule(logo)
+        db.session.commit()
+    jobs.work(app, "test", once=True)
+    assert (static_dir / "uploads/store/ab/cd/logo.thumb.webp").is_file()
+
+    r = client.get("/api/clubs", headers={"If-None-Match": clubs.headers["ETag"]})
+    assert r.status_code == 200
+    assert r.get_json()["data"][0]["club_logo_thumb"].endswith("/logo.thumb.webp")
+    with app.app_context():
+        assert table_generations("members") == members_gen     # no member shows the logo
+
+
+def test_touch_referrers_only_names_tables_using_the_image(app, static_dir):
+    with app.app_context():
+        db.session.add(Club(club_name="Alpha", club_logo="uploads/store/a.png"))
+        db.session.commit()
+        assert thumbnails.touch_referrers(["uploads/store/a.png"]) == ["clubs"]
+        assert thumbnails.touch_referrers(["uploads/store/unused.png"]) == []
+
+
+def _upload() -> FileStorage:
+    buf = io.BytesIO()
+    PIL.new("RGB", (400, 300), "navy").save(buf, "PNG")
+    return FileStorage(io.BytesIO(buf.getvalue()), filename="logo.png")
+
+
+def _thumbnail_jobs(app) -> int:
+    with app.app_context():
+        return db.session.scalar(db.select(db.func.count()).where(Job.task == "generate-thumbnails"))
+
+
+def test_upload_requeues_variants_lost_with_a_rolled_back_request(app, static_dir):
+    app.config["IMAGE_STORE_FOLDER"] = str(static_dir / "uploads/store")
+    with app.test_request_context():
+        relpath = storage.save_image(_upload())
+        db.session.rollback()            # the request failed after the file was stored
+    assert (static_dir / relpath).is_file()
+    assert _thumbnail_jobs(app) == 0
+
+    with app.test_request_context():
+        assert storage.save_image(_upload()) == relpath    # same bytes, already stored
+        db.session.commit()
+    assert _thumbnail_jobs(app) == 1
+    jobs.work(app, "test", once=True)
+    assert (static_dir / thumbnails.variant_relpath(relpath, "thumb")).is_file()
+
+    with app.test_request_context():
+        storage.save_image(_upload())                     # every variant exists: nothing to do
+        db.session.commit()
+    assert _thumbnail_jobs(app) == 1